@@ -0,0 +1,64 @@
+"""
+Compare lock backends of wallets.shared.locks: latency of one
+acquire + release and throughput of concurrent ones (distinct keys, as
+monitors lock distinct wallets). postgres locks are taken in a db
+transaction on PGSTRING (its BEGIN / COMMIT are counted, monitors pay
+them anyway), redis ones on REDIS_HOST (with a fencing token from
+PGSTRING); backends which can't connect are skipped.
+
+Usage: python -m benchmarks.locks [iterations] [concurrency] [backends...]
+"""
+import sys
+import time
+import asyncio
+
+from wallets.shared.locks import BACKENDS
+from wallets.shared.locks import create_lock_backend
+
+
+async def lock_once(backend, manager, key: str):
+    async with backend.acquire(key, manager) as lease:
+        assert lease, key
+
+
+async def measure(backend, manager, iterations: int, concurrency: int):
+    latencies = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        await lock_once(backend, manager, f'bench_{i}')
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+
+    keys = iter(range(iterations))
+
+    async def worker():
+        for i in keys:
+            await lock_once(backend, manager, f'bench_{i}')
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return (sum(latencies) / iterations * 1000,
+            latencies[int(iterations * 0.99) - 1] * 1000,
+            iterations / elapsed)
+
+
+def main(iterations: int = 1000, concurrency: int = 10, *names: str):
+    import wallets
+    manager = wallets.objects
+    print(f'{iterations} locks, {concurrency} concurrent')
+    print(f'{"backend":10} {"mean ms":>9} {"p99 ms":>9} {"locks/s":>10}')
+    loop = asyncio.get_event_loop()
+    for name in names or BACKENDS:
+        try:
+            backend = create_lock_backend(name)
+            mean, p99, rate = loop.run_until_complete(
+                measure(backend, manager, iterations, concurrency))
+        except Exception as exc:
+            print(f'{name:10} skipped: {exc!r}')
+            continue
+        print(f'{name:10} {mean:9.3f} {p99:9.3f} {rate:10.0f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]), *sys.argv[3:])
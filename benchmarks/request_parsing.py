@@ -0,0 +1,66 @@
+"""
+Compare request parsing through MessageToDict with wallets.utils.proto.
+
+Usage: python -m benchmarks.request_parsing [transactions] [repeat]
+"""
+import sys
+import timeit
+from google.protobuf.json_format import MessageToDict
+
+from wallets import request_objects
+from wallets.rpc import wallets_pb2
+from wallets.utils.proto import message_to_dict
+
+
+def update_trx_request(size: int) -> wallets_pb2.TransactionRequest:
+    request = wallets_pb2.TransactionRequest()
+    for i in range(size):
+        request.transaction.add(**{
+            'from': f'0x{i:040x}',
+            'to': f'0x{i + 1:040x}',
+            'hash': f'0x{i:064x}',
+            'value': f'{i}.000001',
+            'wallet_id': i,
+            'currencySlug': 'ethereum',
+            'status': wallets_pb2.CONFIRMED,
+        })
+    return request
+
+
+def parse_with_message_to_dict(request):
+    data = MessageToDict(request, preserving_proto_field_name=True)
+    return request_objects.TransactionRequestObject.from_dict(data)
+
+
+def parse_with_converter(request):
+    return request_objects.TransactionRequestObject.from_dict(
+        message_to_dict(request))
+
+
+def measure(func, request, repeat: int) -> float:
+    """Best time of one call in milliseconds."""
+    timer = timeit.Timer(lambda: func(request))
+    return min(timer.repeat(repeat=repeat, number=1)) * 1000
+
+
+def main(size: int = 1000, repeat: int = 20):
+    request = update_trx_request(size)
+    assert parse_with_message_to_dict(request).is_valid()
+    assert parse_with_converter(request).is_valid()
+
+    old = measure(parse_with_message_to_dict, request, repeat)
+    new = measure(parse_with_converter, request, repeat)
+    print(f'UpdateTrx with {size} transactions')
+    print(f'MessageToDict:   {old:8.3f} ms/request')
+    print(f'message_to_dict: {new:8.3f} ms/request')
+    print(f'speedup:         {old / new:8.2f}x')
+
+    old = measure(lambda r: MessageToDict(
+        r, preserving_proto_field_name=True), request, repeat)
+    new = measure(message_to_dict, request, repeat)
+    print(f'conversion only: {old:8.3f} -> {new:8.3f} ms '
+          f'({old / new:.2f}x)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
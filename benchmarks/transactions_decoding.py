@@ -0,0 +1,55 @@
+"""
+Compare decoding of blockchain gateway transactions list through
+MessageToDict + TransactionSchema with wallets.bgw_gateway.decoders.
+
+Usage: python -m benchmarks.transactions_decoding [transactions] [repeat]
+"""
+import sys
+from google.protobuf.json_format import MessageToDict
+
+from wallets.common import TransactionSchema
+from wallets.rpc import blockchain_gateway_pb2
+from wallets.bgw_gateway.decoders import decode_transactions_list
+from benchmarks.request_parsing import measure
+
+
+def transactions_list_response(
+        size: int) -> blockchain_gateway_pb2.GetTransactionsListResponse:
+    response = blockchain_gateway_pb2.GetTransactionsListResponse()
+    response.status.status = blockchain_gateway_pb2.SUCCESS
+    for i in range(size):
+        response.transactions.add(**{
+            'from': f'0x{i:040X}',
+            'to': f'0x{i + 1:040X}',
+            'hash': f'0x{i:064X}',
+            'value': f'{i}.000001',
+            'currencySlug': 'Ethereum',
+            'time': 1577836800 + i,
+        })
+    return response
+
+
+def decode_with_schema(response):
+    data = MessageToDict(response, preserving_proto_field_name=True)
+    return [
+        TransactionSchema().load(elem)
+        for elem in data.get('transactions', [])
+    ]
+
+
+def main(size: int = 5000, repeat: int = 10):
+    response = transactions_list_response(size)
+    assert decode_with_schema(response) == [
+        row.dict() for row in decode_transactions_list(response)
+    ]
+
+    old = measure(decode_with_schema, response, repeat)
+    new = measure(decode_transactions_list, response, repeat)
+    print(f'GetTransactionsList with {size} transactions')
+    print(f'MessageToDict + TransactionSchema: {old:9.3f} ms')
+    print(f'decode_transactions_list:          {new:9.3f} ms')
+    print(f'speedup:                           {old / new:9.2f}x')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
@@ -0,0 +1,69 @@
+# auto-generated snapshot
+from peewee import *
+import datetime
+import peewee
+
+
+snapshot = Snapshot()
+
+
+@snapshot.append
+class Wallet(peewee.Model):
+    created_at = DateTimeField(default=datetime.datetime.now, index=True)
+    updated_at = DateTimeField(default=datetime.datetime.now)
+    currency_slug = CharField(max_length=255)
+    address = CharField(max_length=255)
+    external_id = IntegerField(index=True)
+    is_platform = BooleanField(default=False)
+    on_monitoring = BooleanField(default=True)
+    is_active = BooleanField(default=True)
+    class Meta:
+        table_name = "wallet"
+
+
+@snapshot.append
+class Transaction(peewee.Model):
+    created_at = DateTimeField(default=datetime.datetime.now, index=True)
+    updated_at = DateTimeField(default=datetime.datetime.now)
+    status = IntegerField(default=1, index=True)
+    hash = CharField(max_length=255, null=True, unique=True)
+    address_from = CharField(max_length=255)
+    address_to = CharField(max_length=255)
+    currency_slug = CharField(max_length=255)
+    value = DecimalField(auto_round=False, decimal_places=10, max_digits=20, rounding='ROUND_HALF_EVEN')
+    is_fee_trx = BooleanField(default=False)
+    confirmed_at = DateField(null=True)
+    wallet = snapshot.ForeignKeyField(backref='transactions', index=True, model='wallet', null=True)
+    uuid = UUIDField(null=True, unique=True)
+    class Meta:
+        table_name = "transaction"
+
+
+@snapshot.append
+class Outbox(peewee.Model):
+    topic = CharField(max_length=255)
+    transaction = snapshot.ForeignKeyField(index=True, model='transaction', on_delete='CASCADE')
+    class Meta:
+        table_name = "outbox"
+        indexes = (
+            (('topic', 'id'), False),
+            )
+
+
+def forward(old_orm, new_orm):
+    wallet = new_orm['wallet']
+    transaction = new_orm['transaction']
+    outbox = new_orm['outbox']
+    return [
+        # Put hashed NEW transactions to the outbox of SendToTransactionService
+        outbox.insert_from(
+            transaction.select(Value('transactions'), transaction.id).where(
+                transaction.hash.is_null(False) & (transaction.status == 1)).order_by(transaction.id),
+            fields=[outbox.topic, outbox.transaction]),
+        # Put CONFIRMED platform transactions to the outbox of SendToExchangerService
+        outbox.insert_from(
+            transaction.select(Value('exchanger'), transaction.id).join(wallet).where(
+                transaction.hash.is_null(False) & transaction.uuid.is_null(False)
+                & (wallet.is_platform == True) & (transaction.status == 6)).order_by(transaction.id),
+            fields=[outbox.topic, outbox.transaction]),
+    ]
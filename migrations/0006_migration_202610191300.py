@@ -0,0 +1,87 @@
+# auto-generated snapshot
+from peewee import *
+import datetime
+import peewee
+
+
+snapshot = Snapshot()
+
+
+@snapshot.append
+class Wallet(peewee.Model):
+    created_at = DateTimeField(default=datetime.datetime.now, index=True)
+    updated_at = DateTimeField(default=datetime.datetime.now)
+    currency_slug = CharField(max_length=255)
+    address = CharField(max_length=255)
+    external_id = IntegerField(index=True)
+    is_platform = BooleanField(default=False)
+    on_monitoring = BooleanField(default=True)
+    is_active = BooleanField(default=True)
+    class Meta:
+        table_name = "wallet"
+
+
+@snapshot.append
+class Transaction(peewee.Model):
+    created_at = DateTimeField(default=datetime.datetime.now, index=True)
+    updated_at = DateTimeField(default=datetime.datetime.now)
+    status = IntegerField(default=1, index=True)
+    hash = CharField(max_length=255, null=True, unique=True)
+    address_from = CharField(max_length=255)
+    address_to = CharField(max_length=255)
+    currency_slug = CharField(max_length=255)
+    value = DecimalField(auto_round=False, decimal_places=10, max_digits=20, rounding='ROUND_HALF_EVEN')
+    is_fee_trx = BooleanField(default=False)
+    confirmed_at = DateField(null=True)
+    wallet = snapshot.ForeignKeyField(backref='transactions', index=True, model='wallet', null=True)
+    uuid = UUIDField(null=True, unique=True)
+    class Meta:
+        table_name = "transaction"
+
+
+@snapshot.append
+class Outbox(peewee.Model):
+    topic = CharField(max_length=255)
+    transaction = snapshot.ForeignKeyField(index=True, model='transaction', on_delete='CASCADE')
+    class Meta:
+        table_name = "outbox"
+        indexes = (
+            (('topic', 'id'), False),
+            )
+
+
+@snapshot.append
+class TransactionEvent(peewee.Model):
+    id = BigAutoField(primary_key=True)
+    transaction = snapshot.ForeignKeyField(index=True, model='transaction', on_delete='CASCADE')
+    status = IntegerField()
+    created_at = DateTimeField(default=datetime.datetime.now, index=True)
+    class Meta:
+        table_name = "transaction_event"
+
+
+def forward(old_orm, new_orm):
+    wallet = new_orm['wallet']
+    return [
+        # Duplicates can't be merged here, transactions refer to them
+        wallet.raw('DO $$ DECLARE duplicated text; BEGIN '
+                   'SELECT string_agg("external_id"::text, \', \') '
+                   'INTO duplicated FROM ('
+                   'SELECT "external_id" FROM "wallet" '
+                   'WHERE "is_platform" = false GROUP BY "external_id" '
+                   'HAVING count(*) > 1) AS "d"; '
+                   'IF duplicated IS NOT NULL THEN RAISE EXCEPTION USING '
+                   'MESSAGE = \'client wallets share external_id \' || '
+                   'duplicated || \', merge them before this migration\'; '
+                   'END IF; END $$'),
+        # Unique external_id of not platform wallets, for bulk StartMonitoring
+        wallet.raw('CREATE UNIQUE INDEX IF NOT EXISTS "wallet_external_id_client" '
+                   'ON "wallet" ("external_id") WHERE ("is_platform" = false)'),
+    ]
+
+
+def backward(old_orm, new_orm):
+    wallet = new_orm['wallet']
+    return [
+        wallet.raw('DROP INDEX IF EXISTS "wallet_external_id_client"'),
+    ]
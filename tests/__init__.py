@@ -4,8 +4,12 @@ from wallets import database
 from wallets import objects
 from wallets.common import Wallet
 from wallets.common import Transaction
+from wallets.common import Outbox
+from wallets.common import TransactionEvent
+from wallets.common import LockFence
+from wallets.common import registry
 
-MODELS = [Wallet, Transaction]
+MODELS = [Wallet, Transaction, Outbox, TransactionEvent, LockFence]
 
 database.database = 'test_wallets'
 test_db = database
@@ -22,15 +26,24 @@ class BaseTestCase(aiounittest.AsyncTestCase):
 
         cls.test_db.connect()
         cls.test_db.create_tables(MODELS)
+        # created by migration 0008, create_tables doesn't know of it
+        cls.test_db.execute_sql(
+            f'CREATE SEQUENCE IF NOT EXISTS "{LockFence.TOKENS}"')
         cls.manager = objects
 
     @classmethod
     def tearDownClass(cls):
         cls.test_db.drop_tables(MODELS)
+        cls.test_db.execute_sql(
+            f'DROP SEQUENCE IF EXISTS "{LockFence.TOKENS}"')
 
         # Close connection to db.
         cls.test_db.close()
 
+    def setUp(self):
+        # wallets are created by tests directly, load them on first lookup
+        registry._registries.clear()
+
     def get_event_loop(self):
         self.my_loop = asyncio.get_event_loop()
         return self.my_loop
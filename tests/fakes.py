@@ -0,0 +1,52 @@
+import asyncio
+import contextlib
+
+import peewee
+
+
+class FakeManager:
+    """
+    Manager answering queries with canned `results`, in order. Queries and
+    BEGIN / COMMIT / ROLLBACK of `atomic` blocks are recorded in `queries`.
+    It checks the code around the queries, their SQL is run against
+    the test db in BaseTestCase tests.
+    """
+
+    def __init__(self, *results):
+        self.database = peewee.PostgresqlDatabase(None)
+        self.results = list(results)
+        self.queries = []
+
+    def _result(self, query, default=None):
+        self.queries.append(query)
+        return self.results.pop(0) if self.results else default
+
+    async def get_all(self, query):
+        await asyncio.sleep(0)
+        return self._result(query, [])
+
+    async def scalar(self, query):
+        return self._result(query)
+
+    async def returning(self, query):
+        return self._result(query, [])
+
+    async def get(self, model, **fields):
+        self.queries.append(fields)
+        raise model.DoesNotExist
+
+    async def execute(self, query):
+        self.queries.append(query)
+
+    @contextlib.asynccontextmanager
+    async def atomic(self):
+        self.queries.append('BEGIN')
+        try:
+            yield
+        except Exception:
+            self.queries.append('ROLLBACK')
+            raise
+        self.queries.append('COMMIT')
+
+    def transactions(self):
+        return [query for query in self.queries if isinstance(query, str)]
@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+import aiounittest
+from unittest import mock
+
+from wallets import bgw_gateway
+from wallets.gateway import base
+from wallets.gateway import limits
+from wallets.exchanger_gateway.gateway import ExchangerServiceGateway
+
+
+class TestBaseAsyncGateway(unittest.TestCase):
+
+    def test_client_per_event_loop(self):
+        gateway = bgw_gateway.BlockChainServiceGateWay()
+        loops = [asyncio.new_event_loop(), asyncio.new_event_loop()]
+        clients = []
+        try:
+            for loop in loops:
+                asyncio.set_event_loop(loop)
+                clients.append(gateway.CLIENT)
+                self.assertIs(gateway.CLIENT, clients[-1])
+        finally:
+            asyncio.set_event_loop(None)
+            for loop in loops:
+                loop.close()
+
+        self.assertIsNot(clients[0], clients[1])
+
+    def test_hedges_go_on_another_channel(self):
+        gateway = bgw_gateway.BlockChainServiceGateWay(pool_size=3)
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            method = gateway.CLIENT.GetBalanceBySlug
+            pool = gateway._pool()
+            self.assertEqual(len(pool), 3)
+            self.assertIs(pool[0], gateway.CLIENT)
+            self.assertEqual(
+                [gateway._alternate(method, i).channel for i in (1, 2, 3)],
+                [pool[1].GetBalanceBySlug.channel,
+                 pool[2].GetBalanceBySlug.channel,
+                 pool[1].GetBalanceBySlug.channel])
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+        self.assertEqual(set(gateway.hedging),
+                         {'GetBalanceBySlug', 'GetTransactionsList'})
+
+
+class TestBaseGateway(aiounittest.AsyncTestCase):
+
+    async def test_rate_limit_doesnt_block_event_loop(self):
+        gateway = ExchangerServiceGateway()
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.01)
+
+        with mock.patch.object(base, 'rate_limiter',
+                               limits.RateLimiter({'exchanger': [10, 1]})), \
+                mock.patch.object(gateway, '_base_request',
+                                  return_value={}) as base_request:
+            task = asyncio.ensure_future(ticker())
+            for _ in range(2):
+                await gateway.update_transactions([])
+            task.cancel()
+
+        self.assertGreater(len(ticks), 5)  # second call waited for 0.1s
+        self.assertEqual(base_request.call_args[1], {'rate_limited': True})
@@ -0,0 +1,58 @@
+import unittest
+from decimal import Decimal
+from marshmallow import ValidationError
+
+from wallets.common import TransactionSchema
+from wallets.rpc import blockchain_gateway_pb2
+from wallets.utils.proto import message_to_dict
+from wallets.bgw_gateway.decoders import COLUMNS
+from wallets.bgw_gateway.decoders import decode_transactions
+from wallets.bgw_gateway.decoders import decode_transactions_list
+
+
+def transaction(**kwargs):
+    data = {
+        'from': 'Address_From',
+        'to': 'Address_To',
+        'currencySlug': 'Bitcoin',
+        'value': '0.00010000',
+        'hash': 'HASH',
+        'time': 1577836800,
+    }
+    data.update(kwargs)
+    return blockchain_gateway_pb2.GetTransactionsResponse(**data)
+
+
+class TestTransactionsDecoder(unittest.TestCase):
+
+    def assertSchemaEqual(self, message):
+        expected = TransactionSchema().load(message_to_dict(message))
+        row, = decode_transactions([message])
+        self.assertEqual(row.dict(), expected)
+
+    def test_same_as_schema(self):
+        self.assertSchemaEqual(transaction())
+        self.assertSchemaEqual(transaction(to=''))
+        self.assertSchemaEqual(transaction(value='None'))
+
+    def test_row(self):
+        row, = decode_transactions([transaction()])
+        self.assertEqual(COLUMNS, ('address_from', 'address_to',
+                                   'currency_slug', 'value', 'hash'))
+        self.assertEqual(tuple(row), ('address_from', 'address_to',
+                                      'bitcoin', Decimal('0.0001'), 'hash'))
+
+    def test_missing_required(self):
+        with self.assertRaises(ValidationError) as schema_error:
+            TransactionSchema().load(message_to_dict(transaction(hash='')))
+        with self.assertRaises(ValidationError) as decoder_error:
+            decode_transactions([transaction(hash='')])
+        self.assertEqual(decoder_error.exception.messages,
+                         schema_error.exception.messages)
+
+    def test_extra_fields_skipped(self):
+        response = blockchain_gateway_pb2.GetTransactionsListResponse(
+            transactions=[transaction(fee=10, isOutput=True, isError=False)])
+        rows = decode_transactions_list(response)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].hash, 'hash')
@@ -4,6 +4,7 @@ from decimal import Decimal
 from unittest.mock import patch
 
 from wallets import bgw_gateway
+from wallets.rpc import blockchain_gateway_pb2
 from tests import BaseTestCase
 
 
@@ -84,14 +85,18 @@ class TestBGWServiceGateway(BaseTestCase):
 
     async def test_get_transactions_list(self):
         req = {'external_id': 233, 'wallet_address': str(uuid.uuid4())}
-        resp = Future()
-        resp.set_result(self.get_transactions_list_response_data())
+        response = blockchain_gateway_pb2.GetTransactionsListResponse(
+            **self.get_transactions_list_response_data())
+
+        async def base_request(*args, decode, **kwargs):
+            return decode(response)
+
         with patch.object(self.gateway,
                           '_base_request',
-                          return_value=resp) as base_request_mock:
+                          side_effect=base_request) as base_request_mock:
 
             result = await self.gateway.get_transactions_list(**req)
             base_request_mock.assert_called_once()
 
         for index, trx in enumerate(self.get_transactions_list_response_list()):
-            assert trx == result[index]
+            assert trx == result[index].dict()
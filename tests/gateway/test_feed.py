@@ -0,0 +1,111 @@
+import asyncio
+import aiounittest
+from grpclib.const import Status
+from grpclib.exceptions import GRPCError
+
+from wallets.common import Wallet
+from wallets.common import Transaction
+from wallets.common import TransactionEvent
+from wallets.gateway import feed
+from wallets.rpc import wallets_pb2
+from tests.fakes import FakeManager
+
+
+def make_event(event_id, wallet_id=1, is_platform=False, status=1):
+    wallet = Wallet(id=wallet_id, is_platform=is_platform)
+    trx = Transaction(id=event_id, hash=f'hash{event_id}', address_from='a',
+                      address_to='b', currency_slug='bitcoin', value='1',
+                      status=status, wallet=wallet)
+    return TransactionEvent(id=event_id, transaction=trx, status=status)
+
+
+class TestWatchFilter(aiounittest.AsyncTestCase):
+
+    def test_matches(self):
+        watch_filter = feed.WatchFilter(
+            frozenset([1]), wallets_pb2.PLATFORM_WALLETS,
+            frozenset([wallets_pb2.CONFIRMED]))
+
+        self.assertTrue(watch_filter.matches(make_event(
+            1, is_platform=True, status=6).to_message()))
+        self.assertFalse(watch_filter.matches(make_event(
+            2, is_platform=False, status=6).to_message()))
+        self.assertFalse(watch_filter.matches(make_event(
+            3, wallet_id=2, is_platform=True, status=6).to_message()))
+        self.assertFalse(watch_filter.matches(make_event(
+            4, is_platform=True, status=1).to_message()))
+
+    def test_where(self):
+        watch_filter = feed.WatchFilter(
+            frozenset([7]), wallets_pb2.CLIENT_WALLETS, frozenset())
+        sql, params = watch_filter.where(
+            TransactionEvent.select_changes()).sql()
+        self.assertIn('"t2"."wallet_id" IN (%s)', sql)
+        self.assertIn('"t3"."is_platform" != %s', sql)
+        self.assertEqual(params, [7, True])
+
+
+class TestChangeFeed(aiounittest.AsyncTestCase):
+
+    async def test_poll_publishes_and_tracks_gaps(self):
+        manager = FakeManager([make_event(3), make_event(5)],
+                              [make_event(4, wallet_id=2)])
+        change_feed = feed.ChangeFeed(manager, batch_size=10)
+        change_feed.last_seen = 2
+        subscription = feed.Subscription(
+            feed.WatchFilter(frozenset(), 0, frozenset()), 2, 10)
+        change_feed.subscriptions.add(subscription)
+
+        self.assertEqual(await change_feed.poll(), 2)
+        self.assertEqual(change_feed.last_seen, 5)
+        self.assertEqual(list(change_feed.gaps), [4])
+
+        # late commit of the transaction which took sequence 4
+        self.assertEqual(await change_feed.poll(), 1)
+        self.assertEqual(change_feed.gaps, {})
+        self.assertIn('IN (%s)', manager.queries[1].sql()[0])
+
+        sequences = [subscription.queue.get_nowait().sequence
+                     for _ in range(3)]
+        self.assertEqual(sequences, [3, 5, 4])
+
+    async def test_slow_subscriber_overflows(self):
+        subscription = feed.Subscription(
+            feed.WatchFilter(frozenset(), 0, frozenset()), 0, 1)
+        subscription.put(make_event(1).to_message())
+        subscription.put(make_event(2).to_message())
+        with self.assertRaises(feed.FeedOverflow):
+            await subscription.get()
+
+    async def test_watch_resumes_from_cursor(self):
+        manager = FakeManager([make_event(2)],  # feed tail at start
+                              [make_event(2)],  # tail on first subscribe
+                              [make_event(1)],  # oldest retained event
+                              [make_event(2)])  # backlog after cursor 1
+        change_feed = feed.ChangeFeed(manager, poll_interval=10)
+        feed._feeds[asyncio.get_event_loop()] = change_feed
+        sent = []
+
+        async def send(event):
+            sent.append(event.sequence)
+            if len(sent) == 1:
+                change_feed.publish(make_event(3).to_message())
+            else:
+                raise asyncio.CancelledError
+
+        request = wallets_pb2.WatchTransactionsRequest(cursor=1)
+        with self.assertRaises(asyncio.CancelledError):
+            await feed.watch_transactions(request, send, manager)
+        change_feed.task.cancel()
+
+        self.assertEqual(sent, [2, 3])
+        self.assertEqual(change_feed.subscriptions, set())
+
+    async def test_pruned_cursor_is_out_of_range(self):
+        for oldest in ([make_event(5)], []):
+            change_feed = feed.ChangeFeed(FakeManager(oldest))
+            with self.assertRaises(GRPCError) as raised:
+                async for _ in change_feed.backlog(
+                        feed.WatchFilter(frozenset(), 0, frozenset()), 3, 9):
+                    pass
+            self.assertEqual(raised.exception.status, Status.OUT_OF_RANGE)
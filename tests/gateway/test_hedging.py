@@ -0,0 +1,83 @@
+import asyncio
+import aiounittest
+
+from wallets.gateway import hedging
+
+
+def policy(latency=0.01, samples=20, budget=1.0):
+    policy = hedging.HedgePolicy(percentile=95, budget=budget)
+    for _ in range(samples):
+        policy.latencies.observe(latency)
+    return policy
+
+
+class Attempts:
+
+    def __init__(self, *results):
+        self.results = results
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self, number):
+        self.started.append(number)
+        delay, result = self.results[number]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(number)
+            raise
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class TestHedgePolicy(aiounittest.AsyncTestCase):
+
+    def test_percentile(self):
+        window = hedging.LatencyWindow(size=100, min_samples=10)
+        for latency in range(9):
+            window.observe(latency)
+        self.assertIsNone(window.percentile(95))
+        for latency in range(9, 200):
+            window.observe(latency)
+        self.assertEqual(window.percentile(95), 195)
+
+    def test_budget(self):
+        budget = hedging.HedgeBudget(0.5, max_tokens=1)
+        self.assertFalse(budget.spend())
+        for _ in range(4):
+            budget.earn()
+        self.assertTrue(budget.spend())
+        self.assertFalse(budget.spend())
+
+    async def test_late_attempt_is_hedged_and_cancelled(self):
+        attempts = Attempts((1, 'first'), (0, 'second'))
+        hedged = []
+        result = await policy().call(attempts, hedged.append)
+        self.assertEqual(result, ('second', 1))
+        self.assertEqual(hedged, [True])
+        self.assertEqual(attempts.cancelled, [0])
+
+    async def test_fast_attempt_is_not_hedged(self):
+        attempts = Attempts((0, 'first'), (0, 'second'))
+        self.assertEqual(await policy().call(attempts), ('first', 0))
+        self.assertEqual(attempts.started, [0])
+
+    async def test_no_hedge_without_latencies_or_budget(self):
+        for hedge_policy in (policy(samples=1), policy(budget=0)):
+            attempts = Attempts((0.05, 'first'), (0, 'second'))
+            self.assertEqual(await hedge_policy.call(attempts),
+                             ('first', 0))
+            self.assertEqual(attempts.started, [0])
+
+    async def test_errors(self):
+        with self.assertRaisesRegex(RuntimeError, 'early'):
+            await policy().call(
+                Attempts((0, RuntimeError('early')), (0, 'second')))
+
+        attempts = Attempts((0.03, RuntimeError('late')), (0.05, 'second'))
+        self.assertEqual(await policy().call(attempts), ('second', 1))
+
+        with self.assertRaisesRegex(RuntimeError, 'both'):
+            await policy().call(Attempts((0.03, RuntimeError('late')),
+                                         (0.05, RuntimeError('both'))))
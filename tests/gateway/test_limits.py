@@ -0,0 +1,173 @@
+import asyncio
+import contextlib
+import unittest
+import aiounittest
+
+from wallets.gateway import limits
+from wallets.gateway import options
+from wallets.shared.metrics import metrics
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Method:
+    name = '/blockchain_gateway.BlockchainGatewayService/GetBalanceBySlug'
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_waiters_are_served_in_order(self):
+        clock = Clock()
+        bucket = limits.TokenBucket(rate=10, burst=2, clock=clock)
+
+        self.assertEqual([round(bucket.reserve(), 6) for _ in range(5)],
+                         [0, 0, 0.1, 0.2, 0.3])
+        clock.now = 0.3
+        # tokens of the three waiters are taken already
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+
+    def test_refill_is_capped_by_burst(self):
+        clock = Clock()
+        bucket = limits.TokenBucket(rate=1, burst=2, clock=clock)
+        bucket.reserve()
+        clock.now = 100
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 1])
+
+    def test_cancel_gives_token_back(self):
+        clock = Clock()
+        bucket = limits.TokenBucket(rate=1, clock=clock)
+        bucket.reserve()
+        self.assertEqual(bucket.reserve(), 1)
+        bucket.cancel()
+        self.assertEqual(bucket.reserve(), 1)
+
+
+class TestRateLimiter(aiounittest.AsyncTestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    def test_rpc_name(self):
+        self.assertEqual(limits.rpc_name(Method()), 'GetBalanceBySlug')
+
+    async def test_method_and_gateway_buckets(self):
+        limiter = limits.RateLimiter({'bgw': [1000, 3],
+                                      'bgw.GetTransactionsList': [1000, 1]})
+        await limiter.acquire('bgw', 'GetTransactionsList')
+        delay, buckets = limiter.reserve('bgw', 'GetTransactionsList')
+        self.assertEqual(len(buckets), 2)
+        self.assertGreater(delay, 0)  # method bucket is empty
+        self.assertEqual(limiter.reserve('bgw', 'GetBalanceBySlug')[0], 0)
+        self.assertGreater(limiter.reserve('bgw', 'GetBalanceBySlug')[0], 0)
+
+        timing = metrics.snapshot()['timings']
+        self.assertEqual(timing['bgw.GetTransactionsList.rate_limit_wait']
+                         ['count'], 2)
+
+    async def test_not_configured_calls_are_not_limited(self):
+        limiter = limits.RateLimiter({'bgw': [1, 1]})
+        for _ in range(3):
+            await limiter.acquire('transactions', 'StartMonitoring')
+        self.assertEqual(limiter.reserve('transactions', 'X'), (0.0, []))
+        self.assertEqual(metrics.snapshot()['timings'], {})
+
+    async def test_cancelled_waiter_gives_token_back(self):
+        limiter = limits.RateLimiter({'bgw': [10, 1]})
+        await limiter.acquire('bgw', 'GetBalanceBySlug')
+        waiter = asyncio.ensure_future(
+            limiter.acquire('bgw', 'GetBalanceBySlug'))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertAlmostEqual(limiter.buckets['bgw'].tokens, 0, places=1)
+
+
+class TestAdaptiveLimiter(aiounittest.AsyncTestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.clock = Clock()
+
+    def limiter(self, initial=4):
+        return limits.AdaptiveLimiter('bgw', initial, 1, 8, tolerance=2,
+                                      clock=self.clock)
+
+    async def call(self, limiter, latency, error=False, method=''):
+        with self.assertRaises(RuntimeError) if error else \
+                contextlib.suppress():
+            async with limiter.slot(method):
+                self.clock.now += latency
+                if error:
+                    raise RuntimeError
+
+    async def test_additive_increase_multiplicative_decrease(self):
+        limiter = self.limiter()
+        for _ in range(4):
+            await self.call(limiter, 1)
+        self.assertAlmostEqual(limiter.limit, 4.9, places=1)
+        self.assertEqual(limiter.baselines, {'': 1})
+
+        limit = limiter.limit
+        await self.call(limiter, 3)  # over tolerance
+        self.assertEqual(limiter.limit, limit / 2)
+        await self.call(limiter, 1, error=True)
+        self.assertEqual(limiter.limit, limit / 4)
+        await self.call(limiter, 1, error=True)
+        self.assertEqual(limiter.limit, 1)
+        self.assertEqual(
+            metrics.snapshot()['gauges']['bgw.concurrency_limit'], 1)
+
+    async def test_calls_started_before_decrease_dont_decrease(self):
+        limiter = self.limiter()
+        await self.call(limiter, 1)
+        slow = [limiter.slot() for _ in range(3)]
+        for slot in slow:
+            await slot.__aenter__()
+        self.clock.now += 5
+        for slot in slow:
+            await slot.__aexit__(None, None, None)
+        self.assertAlmostEqual(limiter.limit, 4.25 / 2)
+
+    async def test_waiters_are_woken_in_order(self):
+        limiter = self.limiter(initial=1)
+        order = []
+
+        async def call(i):
+            async with limiter.slot():
+                order.append(i)
+                await asyncio.sleep(0)
+
+        calls = [asyncio.ensure_future(call(i)) for i in range(4)]
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.in_flight, 1)
+        self.assertEqual(len(limiter.waiters), 3)
+        calls[1].cancel()
+        await asyncio.gather(*calls, return_exceptions=True)
+        self.assertEqual(order, [0, 2, 3])
+        self.assertEqual((limiter.in_flight, len(limiter.waiters)), (0, 0))
+
+    async def test_methods_have_own_baselines(self):
+        limiter = self.limiter()
+        for _ in range(20):
+            await self.call(limiter, 0.05, method='GetBalanceBySlug')
+            await self.call(limiter, 2, method='GetTransactionsList')
+        self.assertEqual(limiter.limit, 8)
+        await self.call(limiter, 5, method='GetTransactionsList')
+        self.assertEqual(limiter.limit, 4)
+
+    async def test_calls_out_of_caller_time_are_not_counted(self):
+        limiter = self.limiter()
+        with options.deadline(0):
+            for _ in range(3):
+                with self.assertRaises(asyncio.TimeoutError):
+                    async with limiter.slot():
+                        raise asyncio.TimeoutError
+        self.assertEqual((limiter.limit, limiter.baselines), (4, {}))
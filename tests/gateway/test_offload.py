@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import MagicMock
+import aiounittest
+
+from wallets import bgw_gateway
+from wallets.gateway import offload
+from wallets.rpc import blockchain_gateway_pb2
+from wallets.bgw_gateway.decoders import decode_transactions_list
+
+
+def transactions_list_response(size=100, status=blockchain_gateway_pb2.SUCCESS):
+    response = blockchain_gateway_pb2.GetTransactionsListResponse()
+    response.status.status = status
+    for i in range(size):
+        response.transactions.add(**{
+            'from': f'From_{i}',
+            'to': 'To',
+            'hash': f'Hash_{i}',
+            'value': f'{i}.5',
+            'currencySlug': 'Bitcoin',
+        })
+    return response
+
+
+class FakeStream:
+
+    def __init__(self, response):
+        self.response = response
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def send_message(self, message):
+        pass
+
+    async def recv_message(self):
+        return self.response
+
+
+class FakeMethod:
+
+    def __init__(self, response):
+        self.response = response
+        self.channel = MagicMock()
+
+    def open(self, timeout=None, metadata=None):
+        return FakeStream(self.response)
+
+
+class TestOffloadCodec(unittest.TestCase):
+
+    def test_threshold(self):
+        message_type = blockchain_gateway_pb2.GetTransactionsListResponse
+        data = transactions_list_response(10).SerializeToString()
+
+        codec = offload.OffloadCodec(threshold=len(data))
+        self.assertEqual(codec.decode(data, message_type),
+                         offload.RawResponse(data, message_type))
+
+        codec = offload.OffloadCodec(threshold=len(data) + 1)
+        self.assertEqual(codec.decode(data, message_type),
+                         message_type.FromString(data))
+
+
+class TestExecutor(unittest.TestCase):
+
+    def test_created_once_with_forkserver(self):
+        executor = offload.get_executor()
+        self.assertIs(offload.get_executor(), executor)
+        self.assertEqual(executor._mp_context.get_start_method(),
+                         'forkserver')
+
+
+class TestDecodeOffloaded(aiounittest.AsyncTestCase):
+
+    def setUp(self):
+        self.gateway = bgw_gateway.BlockChainServiceGateWay()
+
+    async def request(self, response):
+        raw = offload.RawResponse(response.SerializeToString(),
+                                  type(response))
+        return await self.gateway._base_request(
+            blockchain_gateway_pb2.GetTransactionsListRequest(),
+            FakeMethod(raw),
+            decode=decode_transactions_list,
+        )
+
+    async def test_decoded_in_worker(self):
+        response = transactions_list_response()
+        rows = await self.request(response)
+        self.assertEqual(rows, decode_transactions_list(response))
+
+    async def test_bad_status(self):
+        response = transactions_list_response(
+            status=blockchain_gateway_pb2.ERROR)
+        with self.assertRaises(self.gateway.EXC_CLASS):
+            await self.request(response)
@@ -0,0 +1,94 @@
+import types
+import asyncio
+import aiounittest
+from unittest import mock
+
+from grpclib.metadata import Deadline
+
+from wallets import bgw_gateway
+from wallets.gateway import options
+from wallets.rpc import blockchain_gateway_pb2
+from tests.gateway.test_offload import FakeMethod
+
+
+class RecordingMethod(FakeMethod):
+    name = '/blockchain_gateway.BlockchainGatewayService/GetBalanceBySlug'
+
+    def __init__(self, response):
+        super().__init__(response)
+        self.opened = []
+
+    def open(self, timeout=None, metadata=None):
+        self.opened.append((timeout, metadata))
+        return super().open(timeout, metadata)
+
+
+def balance_response(status=blockchain_gateway_pb2.SUCCESS):
+    response = blockchain_gateway_pb2.GetBalanceResponse(balance='1')
+    response.status.status = status
+    return response
+
+
+class TestCallOptions(aiounittest.AsyncTestCase):
+
+    def setUp(self):
+        self.gateway = bgw_gateway.BlockChainServiceGateWay()
+
+    async def request(self, method, **kwargs):
+        return await self.gateway._base_request(
+            blockchain_gateway_pb2.GetBalanceBySlugRequest(slug='bitcoin'),
+            method, **kwargs)
+
+    async def test_class_settings_are_not_changed(self):
+        method = RecordingMethod(balance_response(blockchain_gateway_pb2.ERROR))
+        for _ in range(2):
+            await self.request(
+                method, extend_statutes=(blockchain_gateway_pb2.ERROR,))
+        self.assertEqual(self.gateway.ALLOWED_STATUTES,
+                         (blockchain_gateway_pb2.SUCCESS,))
+
+        with self.assertRaisesRegex(self.gateway.EXC_CLASS, '^No balance'):
+            await self.request(method, bad_response_msg='No balance.')
+        with self.assertRaisesRegex(self.gateway.EXC_CLASS, '^Bad response'):
+            await self.request(method)
+
+    async def test_method_timeout_and_metadata(self):
+        method = RecordingMethod(balance_response())
+        timeouts = {'bgw.GetBalanceBySlug': 15}
+        with mock.patch.dict(options.conf, GW_METHOD_TIMEOUTS=timeouts):
+            call_options = self.gateway.call_options(
+                method, metadata={'request-id': '1'})
+            self.assertEqual(call_options.timeout, 15)
+            await self.request(method, options=call_options)
+            await self.request(RecordingMethod(balance_response()))
+        self.assertEqual(method.opened, [(15, {'request-id': '1'})])
+        self.assertEqual(
+            self.gateway.call_options(FakeMethod(None)).timeout,
+            self.gateway.TIMEOUT)
+
+    async def test_deadline_cuts_timeout(self):
+        method = RecordingMethod(balance_response())
+        with options.deadline(5):
+            await self.request(method)
+            with options.deadline(60):  # the outer one is earlier
+                await self.request(method)
+        await self.request(method)
+        (first, _), (second, _), (third, _) = method.opened
+        self.assertTrue(4 < first <= 5 and 4 < second <= 5)
+        self.assertEqual(third, self.gateway.call_options(method).timeout)
+
+    async def test_expired_deadline(self):
+        method = RecordingMethod(balance_response())
+        with options.deadline(0):
+            with self.assertRaises(asyncio.TimeoutError):
+                await self.request(method)
+        self.assertEqual(method.opened, [])
+
+    async def test_deadline_of_incoming_request(self):
+        async def handler():
+            await options._on_recv_request(
+                types.SimpleNamespace(deadline=Deadline.from_timeout(3)))
+            return options.time_left(180)
+
+        self.assertLessEqual(await asyncio.ensure_future(handler()), 3)
+        self.assertIsNone(options.get_deadline())
@@ -0,0 +1,148 @@
+import types
+import unittest
+
+from wallets import request_objects
+from wallets.rpc import wallets_pb2
+from wallets.utils.consts import TransactionStatus
+
+
+def transaction(**kwargs):
+    data = {
+        'from': 'from_address',
+        'to': 'to_address',
+        'hash': 'hash',
+        'value': '1.5',
+        'currencySlug': 'bitcoin',
+        'status': wallets_pb2.CONFIRMED,
+    }
+    data.update(kwargs)
+    return wallets_pb2.Transaction(**data)
+
+
+class TestRequestObjects(unittest.TestCase):
+
+    def test_slots(self):
+        obj = request_objects.BalanceRequestObject.from_dict(
+            {'body_amount': '1', 'body_currency': 'bitcoin'})
+        self.assertFalse(hasattr(obj, '__dict__'))
+        self.assertTrue(obj.is_valid())
+        with self.assertRaises(AttributeError):
+            obj.unknown = 1
+
+    def test_missing_required(self):
+        obj = request_objects.BalanceRequestObject.from_dict(
+            {'body_amount': '1'})
+        self.assertIsNone(obj.body_currency)
+        self.assertFalse(obj)
+        self.assertEqual(str(obj.error),
+                         'body_amount and body_currency should be provided')
+
+    def test_required_any(self):
+        valid = request_objects.PlatformWLTMonitoringRequestObject.from_dict(
+            {'wallet_id': '1', 'wallet_address': 'address', 'uuid': 'uuid'})
+        self.assertTrue(valid)
+        invalid = request_objects.PlatformWLTMonitoringRequestObject.\
+            from_dict({'wallet_id': '1', 'wallet_address': 'address'})
+        self.assertFalse(invalid)
+
+    def test_transactions_request(self):
+        request = wallets_pb2.TransactionRequest(
+            transaction=[transaction(), transaction(hash='hash_2')])
+        obj = request_objects.TransactionRequestObject.from_message(request)
+
+        self.assertTrue(obj.is_valid())
+        self.assertEqual(len(obj.transactions), 2)
+        trx = obj.transactions[0]
+        self.assertEqual(trx.fromAddr, 'from_address')
+        self.assertEqual(trx.status, TransactionStatus.CONFIRMED.value)
+        self.assertEqual(trx.dict(), {
+            'address_to': 'to_address',
+            'address_from': 'from_address',
+            'currency_slug': 'bitcoin',
+            'value': '1.5',
+            'hash': 'hash',
+            'status': TransactionStatus.CONFIRMED.value,
+        })
+
+    def test_invalid_nested_transaction(self):
+        request = wallets_pb2.TransactionRequest(
+            transaction=[transaction(), transaction(to='')])
+        obj = request_objects.TransactionRequestObject.from_message(request)
+        self.assertFalse(obj.is_valid())
+        self.assertEqual(str(obj.error),
+                         'Not enough transaction params to send!')
+
+        empty = request_objects.TransactionRequestObject.from_message(
+            wallets_pb2.TransactionRequest())
+        self.assertFalse(empty.is_valid())
+        self.assertEqual(str(empty.error), 'Not enough transaction to update!')
+
+    def test_monitoring_request(self):
+        request = wallets_pb2.MonitoringRequest(wallet=wallets_pb2.Wallet(
+            id=10, address='address', currency_slug='bitcoin'))
+        obj = request_objects.MonitoringRequestObject.from_message(request)
+        self.assertTrue(obj.is_valid())
+        self.assertEqual(obj.wallet.external_id, 10)
+        self.assertEqual(obj.dict(), {
+            'external_id': 10,
+            'is_platform': False,
+            'address': 'address',
+            'currency_slug': 'bitcoin',
+        })
+
+        missing = request_objects.MonitoringRequestObject.from_message(
+            wallets_pb2.MonitoringRequest())
+        self.assertFalse(missing.is_valid())
+        self.assertEqual(str(missing.error), 'need wallet message to send')
+
+    def test_int64_fields_are_coerced(self):
+        request = wallets_pb2.InputTransactionsRequest(
+            wallet_id=3, time_from=1600000000)
+        obj = request_objects.GetInputTrxRequestObject.from_message(request)
+        self.assertEqual(obj.dict()['wallet_id'], '3')  # int64 as in json
+        self.assertEqual((obj.wallet_id, obj.time_from, obj.time_to),
+                         (3, 1600000000, None))
+
+    def test_monitoring_batch_request(self):
+        request = wallets_pb2.MonitoringBatchRequest(wallets=[
+            wallets_pb2.Wallet(id=1, address='a1', currency_slug='bitcoin'),
+            wallets_pb2.Wallet(id=2, address='a2', currency_slug='bitcoin',
+                               is_platform=True),
+        ])
+        obj = request_objects.MonitoringBatchRequestObject.from_message(
+            request)
+        self.assertTrue(obj.is_valid())
+        self.assertEqual(
+            [wallet.wallet_data()['is_platform'] for wallet in obj.wallets],
+            [False, True])
+
+        empty = request_objects.MonitoringBatchRequestObject.from_message(
+            wallets_pb2.MonitoringBatchRequest())
+        self.assertFalse(empty.is_valid())
+        self.assertEqual(str(empty.error), 'need wallets to send')
+
+    def test_add_input_trx_batch_request(self):
+        trx = dict(uuid='u1', from_address='from', hash='h1',
+                   wallet_address='exchanger', currency='bitcoin', value='1')
+        request = wallets_pb2.InputTransactionsBatchRequest(transactions=[
+            wallets_pb2.InputTransactionRequest(**trx),
+            wallets_pb2.InputTransactionRequest(**dict(trx, hash='h2')),
+        ])
+        obj = request_objects.AddInputTrxBatchRequestObject.from_message(
+            request)
+        self.assertTrue(obj.is_valid())
+        wallet = types.SimpleNamespace(id=5, address='exchanger')
+        self.assertEqual(obj.transactions[1].transaction_data(wallet), {
+            'address_to': 'exchanger',
+            'currency_slug': 'bitcoin',
+            'address_from': 'from',
+            'value': '1',
+            'wallet_id': 5,
+            'uuid': 'u1',
+            'hash': 'h2',
+        })
+
+        missing = wallets_pb2.InputTransactionsBatchRequest(transactions=[
+            wallets_pb2.InputTransactionRequest(**dict(trx, hash=''))])
+        self.assertFalse(request_objects.AddInputTrxBatchRequestObject.
+                         from_message(missing).is_valid())
@@ -8,6 +8,7 @@ from tests import test_db
 from tests import BaseTestCase
 from wallets.rpc import wallets_pb2
 from wallets.gateway import method_classes
+from wallets.shared.alerts import AlertDispatcher
 from wallets.common import Wallet
 from wallets.common import Transaction
 from wallets.utils.consts import TransactionStatus
@@ -34,8 +35,6 @@ class TestWalletServer(BaseTestCase):
         self.assertEqual(response, expected_res)
 
     @patch('requests.post', return_value=resp)
-    @patch.object(method_classes.CheckBalanceMethod, 'get_html',
-                  return_value='')
     async def test_check_balance_method(self, *args, **kwargs):
         request = wallets_pb2.CheckBalanceRequest(
             body_currency='bitcoin', body_amount='1'
@@ -54,13 +53,16 @@ class TestWalletServer(BaseTestCase):
         # sending email case
         with patch.object(method_classes.CheckBalanceMethod,
                           'get_balance',
-                          return_value=Decimal('0.22')) as get_balance_mock:
+                          return_value=Decimal('0.22')) as get_balance_mock, \
+                patch.object(AlertDispatcher, 'submit',
+                             return_value=True) as submit_mock:
             resp = await method_classes.CheckBalanceMethod.process(request)
             get_balance_mock.assert_called_once()
+            submit_mock.assert_called_once()
 
         expected_res = wallets_pb2.CheckBalanceResponse()
         expected_res.header.status = wallets_pb2.SUCCESS
-        expected_res.header.description = 'success with send email'
+        expected_res.header.description = 'email is queued'
         self.assertEqual(resp, expected_res)
 
     async def test_start_monitoring_method(self):
@@ -105,6 +107,117 @@ class TestWalletServer(BaseTestCase):
         self.assertFalse(wallet.on_monitoring)
         self.assertNotEqual(on_monitoring, wallet.on_monitoring)
 
+    async def test_stop_monitoring_keeps_fresher_columns(self):
+        wallet = await self.manager.create(
+            Wallet, currency_slug='bitcoin', address='old', external_id=3)
+        registry = method_classes.get_wallet_registry(self.manager)
+        await registry.get_by_external_id(3)  # cached with the old address
+        await self.manager.execute(Wallet.update(address='new').where(
+            Wallet.id == wallet.id))
+
+        request = wallets_pb2.MonitoringRequest(
+            wallet=wallets_pb2.Wallet(id=3, currency_slug='bitcoin'))
+        await method_classes.StopMonitoringMethod.process(request)
+
+        wallet = await self.manager.get(Wallet, id=wallet.id)
+        self.assertEqual((wallet.address, wallet.on_monitoring),
+                         ('new', False))
+        self.assertEqual(registry.find(wallet.id).address, 'new')
+
+    async def test_start_monitoring_batch_method(self):
+        await self.manager.create(Wallet, currency_slug='bitcoin',
+                                  address='existing', external_id=11)
+        request = wallets_pb2.MonitoringBatchRequest(wallets=[
+            wallets_pb2.Wallet(id=10, currency_slug='bitcoin', address='a1'),
+            wallets_pb2.Wallet(id=11, currency_slug='bitcoin', address='a2'),
+            wallets_pb2.Wallet(id=12, currency_slug='bitcoin', address='a3',
+                               is_platform=True),
+            wallets_pb2.Wallet(id=12, currency_slug='ethereum', address='a4',
+                               is_platform=True),
+        ])
+
+        response = await method_classes.StartMonitoringBatchMethod.process(
+            request)
+
+        self.assertEqual(response.header.status, wallets_pb2.SUCCESS)
+        self.assertEqual(
+            [(r.id, r.status) for r in response.results],
+            [(10, wallets_pb2.SUCCESS), (11, wallets_pb2.ERROR),
+             (12, wallets_pb2.SUCCESS), (12, wallets_pb2.ERROR)],
+        )
+        wallet = await self.manager.get(Wallet, external_id=10)
+        self.assertEqual(wallet.address, 'a1')
+        self.assertTrue(wallet.on_monitoring)
+
+    async def test_start_monitoring_rejects_platform_external_id(self):
+        await self.manager.create(Wallet, currency_slug='bitcoin',
+                                  address='platform', external_id=20,
+                                  is_platform=True)
+        wallet = wallets_pb2.Wallet(id=20, currency_slug='bitcoin',
+                                    address='client')
+
+        single = await method_classes.StartMonitoringMethod.process(
+            wallets_pb2.MonitoringRequest(wallet=wallet))
+        batch = await method_classes.StartMonitoringBatchMethod.process(
+            wallets_pb2.MonitoringBatchRequest(wallets=[wallet]))
+
+        self.assertEqual(single.header.status, wallets_pb2.ERROR)
+        self.assertEqual([r.status for r in batch.results],
+                         [wallets_pb2.ERROR])
+        self.assertEqual(await self.manager.count(
+            Wallet.select().where(Wallet.external_id == 20)), 1)
+
+    async def test_stop_monitoring_batch_method(self):
+        wallet = await self.manager.create(
+            Wallet, currency_slug='bitcoin', address='a1', external_id=20)
+        request = wallets_pb2.MonitoringBatchRequest(wallets=[
+            wallets_pb2.Wallet(id=20, currency_slug='bitcoin', address='a1'),
+            wallets_pb2.Wallet(id=21, currency_slug='bitcoin', address='a2'),
+        ])
+
+        response = await method_classes.StopMonitoringBatchMethod.process(
+            request)
+
+        self.assertEqual(
+            [(r.id, r.description) for r in response.results],
+            [(20, ''), (21, 'Wallet with external_id 21 '
+                            'does not exists in db')],
+        )
+        wallet = await self.manager.get(Wallet, id=wallet.id)
+        self.assertFalse(wallet.on_monitoring)
+
+    async def test_add_input_transactions_method(self):
+        wallet = await self.manager.create(
+            Wallet, currency_slug='bitcoin', address='exchanger',
+            external_id=30)
+        await self.manager.create(
+            Transaction, hash='old', address_from='from',
+            address_to=wallet.address, currency_slug='bitcoin', value=1,
+            wallet=wallet)
+        trx = dict(uuid=str(uuid.uuid4()), from_address='from', value='1',
+                   wallet_address='exchanger', currency='bitcoin')
+        request = wallets_pb2.InputTransactionsBatchRequest(transactions=[
+            wallets_pb2.InputTransactionRequest(hash='new', **trx),
+            wallets_pb2.InputTransactionRequest(hash='old', **trx),
+            wallets_pb2.InputTransactionRequest(hash='new', **trx),
+            wallets_pb2.InputTransactionRequest(
+                hash='other', **dict(trx, wallet_address='unknown')),
+        ])
+
+        response = await method_classes.AddInputTransactionsMethod.process(
+            request)
+
+        self.assertEqual(response.header.status, wallets_pb2.SUCCESS)
+        self.assertEqual(
+            [(r.hash, r.status) for r in response.results],
+            [('new', wallets_pb2.SUCCESS), ('old', wallets_pb2.ERROR),
+             ('new', wallets_pb2.ERROR), ('other', wallets_pb2.ERROR)],
+        )
+        added = await self.manager.get(Transaction, hash='new')
+        self.assertEqual(added.wallet_id, wallet.id)
+        self.assertFalse(
+            await self.manager.exists(Transaction, hash='other'))
+
     async def test_update_trx_method(self):
         trx = await self.manager.create(Transaction, **{
             'hash': str(uuid.uuid4()),
@@ -0,0 +1,84 @@
+import os
+import signal
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from wallets import server
+
+
+class TestServeWorkers(unittest.TestCase):
+
+    def setUp(self):
+        handlers = {sig: signal.getsignal(sig)
+                    for sig in (signal.SIGTERM, signal.SIGINT)}
+        for sig, handler in handlers.items():
+            self.addCleanup(signal.signal, sig, handler)
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, self.path)
+
+    def started(self):
+        with open(self.path) as f:
+            return sorted(int(line) for line in f)
+
+    def record(self, index):
+        with open(self.path, 'a') as f:
+            f.write(f'{index}\n')
+
+    def test_crashing_workers_are_given_up(self):
+        def run_worker(index, role, worker_thread):
+            self.record(index)
+            raise RuntimeError('cant bind')
+
+        with mock.patch.object(server, 'run_worker', run_worker), \
+                mock.patch.object(server, 'stop_listener'):
+            code = server.serve_workers(2, server.API_ROLE,
+                                        restart_delay=0.001, max_restarts=2)
+
+        self.assertEqual(self.started(), [0, 0, 0, 1, 1, 1])
+        self.assertEqual(code, 0)
+
+    def test_giving_up_monitoring_worker_stops_all(self):
+        def run_worker(index, role, worker_thread):
+            self.record(index)
+            if index == 0:
+                raise RuntimeError('cant connect')
+            signal.pause()  # until SIGTERM from the parent
+
+        with mock.patch.object(server, 'run_worker', run_worker), \
+                mock.patch.object(server, 'stop_listener'):
+            code = server.serve_workers(2, restart_delay=0.001,
+                                        max_restarts=2)
+
+        self.assertEqual(self.started(), [0, 0, 0, 1])
+        self.assertEqual(code, 1)
+
+    def test_sigterm_is_forwarded_without_restarts(self):
+        def run_worker(index, role, worker_thread):
+            self.record(index)
+            signal.pause()  # until SIGTERM from the parent
+
+        timer = threading.Timer(
+            0.5, os.kill, (os.getpid(), signal.SIGTERM))
+        timer.start()
+        self.addCleanup(timer.cancel)
+        with mock.patch.object(server, 'run_worker', run_worker), \
+                mock.patch.object(server, 'stop_listener'):
+            server.serve_workers(2, restart_delay=0.001)
+
+        self.assertEqual(self.started(), [0, 1])
+
+    def test_only_first_worker_runs_monitoring(self):
+        roles = []
+        with mock.patch.object(
+                server, 'serve',
+                lambda role, **kwargs: roles.append(role)), \
+                mock.patch.object(server.signal, 'signal'):
+            server.run_worker(0, server.BOTH_ROLE, False)
+            server.run_worker(1, server.BOTH_ROLE, False)
+            server.run_worker(1, server.WORKER_ROLE, False)
+
+        self.assertEqual(roles, [server.BOTH_ROLE, server.API_ROLE,
+                                 server.API_ROLE])
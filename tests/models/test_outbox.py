@@ -0,0 +1,65 @@
+import unittest
+
+from wallets.common import Outbox
+from wallets.common import Transaction
+from tests import BaseTestCase
+
+
+class TestOutboxQueries(unittest.TestCase):
+
+    def test_claim_skips_locked_rows_in_order(self):
+        sql, params = Outbox.claim(Outbox.EXCHANGER, 10, 50).sql()
+
+        self.assertIn('FOR UPDATE SKIP LOCKED', sql)
+        self.assertIn('INNER JOIN "transaction"', sql)
+        self.assertTrue(sql.endswith('ORDER BY "t1"."id"'))
+        self.assertEqual(params, [Outbox.EXCHANGER, 10, 50])
+
+    def test_put(self):
+        sql, params = Outbox.put(
+            Outbox.TRANSACTIONS, Transaction(id=1), Transaction(id=2)).sql()
+
+        self.assertTrue(sql.startswith(
+            'INSERT INTO "outbox" ("topic", "transaction_id") VALUES'))
+        self.assertIn('ON CONFLICT DO NOTHING', sql)
+        self.assertEqual(params, [Outbox.TRANSACTIONS, 1,
+                                  Outbox.TRANSACTIONS, 2])
+
+    def test_put_from(self):
+        query = Transaction.select().where(Transaction.id.in_([3]))
+        sql, params = Outbox.put_from(Outbox.EXCHANGER, query).sql()
+
+        self.assertTrue(sql.startswith(
+            'INSERT INTO "outbox" ("topic", "transaction_id") '
+            'SELECT %s, "t1"."id" FROM "transaction"'))
+        self.assertIn('ON CONFLICT DO NOTHING', sql)
+        self.assertEqual(params, [Outbox.EXCHANGER, 3])
+
+
+class TestOutboxClaim(BaseTestCase):
+
+    async def test_claim_runs_on_db(self):
+        transactions = [
+            await self.manager.create(
+                Transaction, address_from='a', address_to='b',
+                currency_slug='bitcoin', value='1')
+            for _ in range(3)]
+        await self.manager.execute(
+            Outbox.put(Outbox.EXCHANGER, *transactions))
+        await self.manager.execute(
+            Outbox.put(Outbox.TRANSACTIONS, transactions[0]))
+        queued = await self.manager.get_all(Outbox.select().where(
+            Outbox.topic == Outbox.EXCHANGER).order_by(Outbox.id))
+
+        async with self.manager.atomic():
+            claimed = await self.manager.get_all(
+                Outbox.claim(Outbox.EXCHANGER, queued[0].id, 10))
+        self.assertEqual([row.id for row in claimed],
+                         [row.id for row in queued[1:]])
+        self.assertEqual([row.transaction.id for row in claimed],
+                         [trx.id for trx in transactions[1:]])
+
+        async with self.manager.atomic():
+            claimed = await self.manager.get_all(
+                Outbox.claim(Outbox.EXCHANGER, 0, 1))
+        self.assertEqual([row.id for row in claimed], [queued[0].id])
@@ -0,0 +1,171 @@
+import asyncio
+import aiounittest
+
+from wallets import request_objects
+from wallets.common import Wallet
+from wallets.common import registry
+from wallets.rpc import wallets_pb2
+from wallets.shared import notify
+from wallets.utils import atomic
+from tests import BaseTestCase
+from tests.fakes import FakeManager
+
+
+def make_wallet(wallet_id, external_id=None, address='a', slug='bitcoin',
+                is_platform=False, on_monitoring=True):
+    return Wallet(id=wallet_id, external_id=external_id or wallet_id,
+                  address=address, currency_slug=slug,
+                  is_platform=is_platform, on_monitoring=on_monitoring,
+                  is_active=True)
+
+
+class TestWalletRegistry(aiounittest.AsyncTestCase):
+
+    async def test_lookups(self):
+        wallets = registry.WalletRegistry(FakeManager([
+            make_wallet(1, external_id=7, is_platform=True),
+            make_wallet(2, external_id=7, address='b'),
+            make_wallet(3, address='a'),
+        ]))
+        await wallets.load()
+
+        self.assertEqual(wallets.find(3).id, 3)
+        self.assertEqual(wallets.find_by_external_id(7).id, 2)
+        self.assertEqual(wallets.find_by_address('a', 'bitcoin').id, 1)
+        self.assertIsNone(wallets.find_by_address('a', 'ethereum'))
+
+        wallets.discard(1)
+        self.assertEqual(wallets.find_by_address('a', 'bitcoin').id, 3)
+        wallets.put(make_wallet(2, external_id=8, address='c'))
+        self.assertIsNone(wallets.find_by_external_id(7))
+        self.assertEqual(wallets.find_by_address('c', 'bitcoin').id, 2)
+        self.assertNotIn(('b', 'bitcoin'), wallets.by_address)
+
+    async def test_request_ids_hit_registry(self):
+        wallets = registry.WalletRegistry(FakeManager([make_wallet(1, 7)]))
+        await wallets.load()
+        request = request_objects.MonitoringRequestObject.from_message(
+            wallets_pb2.MonitoringRequest(wallet=wallets_pb2.Wallet(
+                id=7, address='a', currency_slug='bitcoin')))
+
+        self.assertEqual(wallets.find_by_external_id(request.wallet.id).id, 1)
+
+    async def test_put_on_commit(self):
+        manager = FakeManager()
+        wallets = registry.WalletRegistry(manager)
+
+        async with atomic(manager):
+            async with atomic(manager):
+                wallets.put_on_commit(make_wallet(1))
+            with self.assertRaises(ValueError):
+                async with atomic(manager):
+                    wallets.put_on_commit(make_wallet(3))
+                    raise ValueError
+            self.assertIsNone(wallets.find(1))  # outer block not committed
+        self.assertEqual(wallets.find(1).id, 1)
+        self.assertIsNone(wallets.find(3))
+
+        with self.assertRaises(ValueError):
+            async with atomic(manager):
+                wallets.put_on_commit(make_wallet(2))
+                raise ValueError
+        self.assertIsNone(wallets.find(2))
+        self.assertEqual(manager.queries[-2:], ['BEGIN', 'ROLLBACK'])
+
+    async def test_registry_per_manager(self):
+        first, second = FakeManager(), FakeManager()
+        self.assertIs(registry.get_wallet_registry(first),
+                      registry.get_wallet_registry(first))
+        self.assertIs(registry.get_wallet_registry(second).manager, second)
+
+    async def test_get_falls_back_to_db(self):
+        manager = FakeManager()
+        wallets = registry.WalletRegistry(manager)
+        wallets.task = object()  # not started in this test
+
+        with self.assertRaises(Wallet.DoesNotExist):
+            await wallets.get_by_address('a', 'bitcoin')
+        self.assertEqual(manager.queries,
+                         [{'address': 'a', 'currency_slug': 'bitcoin'}])
+
+        wallets.put(make_wallet(1))
+        self.assertEqual((await wallets.get_by_address('a', 'bitcoin')).id, 1)
+        self.assertEqual(len(manager.queries), 1)
+
+    async def test_load_keeps_wallets_put_meanwhile(self):
+        wallets = registry.WalletRegistry(FakeManager(
+            [make_wallet(1, on_monitoring=True), make_wallet(2)]))
+        loading = asyncio.ensure_future(wallets.load())
+        await asyncio.sleep(0)
+        wallets.put(make_wallet(1, on_monitoring=False))
+        wallets.put(make_wallet(3))
+        wallets.discard(2)
+        await loading
+
+        self.assertEqual(sorted(wallets.wallets), [1, 3])
+        self.assertFalse(wallets.find(1).on_monitoring)
+
+    async def test_select(self):
+        wallets = registry.WalletRegistry(FakeManager([
+            make_wallet(2), make_wallet(1, on_monitoring=False),
+            make_wallet(3, is_platform=True),
+        ]))
+        selected = await wallets.select(on_monitoring=True, is_platform=False)
+        self.assertEqual([wallet.id for wallet in selected], [2])
+        wallets.task.cancel()
+
+    async def test_invalidate_refreshes_wallets(self):
+        manager = FakeManager([make_wallet(1), make_wallet(2)],
+                              [make_wallet(2, address='b')])
+        listener = notify.NotificationListener([])
+        wallets = registry.WalletRegistry(manager, listener)
+        wallets.task = asyncio.ensure_future(wallets.run())
+        await wallets.ready.wait()
+
+        handler, = listener.handlers[notify.WALLET_CHANGES]
+        handler('1,2')
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        self.assertEqual(sorted(wallets.wallets), [2])
+        self.assertEqual(wallets.find_by_address('b', 'bitcoin').id, 2)
+
+        handler(None)
+        self.assertTrue(wallets.reload)
+        wallets.task.cancel()
+        await asyncio.gather(wallets.task, return_exceptions=True)
+
+    async def test_notify_changes(self):
+        manager = FakeManager()
+        await registry.notify_changes(manager, [])
+        await registry.notify_changes(manager, [1, 2])
+        await registry.notify_changes(
+            manager, list(range(registry.MAX_NOTIFY_IDS + 1)))
+
+        self.assertEqual(
+            [query.sql()[1] for query in manager.queries],
+            [[notify.WALLET_CHANGES, '1,2'], [notify.WALLET_CHANGES, '']])
+
+
+class TestWalletRegistryQueries(BaseTestCase):
+
+    async def test_load_and_refresh_run_on_db(self):
+        first, second = [
+            await self.manager.create(
+                Wallet, currency_slug='bitcoin', address=address,
+                external_id=external_id)
+            for address, external_id in (('reg-a', 101), ('reg-b', 102))]
+        wallets = registry.WalletRegistry(self.manager)
+        await wallets.load()
+        self.assertEqual(wallets.find_by_address('reg-a', 'bitcoin').id,
+                         first.id)
+
+        await self.manager.execute(Wallet.update(on_monitoring=False).where(
+            Wallet.id == first.id))
+        await self.manager.execute(Wallet.delete().where(
+            Wallet.id == second.id))
+        await wallets.refresh([first.id, second.id])
+
+        self.assertFalse(wallets.find(first.id).on_monitoring)
+        self.assertIsNone(wallets.find(second.id))
+        self.assertIsNone(wallets.find_by_external_id(102))
@@ -0,0 +1,114 @@
+import asyncio
+import aiounittest
+
+from wallets.shared.alerts import Alert, AlertDispatcher
+from wallets.shared.metrics import metrics
+
+
+class FakeSender:
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.sent = []
+
+    async def __call__(self, html, subject, session=None):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('mailgun is down')
+        self.sent.append((subject, html))
+
+
+class FakeSession:
+
+    async def close(self):
+        pass
+
+
+async def fake_render(template, **context):
+    return template
+
+
+class TestAlertDispatcher(aiounittest.AsyncTestCase):
+
+    def get_dispatcher(self, sender, **kwargs):
+        options = dict(renderer=fake_render, digest_delay=0.05,
+                       min_interval=0, retry_delay=0)
+        options.update(kwargs)
+        dispatcher = AlertDispatcher(sender, **options)
+        dispatcher.session = object()  # no real http session in tests
+        return dispatcher
+
+    async def stop(self, dispatcher):
+        dispatcher.session = None
+        dispatcher.task.cancel()
+        await asyncio.gather(dispatcher.task, return_exceptions=True)
+
+    async def test_digest_and_suppression(self):
+        sender = FakeSender()
+        dispatcher = self.get_dispatcher(sender)
+        self.assertTrue(dispatcher.submit(Alert(('btc', '1'), 'Warning', 'a')))
+        self.assertTrue(dispatcher.submit(Alert(('eth', '1'), 'Warning', 'b')))
+        self.assertFalse(dispatcher.submit(Alert(('btc', '1'), 'Warning', 'c')))
+        self.assertTrue(dispatcher.is_suppressed(('btc', '1')))
+        await asyncio.sleep(0.1)
+        await self.stop(dispatcher)
+
+        self.assertEqual(
+            sender.sent, [('Warning (+1 more alerts)', 'a<hr/>b')])
+
+    async def test_retry(self):
+        sender = FakeSender(failures=2)
+        dispatcher = self.get_dispatcher(sender, digest_delay=0)
+        dispatcher.submit(Alert(None, 'Warning', 'a'))
+        await asyncio.sleep(0.05)
+        await self.stop(dispatcher)
+        self.assertEqual(sender.sent, [('Warning', 'a')])
+
+    async def test_failed_alert_is_not_suppressed(self):
+        metrics.reset()
+        sender = FakeSender(failures=3)
+        dispatcher = self.get_dispatcher(
+            sender, digest_delay=0, max_attempts=3)
+        dispatcher.submit(Alert('btc', 'Warning', 'a'))
+        await asyncio.sleep(0.05)
+        await self.stop(dispatcher)
+        self.assertEqual(sender.sent, [])
+        self.assertFalse(dispatcher.is_suppressed('btc'))
+        self.assertEqual(metrics.snapshot()['counters']['alerts.failed'], 1)
+
+    async def test_rate_limit(self):
+        sender = FakeSender()
+        dispatcher = self.get_dispatcher(
+            sender, digest_delay=0, min_interval=10)
+        dispatcher.submit(Alert('btc', 'Warning', 'a'))
+        await asyncio.sleep(0.02)
+        dispatcher.submit(Alert('eth', 'Warning', 'b'))
+        await asyncio.sleep(0.05)
+        await self.stop(dispatcher)
+        self.assertEqual(sender.sent, [('Warning', 'a')])
+        self.assertEqual(dispatcher.queue.qsize(), 0)  # waits for interval
+
+    async def test_flush_sends_queued_alerts(self):
+        sender = FakeSender()
+        dispatcher = self.get_dispatcher(sender, digest_delay=10,
+                                         digest_size=2)
+        dispatcher.session = FakeSession()
+        for template in 'abc':
+            dispatcher.submit(Alert(template, 'Warning', template))
+        await asyncio.sleep(0.01)  # the task collects, waits for digest
+
+        await dispatcher.flush(timeout=1)
+        self.assertTrue(dispatcher.task is None)
+        self.assertEqual(sender.sent, [('Warning (+1 more alerts)', 'a<hr/>b'),
+                                       ('Warning', 'c')])
+
+    async def test_expired_keys_are_pruned(self):
+        dispatcher = self.get_dispatcher(FakeSender(), suppress_window=0.01,
+                                         digest_delay=10)
+        dispatcher.submit(Alert('a', 'Warning', 'a'))
+        dispatcher.submit(Alert('b', 'Warning', 'b'))
+        await asyncio.sleep(0.02)
+        dispatcher.submit(Alert('c', 'Warning', 'c'))
+
+        self.assertEqual(list(dispatcher._queued_at), ['c'])
+        await self.stop(dispatcher)
@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+import aiounittest
+import peewee_async
+from unittest.mock import patch
+
+from wallets.shared import database
+from wallets.shared.metrics import metrics
+
+
+class TestCreateDatabase(unittest.TestCase):
+
+    def test_pool_disabled(self):
+        with patch.dict(database.conf, {'DB_POOL_ENABLED': False}):
+            db = database.create_database()
+        self.assertIsInstance(db, peewee_async.PostgresqlDatabase)
+        self.assertEqual(db.max_connections, 1)
+
+    def test_pool_settings_from_config(self):
+        with patch.dict(database.conf, {
+            'DB_POOL_ENABLED': True,
+            'DB_POOL_MIN_SIZE': 2,
+            'DB_POOL_MAX_SIZE': 7,
+            'DB_POOL_RECYCLE': 60,
+            'DB_POOL_ACQUIRE_TIMEOUT': 3,
+        }):
+            db = database.create_database(pool_name='api')
+
+        self.assertIsInstance(db, database.PooledPostgresqlDatabase)
+        params = db.connect_params_async
+        self.assertEqual(params['minsize'], 2)
+        self.assertEqual(params['maxsize'], 7)
+        self.assertEqual(params['pool_recycle'], 60)
+        self.assertEqual(params['acquire_timeout'], 3)
+        self.assertEqual(params['pool_name'], 'api')
+
+    def test_env_has_priority(self):
+        with patch.dict(database.conf, {'DB_POOL_ENABLED': True,
+                                        'DB_POOL_MAX_SIZE': 7}), \
+                patch.dict('os.environ', {'PGPOOL_MAX_SIZE': '15'}):
+            db = database.create_database()
+        self.assertEqual(db.max_connections, 15)
+
+
+class FakePool:
+    size = 1
+    freesize = 0
+
+    async def acquire(self):
+        await asyncio.sleep(1)
+
+
+class TestMonitoredPoolConnection(aiounittest.AsyncTestCase):
+
+    async def test_acquire_timeout(self):
+        metrics.reset()
+        conn = database.MonitoredPoolConnection(
+            database='test', acquire_timeout=0.01, pool_name='test_pool')
+        conn.pool = FakePool()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await conn.acquire()
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['counters']['test_pool.acquire_timeouts'], 1)
+        self.assertEqual(
+            snapshot['timings']['test_pool.acquire_wait']['count'], 1)
@@ -0,0 +1,67 @@
+import sys
+import unittest
+import subprocess
+from unittest.mock import patch
+
+from wallets.shared.lazy import LazyObject
+from wallets.scripts import import_report
+
+
+class Service:
+    created = 0
+
+    def __init__(self):
+        Service.created += 1
+
+    def ping(self):
+        return 'pong'
+
+
+class TestLazyObject(unittest.TestCase):
+
+    def setUp(self):
+        Service.created = 0
+
+    def test_created_on_first_use(self):
+        service = LazyObject(Service)
+        self.assertFalse(service.is_ready)
+        self.assertEqual(Service.created, 0)
+
+        self.assertEqual(service.ping(), 'pong')
+        self.assertEqual(service.ping(), 'pong')
+        self.assertTrue(service.is_ready)
+        self.assertEqual(Service.created, 1)
+
+    def test_patch_object(self):
+        service = LazyObject(Service)
+        with patch.object(service, 'ping', return_value='patched'):
+            self.assertEqual(service.ping(), 'patched')
+        self.assertEqual(service.ping(), 'pong')
+
+
+class TestLazyStartup(unittest.TestCase):
+
+    def test_import_does_not_create_resources(self):
+        code = (
+            'import sys, wallets, wallets.gateway;'
+            'print("database" in vars(wallets), end=" ");'
+            'import wallets.monitoring.common as common;'
+            'print(common.b_gw.is_ready, common.lock_manager.is_ready, '
+            '"aioredlock" in sys.modules)'
+        )
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         universal_newlines=True)
+        self.assertEqual(output.splitlines()[-1], 'False False False False')
+
+    def test_import_report_parse(self):
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       100 |        100 |   peewee\n'
+            'import time:        50 |        150 | wallets\n'
+        )
+        times = import_report.parse(output)
+        self.assertEqual(times, [
+            import_report.ImportTime('peewee', 100, 100),
+            import_report.ImportTime('wallets', 50, 150),
+        ])
+        self.assertIn('wallets', import_report.report(times).splitlines()[1])
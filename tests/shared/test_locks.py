@@ -0,0 +1,134 @@
+import asyncio
+import aiounittest
+
+from aioredlock import LockError
+
+from wallets.shared import locks
+from tests import BaseTestCase
+from tests.fakes import FakeManager
+
+
+class FakeRedlock:
+
+    def __init__(self, locked=False, error=False, lost=False):
+        self.locked = locked
+        self.error = error
+        self.lost = lost
+        self.unlocked = []
+        self.extended = 0
+
+    async def is_locked(self, key):
+        return self.locked
+
+    async def lock(self, key):
+        if self.error:
+            raise LockError('taken meanwhile')
+        return key
+
+    async def extend(self, lock):
+        self.extended += 1
+        if self.lost:
+            raise LockError('expired')
+
+    async def unlock(self, lock):
+        self.unlocked.append(lock)
+
+
+class TestLockBackends(aiounittest.AsyncTestCase):
+
+    async def test_local(self):
+        backend = locks.LocalLockBackend()
+        async with backend.acquire('a', None) as first:
+            async with backend.acquire('a', None) as second:
+                self.assertEqual((first.key, second), ('a', None))
+            async with backend.acquire('b', None) as other:
+                self.assertIsNone(other.token)
+        async with backend.acquire('a', None) as again:
+            self.assertIsNotNone(again)
+        self.assertEqual(backend.held, set())
+
+    async def test_postgres(self):
+        manager = FakeManager(True, False)
+        backend = locks.PostgresLockBackend()
+        async with backend.acquire('Wallet_id_1', manager) as lease:
+            self.assertEqual((lease.key, lease.token), ('Wallet_id_1', None))
+        async with backend.acquire('Wallet_id_1', manager) as lease:
+            self.assertIsNone(lease)
+        begin, query, commit = manager.queries[:3]
+        self.assertEqual((begin, commit), ('BEGIN', 'COMMIT'))
+        self.assertEqual(query.sql(), (
+            'SELECT pg_try_advisory_xact_lock(hashtext(%s))',
+            ['Wallet_id_1']))
+
+    async def test_redis(self):
+        backend = locks.RedisLockBackend()
+        for redlock, acquired in ((FakeRedlock(), True),
+                                  (FakeRedlock(locked=True), False),
+                                  (FakeRedlock(error=True), False)):
+            backend.redlock = redlock
+            manager = FakeManager(7)
+            async with backend.acquire('key', manager) as lease:
+                self.assertEqual(lease and lease.token,
+                                 7 if acquired else None)
+            self.assertEqual(redlock.unlocked, ['key'] if acquired else [])
+
+    async def test_redis_lease_is_renewed(self):
+        backend = locks.RedisLockBackend(lease_time=0.03)
+        backend.redlock = FakeRedlock()
+        async with backend.acquire('key', FakeManager(1)) as lease:
+            await asyncio.sleep(0.05)
+            self.assertGreaterEqual(backend.redlock.extended, 2)
+            self.assertFalse(lease.lost)
+
+        backend.redlock = FakeRedlock(lost=True)
+        async with backend.acquire('key', FakeManager(2)) as lease:
+            await asyncio.sleep(0.02)
+            self.assertTrue(lease.lost)
+        self.assertEqual(backend.redlock.extended, 1)
+
+    async def test_fenced(self):
+        manager = FakeManager([locks.LockFence(token=5)], [])
+        async with locks.fenced(locks.Lease('key', 5), manager):
+            pass
+        with self.assertRaisesRegex(locks.StaleLease, 'newer holder'):
+            async with locks.fenced(locks.Lease('key', 4), manager):
+                pass
+        lost = locks.Lease('key')
+        lost.lost = True
+        with self.assertRaisesRegex(locks.StaleLease, 'is lost'):
+            async with locks.fenced(lost, manager):
+                pass
+        async with locks.fenced(locks.Lease('key'), manager):
+            pass  # no token, nothing to check
+
+        self.assertEqual(manager.queries[1].sql()[1], ['key', 5])
+        self.assertEqual(manager.transactions(),
+                         ['BEGIN', 'COMMIT', 'BEGIN', 'ROLLBACK',
+                          'BEGIN', 'ROLLBACK', 'BEGIN', 'COMMIT'])
+
+    def test_unknown_backend(self):
+        self.assertIsInstance(locks.create_lock_backend('local'),
+                              locks.LocalLockBackend)
+        with self.assertRaisesRegex(ValueError, 'Unknown LOCK_BACKEND'):
+            locks.create_lock_backend('zookeeper')
+
+
+class TestLockFenceQueries(BaseTestCase):
+
+    async def test_tokens_are_advanced_on_db(self):
+        first = await self.manager.scalar(locks.LockFence.next_token())
+        second = await self.manager.scalar(locks.LockFence.next_token())
+        self.assertGreater(second, first)
+
+        async with locks.fenced(locks.Lease('fence', second), self.manager):
+            pass
+        with self.assertRaisesRegex(locks.StaleLease, 'newer holder'):
+            async with locks.fenced(locks.Lease('fence', first),
+                                    self.manager):
+                pass
+        fence = await self.manager.get(locks.LockFence, key='fence')
+        self.assertEqual(fence.token, second)
+
+        advanced = await self.manager.returning(
+            locks.LockFence.advance('fence', second + 1))
+        self.assertEqual([row.token for row in advanced], [second + 1])
@@ -0,0 +1,67 @@
+import sys
+import json
+import queue
+import logging
+import unittest
+
+from wallets.shared import logging as wallets_logging
+
+
+def make_record(name, level=logging.INFO, msg='test', args=(),
+                exc_info=None):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, exc_info)
+
+
+class TestLogging(unittest.TestCase):
+
+    def test_formatted_in_caller(self):
+        request = {'id': 1}
+        log_queue = queue.SimpleQueue()
+        handler = wallets_logging.LazyQueueHandler(log_queue)
+        handler.handle(make_record('wallets', msg='request %s',
+                                   args=([request],)))
+        request['id'] = 2  # changed after logging
+
+        record = log_queue.get_nowait()
+        self.assertEqual(record.getMessage(), "request [{'id': 1}]")
+        self.assertIsNone(record.context)
+
+    def test_queued_context_and_traceback(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            exc_info = sys.exc_info()
+        log_queue = queue.SimpleQueue()
+        handler = wallets_logging.LazyQueueHandler(log_queue)
+        handler.handle(make_record('wallets', logging.ERROR, 'failed',
+                                   ({'req': 1},), exc_info))
+
+        record = log_queue.get_nowait()
+        self.assertIsNone(record.exc_info)
+        data = json.loads(wallets_logging.JsonFormatter().format(record))
+        self.assertEqual(data['message'], 'failed')
+        self.assertEqual(data['context'], {'req': 1})
+        self.assertIn('ValueError: boom', data['exc_info'])
+
+    def test_listener_thread(self):
+        listener = wallets_logging.listener
+        self.assertTrue(listener._thread.is_alive())
+        self.assertIs(wallets_logging.logger.handlers[0].queue,
+                      listener.queue)
+
+    def test_sampling(self):
+        sampling = wallets_logging.SamplingFilter({'monitoring': 3})
+        name = wallets_logging.get_logger('monitoring').name
+
+        passed = [sampling.filter(make_record(name)) for _ in range(6)]
+        self.assertEqual(passed, [True, False, False, True, False, False])
+        self.assertTrue(sampling.filter(make_record(name, logging.ERROR)))
+        self.assertTrue(sampling.filter(make_record(
+            wallets_logging.get_logger('server').name)))
+
+    def test_json_formatter(self):
+        record = make_record('wallets', msg='failed %s',
+                             args=({'req': {'id': 1}},))
+        data = json.loads(wallets_logging.JsonFormatter().format(record))
+        self.assertEqual(data['level'], 'INFO')
+        self.assertEqual(data['context'], {'req': {'id': 1}})
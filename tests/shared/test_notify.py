@@ -0,0 +1,110 @@
+import asyncio
+import aiounittest
+
+import peewee
+
+from wallets.shared import notify
+from tests.fakes import FakeManager
+
+
+class FakeCursor:
+
+    def __init__(self):
+        self.executed = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def execute(self, sql):
+        self.executed.append(sql)
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.notifies = asyncio.Queue()
+        self.cursor_ = FakeCursor()
+
+    def cursor(self):
+        return self.cursor_
+
+
+class Notification:
+
+    def __init__(self, channel, payload=''):
+        self.channel = channel
+        self.payload = payload
+
+
+class TestNotificationListener(aiounittest.AsyncTestCase):
+
+    async def test_notification_wakes_waiter(self):
+        listener = notify.NotificationListener([notify.NEW_TRANSACTIONS])
+        conn = FakeConnection()
+        task = asyncio.ensure_future(listener.listen(conn))
+        await asyncio.sleep(0)
+
+        self.assertEqual(conn.cursor_.executed,
+                         [f'LISTEN "{notify.NEW_TRANSACTIONS}"'])
+        # woken once after LISTEN for work committed before it
+        self.assertTrue(await listener.wait(notify.NEW_TRANSACTIONS, 1))
+        self.assertFalse(await listener.wait(notify.NEW_TRANSACTIONS, 0.01))
+
+        conn.notifies.put_nowait(Notification(notify.NEW_TRANSACTIONS))
+        conn.notifies.put_nowait(Notification('unknown'))
+        self.assertTrue(await listener.wait(notify.NEW_TRANSACTIONS, 1))
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def test_channel_added_while_listening(self):
+        listener = notify.NotificationListener([notify.NEW_TRANSACTIONS])
+        conn = FakeConnection()
+        task = asyncio.ensure_future(listener.listen(conn))
+        await asyncio.sleep(0)
+
+        listener.add_channel(notify.TRANSACTION_EVENTS)
+        listener.add_channel(notify.TRANSACTION_EVENTS)
+        await asyncio.sleep(0)
+        self.assertEqual(conn.cursor_.executed, [
+            f'LISTEN "{notify.NEW_TRANSACTIONS}"',
+            f'LISTEN "{notify.TRANSACTION_EVENTS}"',
+        ])
+        conn.notifies.put_nowait(Notification(notify.TRANSACTION_EVENTS))
+        self.assertTrue(await listener.wait(notify.TRANSACTION_EVENTS, 1))
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def test_handlers_get_payloads(self):
+        payloads = []
+        listener = notify.NotificationListener([])
+        listener.add_handler(notify.WALLET_CHANGES, payloads.append)
+        conn = FakeConnection()
+        task = asyncio.ensure_future(listener.listen(conn))
+        await asyncio.sleep(0)
+
+        self.assertEqual(conn.cursor_.executed,
+                         [f'LISTEN "{notify.WALLET_CHANGES}"'])
+        conn.notifies.put_nowait(Notification(notify.WALLET_CHANGES, '1,2'))
+        await asyncio.sleep(0)
+        self.assertEqual(payloads, [None, '1,2'])  # None after LISTEN
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    def test_listener_is_shared_in_loop(self):
+        self.assertIs(notify.get_listener(), notify.get_listener())
+
+    async def test_notify_query(self):
+        manager = FakeManager()
+        await notify.notify(manager, notify.CONFIRMED_TRANSACTIONS)
+
+        query, = manager.queries
+        self.assertIsInstance(query, peewee.RawQuery)
+        self.assertEqual(
+            query.sql(),
+            ('SELECT pg_notify(%s, %s)', [notify.CONFIRMED_TRANSACTIONS, '']))
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import aiounittest
+from unittest.mock import patch
+
+from wallets.settings.config import conf
+from wallets.shared import templates
+
+
+class TestTemplates(aiounittest.AsyncTestCase):
+
+    async def test_render_balance_alarm(self):
+        html = await templates.render_template(
+            conf['ALARM_TEMPLATE'],
+            currency='bitcoin', body='1', balance='0.22',
+        )
+        self.assertIn('currency bitcoin and body amount 1', html)
+        self.assertIn('balance is 0.22', html)
+
+    async def test_render_monitoring_result_escapes_values(self):
+        html = await templates.render_template(
+            conf['MONITORING_TEMPLATE'],
+            wallets=[{'currencySlug': '<b>', 'value': 1, 'current': 2}],
+            warning=None,
+        )
+        self.assertIn('&lt;b&gt;', html)
+
+    def test_templates_are_compiled_once(self):
+        loaded = templates.load_templates()
+        self.assertEqual(len(loaded), 2)
+        self.assertIs(templates.load_templates()[0], loaded[0])
+
+    def test_bytecode_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                patch.object(templates, 'TEMPLATES_CACHE_DIR', cache_dir):
+            env = templates._create_environment()
+            env.get_template(conf['ALARM_TEMPLATE'])
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
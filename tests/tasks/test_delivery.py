@@ -0,0 +1,63 @@
+import aiounittest
+
+import peewee
+
+from wallets.common import Outbox
+from wallets.common import Transaction
+from wallets.monitoring import common
+from tests.fakes import FakeManager
+
+
+class FakeGateway:
+    NAME = 'fake'
+    EXC_CLASS = ConnectionError
+    ALLOWED_STATUTES = ('SUCCESS',)
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.sent = []
+
+    async def send(self, transactions):
+        self.sent.append([trx.id for trx in transactions])
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def outbox_rows(*ids):
+    return [Outbox(id=i, transaction=Transaction(id=i)) for i in ids]
+
+
+class Delivery(common.SendTrxToExternalService):
+    func_name = 'send'
+    status = 5
+    topic = Outbox.TRANSACTIONS
+
+    @classmethod
+    def get_status_from_resp(cls, response):
+        return response
+
+
+class TestDelivery(aiounittest.AsyncTestCase):
+
+    async def test_batches_are_committed_separately(self):
+        Delivery.gw = FakeGateway('SUCCESS', ConnectionError('down'),
+                                  RuntimeError('bug'))
+        Delivery.manager = FakeManager(outbox_rows(1, 2), outbox_rows(3),
+                                       outbox_rows(4))
+
+        with self.assertRaises(RuntimeError):
+            await Delivery.process()
+
+        self.assertEqual(Delivery.gw.sent, [[1, 2], [3], [4]])
+        self.assertEqual([
+            'ACK' if isinstance(query, peewee.Delete) else query
+            for query in Delivery.manager.queries
+            if isinstance(query, (str, peewee.Delete))
+        ], [
+            'BEGIN', 'ACK', 'COMMIT',  # delivered batch stays acked
+            'BEGIN', 'COMMIT',  # gateway error, rows stay in the outbox
+            'BEGIN', 'ROLLBACK',
+        ])
+        self.assertEqual(Delivery.counter, 0)
@@ -0,0 +1,227 @@
+import unittest
+import contextlib
+import aiounittest
+from unittest import mock
+from datetime import datetime
+from decimal import Decimal
+
+import peewee
+
+from wallets.common import Wallet
+from wallets.common import Transaction
+from wallets.common import Outbox
+from wallets.common import TransactionEvent
+from wallets.monitoring import common
+from wallets.monitoring import matching
+from wallets.shared.locks import Lease
+from wallets.bgw_gateway.decoders import TransactionRow
+from tests import BaseTestCase
+from tests.fakes import FakeManager
+
+
+class FakeLockManager:
+
+    def __init__(self, held=(), lost=()):
+        self.held = held
+        self.lost = lost
+        self.locked = []
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, key, manager):
+        self.locked.append(key)
+        if key in self.held:
+            yield None
+            return
+        lease = Lease(key)
+        lease.lost = key in self.lost
+        yield lease
+
+
+class FakeGateway:
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def get_transactions_list(self, wallet_address, external_id):
+        self.calls.append((wallet_address, external_id))
+        return self.rows.get(wallet_address, [])
+
+
+async def notify(manager, channel, payload=None):
+    pass
+
+
+def row(slug, trx_hash, address_to='shared'):
+    return TransactionRow('from', address_to, slug, None, trx_hash)
+
+
+class Monitor(common.CheckTransactionsMonitor):
+    saved = []
+    manager = FakeManager()
+
+    @classmethod
+    async def get_data(cls):
+        return [
+            Wallet(id=1, address='shared', external_id=7,
+                   currency_slug='ethereum'),
+            Wallet(id=2, address='shared', external_id=7,
+                   currency_slug='holo'),
+            Wallet(id=3, address='own', external_id=8,
+                   currency_slug='bitcoin'),
+        ]
+
+    @classmethod
+    async def is_valid(cls, trx, wallet):
+        return cls.is_input_trx(trx.address_to, wallet)
+
+    @classmethod
+    async def save(cls, wallet, trx):
+        cls.saved.append((wallet.id, trx.hash))
+
+
+class TestCheckTransactionsMonitor(aiounittest.AsyncTestCase):
+
+    def setUp(self):
+        Monitor.saved = []
+        Monitor.manager = FakeManager()
+
+    async def run_monitor(self, locks):
+        self.gw = FakeGateway({
+            'shared': [row('ethereum', 'h1'), row('holo', 'h2'),
+                       row('chainlink', 'h3')],
+            'own': [row('bitcoin', 'h4', 'own')],
+        })
+        with mock.patch.object(common, 'b_gw', self.gw), \
+                mock.patch.object(common, 'lock_manager', locks), \
+                mock.patch.object(common, 'notify', notify):
+            await Monitor._execute()
+        counter, Monitor.counter = Monitor.counter, 0
+        return counter
+
+    async def test_wallets_sharing_address_are_fetched_once(self):
+        locks = FakeLockManager()
+        self.assertEqual(await self.run_monitor(locks), 3)
+
+        self.assertEqual(self.gw.calls, [('shared', 7), ('own', 8)])
+        self.assertEqual(locks.locked, [Wallet.lock_name_by_id(1),
+                                        Wallet.lock_name_by_id(3)])
+        # no wallet for chainlink in the group
+        self.assertEqual(Monitor.saved, [(1, 'h1'), (2, 'h2'), (3, 'h4')])
+        # every locked group is committed on its own
+        self.assertEqual(Monitor.manager.transactions(),
+                         ['BEGIN', 'COMMIT', 'BEGIN', 'COMMIT'])
+
+    async def test_held_and_lost_locks(self):
+        locks = FakeLockManager(held=[Wallet.lock_name_by_id(1)],
+                                lost=[Wallet.lock_name_by_id(3)])
+        self.assertEqual(await self.run_monitor(locks), 0)
+
+        self.assertEqual(self.gw.calls, [('own', 8)])
+        self.assertEqual(Monitor.manager.transactions(),
+                         ['BEGIN', 'ROLLBACK'])
+
+
+def expected(trx_id, address_from='sender', slug='bitcoin', value='1',
+             created_at=datetime(2020, 1, 1)):
+    return Transaction(id=trx_id, address_from=address_from,
+                       currency_slug=slug, value=Decimal(value),
+                       created_at=created_at)
+
+
+def incoming(trx_hash, address_from='sender', slug='bitcoin', value='1'):
+    return TransactionRow(address_from, 'exchanger', slug,
+                          None if value is None else Decimal(value),
+                          trx_hash)
+
+
+class TestExpectationIndex(unittest.TestCase):
+
+    def test_amount_match_wins_over_older_expectation(self):
+        index = matching.ExpectationIndex([
+            expected(1, value='2', created_at=datetime(2019, 1, 1)),
+            expected(2, value='1.0000000000'),
+        ])
+        matches = index.match([incoming('h1', value='1')])
+        self.assertEqual([(m.expected.id, m.row.hash) for m in matches],
+                         [(2, 'h1')])
+
+    def test_ties_are_broken_by_created_at_and_id(self):
+        index = matching.ExpectationIndex([
+            expected(3), expected(2),
+            expected(1, created_at=datetime(2021, 1, 1)),
+        ])
+        matches = index.match([incoming('h1'), incoming('h2'),
+                               incoming('h3'), incoming('h4')])
+        self.assertEqual([(m.expected.id, m.row.hash) for m in matches],
+                         [(2, 'h1'), (3, 'h2'), (1, 'h3')])
+
+    def test_left_rows_take_expectations_of_sender(self):
+        index = matching.ExpectationIndex([
+            expected(1, value='5'), expected(2, address_from='Other'),
+            expected(3, value='7'),
+        ])
+        matches = index.match([
+            incoming('h1', value='6'),  # no expectation of this amount
+            incoming('h2', value='7'),
+            incoming('h3', address_from='other', value=None),
+            incoming('h4', slug='ethereum'),
+        ])
+        self.assertEqual([(m.expected.id, m.row.hash) for m in matches],
+                         [(3, 'h2'), (1, 'h1'), (2, 'h3')])
+
+
+class TestUpdateTrx(aiounittest.AsyncTestCase):
+
+    async def test_matches_are_written_with_one_update(self):
+        class Update(common.UpdateTrx):
+            manager = FakeManager(
+                [expected(1), expected(2, value='3')],
+                [Transaction(id=1, status=1), Transaction(id=2, status=1)])
+            counter = 0
+
+        await Update.update(Wallet(id=1), [incoming('h1', value='3'),
+                                           incoming('h2', value=None)])
+
+        _, update, outbox, events = Update.manager.queries
+        sql, params = update.sql()
+        self.assertTrue(sql.startswith('UPDATE "transaction" SET'))
+        self.assertIn('CASE "transaction"."id" WHEN %s THEN %s WHEN', sql)
+        self.assertEqual(params[1:5], [2, 'h1', 1, 'h2'])
+        self.assertIsInstance(outbox, peewee.Insert)
+        self.assertEqual(Update.counter, 2)
+
+
+class TestUpdateTrxQueries(BaseTestCase):
+
+    async def test_update_runs_on_db(self):
+        wallet = await self.manager.create(
+            Wallet, currency_slug='bitcoin', address='exchanger',
+            external_id=1, is_platform=True)
+        first, second, matched = [
+            await self.manager.create(
+                Transaction, address_from='sender', address_to='exchanger',
+                currency_slug='bitcoin', value=value, wallet=wallet,
+                hash=trx_hash)
+            for value, trx_hash in (('1', None), ('3', None), ('1', 'h0'))]
+
+        class Update(common.UpdateTrx):
+            manager = self.manager
+            counter = 0
+
+        await Update.update(wallet, [incoming('h1', value='3'),
+                                     incoming('h2', value=None)])
+
+        rows = {trx.id: trx for trx in await self.manager.get_all(
+            Transaction.select().where(Transaction.wallet == wallet.id))}
+        self.assertEqual((rows[second.id].hash, rows[second.id].value),
+                         ('h1', Decimal('3')))
+        self.assertEqual((rows[first.id].hash, rows[first.id].value),
+                         ('h2', Decimal('1')))
+        self.assertEqual(rows[matched.id].hash, 'h0')
+        self.assertEqual(Update.counter, 2)
+
+        for model in (Outbox, TransactionEvent):
+            queued = await self.manager.get_all(model.select().where(
+                model.transaction.in_([first.id, second.id])))
+            self.assertEqual(len(queued), 2)
@@ -0,0 +1,50 @@
+import unittest
+from datetime import datetime
+from google.protobuf.json_format import MessageToDict
+
+from wallets.rpc import wallets_pb2
+from wallets.rpc import currencies_pb2
+from wallets.rpc import blockchain_gateway_pb2
+from wallets.utils.proto import message_to_dict
+
+
+def to_dict(message):
+    return MessageToDict(message, preserving_proto_field_name=True)
+
+
+class TestMessageToDict(unittest.TestCase):
+
+    def test_transaction_request(self):
+        request = wallets_pb2.TransactionRequest()
+        for i in range(3):
+            request.transaction.add(**{
+                'from': f'from_{i}',
+                'to': f'to_{i}',
+                'hash': f'hash_{i}',
+                'value': '1.5',
+                'wallet_id': i,
+                'currencySlug': 'bitcoin',
+                'status': wallets_pb2.CONFIRMED,
+                'is_fee_trx': bool(i % 2),
+            })
+        self.assertEqual(message_to_dict(request), to_dict(request))
+
+    def test_defaults_are_skipped(self):
+        request = wallets_pb2.MonitoringRequest(
+            wallet=wallets_pb2.Wallet(id=0, address='address'))
+        self.assertEqual(message_to_dict(request),
+                         {'wallet': {'address': 'address'}})
+        self.assertEqual(message_to_dict(wallets_pb2.HealthzRequest()), {})
+
+    def test_nested_header_and_enum(self):
+        response = blockchain_gateway_pb2.GetTransactionsListResponse()
+        response.status.status = blockchain_gateway_pb2.PENDING
+        response.transactions.add(time=1585000000, hash='hash', value='1')
+        self.assertEqual(message_to_dict(response), to_dict(response))
+
+    def test_well_known_types_and_maps(self):
+        currency = currencies_pb2.Currency(slug='bitcoin', rate='1.1')
+        currency.datetime.FromDatetime(datetime(2020, 4, 1, 12, 30))
+        currency.rates['usd'] = '2'
+        response = currencies_pb2.CurrenciesResponse(currencies=[currency])
+        self.assertEqual(message_to_dict(response), to_dict(response))
@@ -2,13 +2,12 @@ import peewee
 import peewee_async
 
 import sys
-import os
-from aiohttp import web_app
+import types
 sys.path.extend(['/', '/app', 'wallets', 'wallets/rpc', '/app/rpc', '..', '../rpc', '/etc/wallets'])  # for docker
 
 from wallets.settings.config import conf
 from wallets.shared.logging import logger
-from wallets.gateway import start_remote_gateways
+from wallets.shared.database import create_database
 
 
 class MyManager(peewee_async.Manager):
@@ -37,17 +36,29 @@ class MyManager(peewee_async.Manager):
     async def exists(self, source_, *args, **kwargs):
         return bool(await self.get_all(source_, *args, **kwargs))
 
+    async def returning(self, query: peewee.Query) -> list:
+        """
+        All rows of INSERT / UPDATE ... RETURNING as model instances,
+        `execute` gives only the first row or row count for them.
+        """
+        sql, params = query.sql()
+        return list(await self.execute(query.model.raw(sql, *params)))
 
-app = web_app.Application()
-app.config = conf
 
+app = types.SimpleNamespace(config=conf)
 
-database: peewee_async.PostgresqlDatabase = peewee_async.PostgresqlDatabase(
-    os.getenv('PGDATABASE', 'wallets'),
-    host=os.getenv('PGHOST', 'localhost'),
-    user=os.getenv('PGUSER', 'postgres'),
-    password=os.getenv('PGPASSWORD')
-)
+# created on first access, see __getattr__
+database: peewee.PostgresqlDatabase
+objects: MyManager
 
-objects = MyManager(database)
-start_remote_gateways()
+
+def __getattr__(name):
+    """Build database and manager lazily, so plain imports stay cheap."""
+    if name not in ('database', 'objects'):
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module_globals = globals()
+    if 'database' not in module_globals:
+        module_globals['database'] = create_database()
+    if name == 'objects':
+        module_globals['objects'] = MyManager(module_globals['database'])
+    return module_globals[name]
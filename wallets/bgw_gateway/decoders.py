@@ -0,0 +1,75 @@
+import typing
+import operator
+from decimal import Decimal
+from marshmallow import ValidationError
+
+_TRANSACTION_VALUES = operator.attrgetter(
+    'from', 'to', 'currencySlug', 'value', 'hash')
+
+_REQUIRED_ERROR = 'Missing data for required field.'
+
+
+class TransactionRow(typing.NamedTuple):
+    """
+    Blockchain gateway transaction normalized the same way as
+    `TransactionSchema` does: lower cased strings and Decimal value.
+    Fields order matches `COLUMNS`, so rows can be inserted as is.
+    """
+    address_from: str
+    address_to: typing.Optional[str]
+    currency_slug: str
+    value: typing.Optional[Decimal]
+    hash: str
+
+    def dict(self) -> typing.Dict[str, typing.Any]:
+        """Same dict as `TransactionSchema().load` returns."""
+        data = dict(zip(self._fields, self))
+        if self.address_to is None:
+            del data['address_to']
+        return data
+
+
+COLUMNS = TransactionRow._fields
+
+
+def _missing(address_from, currency_slug, value, hash_) -> ValidationError:
+    messages = {
+        key: [_REQUIRED_ERROR]
+        for key, present in (('from', address_from),
+                             ('currencySlug', currency_slug),
+                             ('value', value),
+                             ('hash', hash_))
+        if not present
+    }
+    return ValidationError(messages)
+
+
+def decode_transactions(
+        transactions: typing.Iterable,
+) -> typing.List[TransactionRow]:
+    """
+    Decode `blockchain_gateway_pb2.GetTransactionsResponse` messages
+    directly to rows, without intermediate dicts and schema instances.
+    Fields unknown to `TransactionSchema` (status, fee, isOutput, isError)
+    and `time` (which the schema drops) are skipped.
+    """
+    rows = []
+    append = rows.append
+    for trx in transactions:
+        address_from, address_to, currency_slug, value, hash_ = \
+            _TRANSACTION_VALUES(trx)
+        if not (address_from and currency_slug and value and hash_):
+            raise _missing(address_from, currency_slug, value, hash_)
+        append(TransactionRow(
+            address_from.lower(),
+            address_to.lower() if address_to else None,
+            currency_slug.lower(),
+            Decimal(value) if value != 'None' else None,
+            hash_.lower(),
+        ))
+    return rows
+
+
+def decode_transactions_list(response) -> typing.List[TransactionRow]:
+    """Decoder for GetTransactionsList/GetTrxListExchangerWallet response."""
+    return decode_transactions(response.transactions)
@@ -3,12 +3,13 @@ from decimal import Decimal
 from datetime import datetime
 
 from wallets.settings.config import conf
-from wallets.common import TransactionSchema
 from wallets.gateway.base import BaseAsyncGateway
 from wallets.rpc import blockchain_gateway_pb2
 from wallets.rpc import blockchain_gateway_grpc
 
 
+from .decoders import TransactionRow
+from .decoders import decode_transactions_list
 from .exceptions import BlockchainBadResponseException
 from .serializers import (
     WalletBalanceSchema,
@@ -29,6 +30,7 @@ class BlockChainServiceGateWay(BaseAsyncGateway):
     ALLOWED_STATUTES = (blockchain_gateway_pb2.SUCCESS,)
     BAD_RESPONSE_MSG = 'Bad response from blockchain gateway.'
     ServiceStub = blockchain_gateway_grpc.BlockchainGatewayServiceStub
+    HEDGED_METHODS = ('GetBalanceBySlug', 'GetTransactionsList')
 
     async def get_balance_by_slug(self, slug: str) -> Decimal:
         """ Get actual balance by wallet slug """
@@ -61,7 +63,7 @@ class BlockChainServiceGateWay(BaseAsyncGateway):
             self,
             external_id: int = None,
             wallet_address: str = None
-    ) -> typing.List:
+    ) -> typing.List[TransactionRow]:
 
         """Return transactions list for wallet identifiable by id or address.
         """
@@ -73,23 +75,20 @@ class BlockChainServiceGateWay(BaseAsyncGateway):
         message = self.MODULE.GetTransactionsListRequest(
             walletId=external_id, walletAddress=wallet_address)
 
-        response_data = await self._base_request(
+        return await self._base_request(
             message,
             self.CLIENT.GetTransactionsList,
             bad_response_msg=f"Could not get transaction "
-                             f"list with params {message}."
+                             f"list with params {message}.",
+            decode=decode_transactions_list,
         )
-        resp_data = response_data.get('transactions', [])
-        return [
-            TransactionSchema().load(elem) for elem in resp_data
-        ]
 
     async def get_exchanger_wallet_trx_list(
             self,
             slug: str,
             from_time: typing.Optional[datetime] = None,
             to_time: typing.Optional[datetime] = None,
-    ) -> typing.Iterable:
+    ) -> typing.List[TransactionRow]:
 
         from_time = int(datetime.timestamp(from_time)) if from_time else None
         to_time = int(datetime.timestamp(to_time)) if to_time else None
@@ -99,14 +98,10 @@ class BlockChainServiceGateWay(BaseAsyncGateway):
             fromTime=from_time,
             toTime=to_time
         )
-        response_data = await self._base_request(
+        return await self._base_request(
             message,
             self.CLIENT.GetTrxListExchangerWallet,
             bad_response_msg=f"Could not get transaction "
-                             f"list with params {message}."
+                             f"list with params {message}.",
+            decode=decode_transactions_list,
         )
-        resp_data = response_data.get('transactions', [])
-
-        return [
-            TransactionSchema().load(elem) for elem in resp_data
-        ]
@@ -1,6 +1,9 @@
 from .models import Wallet
 from .models import BaseModel
 from .models import Transaction
+from .models import Outbox
+from .models import TransactionEvent
+from .models import LockFence
 
 from .seriallizers import WalletSchema
 from .seriallizers import TransactionSchema
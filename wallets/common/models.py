@@ -69,6 +69,15 @@ class Wallet(BaseModel):
     )
 
 
+# platform wallets may share external_id, the other wallets are unique
+Wallet.add_index(Wallet.index(
+    Wallet.external_id,
+    unique=True,
+    where=(Wallet.is_platform == False),
+    name='wallet_external_id_client',
+))
+
+
 class Transaction(BaseModel):
     """BlockChain transaction"""
 
@@ -150,3 +159,164 @@ class Transaction(BaseModel):
         self.status = TransactionStatus.CONFIRMED.value
         self.confirmed_at = datetime.now()
         self.save()
+
+
+class Outbox(peewee.Model):
+    """
+    Transactions waiting for delivery to external services. Rows are
+    written in the same db transaction as the transaction state change
+    and deleted as soon as the delivery task sent them.
+    """
+
+    TRANSACTIONS = 'transactions'  # SendToTransactionService
+    EXCHANGER = 'exchanger'  # SendToExchangerService
+
+    topic = peewee.CharField(
+        verbose_name='delivery task',
+    )
+
+    transaction = peewee.ForeignKeyField(
+        Transaction,
+        verbose_name='transaction to deliver',
+        on_delete='CASCADE',
+    )
+
+    class Meta:
+        database = database
+        indexes = (
+            (('topic', 'id'), False),
+            (('topic', 'transaction'), True),
+        )
+
+    @classmethod
+    def put(cls, topic: str, *transactions: Transaction) -> peewee.Insert:
+        """Transactions already waiting in the topic are skipped."""
+        return cls.insert_many(
+            [{'topic': topic, 'transaction': trx.id} for trx in transactions]
+        ).on_conflict_ignore()
+
+    @classmethod
+    def put_from(cls, topic: str, query: peewee.Select) -> peewee.Insert:
+        """Put transactions selected by query (by `Transaction.id`)."""
+        return cls.insert_from(
+            query.select(peewee.Value(topic), Transaction.id),
+            fields=[cls.topic, cls.transaction],
+        ).on_conflict_ignore()
+
+    @classmethod
+    def claim(cls, topic: str, after_id: int, limit: int) -> peewee.Select:
+        """
+        Next rows of the topic with their transactions. Rows are locked
+        till the end of the db transaction, other replicas skip them.
+        """
+        claimed = cls.select(cls.id).where(
+            (cls.topic == topic) & (cls.id > after_id)
+        ).order_by(cls.id).limit(limit).for_update('FOR UPDATE SKIP LOCKED')
+
+        return cls.select(cls, Transaction).join(Transaction).where(
+            cls.id.in_(claimed)
+        ).order_by(cls.id)
+
+
+class TransactionEvent(peewee.Model):
+    """
+    Log of transaction status changes for WatchTransactions. `id` is the
+    global sequence clients resume from.
+    """
+
+    id = peewee.BigAutoField()
+
+    transaction = peewee.ForeignKeyField(
+        Transaction,
+        verbose_name='changed transaction',
+        on_delete='CASCADE',
+    )
+
+    status = peewee.IntegerField(
+        verbose_name='transaction status after the change',
+    )
+
+    created_at = peewee.DateTimeField(
+        verbose_name='Datetime of the change',
+        default=datetime.now,
+        index=True,
+    )
+
+    class Meta:
+        database = database
+        table_name = 'transaction_event'
+
+    @classmethod
+    def put(cls, *transactions: Transaction) -> peewee.Insert:
+        now = datetime.now()
+        return cls.insert_many([
+            {'transaction': trx.id, 'status': trx.status, 'created_at': now}
+            for trx in transactions
+        ])
+
+    @classmethod
+    def put_from(cls, query: peewee.Select) -> peewee.Insert:
+        """Log current status of transactions selected by query."""
+        return cls.insert_from(
+            query.select(Transaction.id, Transaction.status,
+                         peewee.fn.now()),
+            fields=[cls.transaction, cls.status, cls.created_at],
+        )
+
+    @classmethod
+    def select_changes(cls) -> peewee.Select:
+        return cls.select(cls, Transaction, Wallet).join(Transaction).join(
+            Wallet, peewee.JOIN.LEFT_OUTER).order_by(cls.id)
+
+    def to_message(self):
+        trx = self.transaction
+        wallet = trx.wallet
+        message = wallets_pb2.TransactionEvent(
+            sequence=self.id,
+            transaction_id=trx.id,
+            status=self.status,
+            is_platform=bool(wallet and wallet.is_platform),
+            uuid=str(trx.uuid) if trx.uuid else '',
+        )
+        message.transaction.CopyFrom(trx.to_message())
+        message.transaction.status = self.status
+        if trx.wallet_id:
+            message.transaction.wallet_id = trx.wallet_id
+        return message
+
+
+class LockFence(peewee.Model):
+    """
+    Fencing token of the last holder of a lock which committed writes
+    under it. Tokens come from TOKENS sequence on every acquisition, a
+    holder whose lease expired can't commit after a newer one did (see
+    `wallets.shared.locks.fenced`).
+    """
+
+    TOKENS = 'lock_fence_token_seq'
+
+    key = peewee.CharField(
+        primary_key=True,
+        verbose_name='lock key',
+    )
+
+    token = peewee.BigIntegerField(
+        verbose_name='fencing token of the last committed holder',
+    )
+
+    class Meta:
+        database = database
+        table_name = 'lock_fence'
+
+    @classmethod
+    def next_token(cls) -> peewee.RawQuery:
+        return cls.raw(f'SELECT nextval(\'"{cls.TOKENS}"\')')
+
+    @classmethod
+    def advance(cls, key: str, token: int) -> peewee.Insert:
+        """Store the token, returns no rows if a newer one is stored."""
+        return cls.insert(key=key, token=token).on_conflict(
+            conflict_target=[cls.key],
+            update={cls.token: peewee.EXCLUDED.token},
+            where=cls.token < peewee.EXCLUDED.token,
+        ).returning(cls.token)
@@ -0,0 +1,239 @@
+"""
+In-memory wallets indexed by id, external_id and (address, currency_slug).
+
+Registry loads all wallets on first use, RPC methods put wallets they
+write after commit and send their ids to WALLET_CHANGES, so registries of
+the other loops and replicas reload them. Without notifications (or after
+a lost one) data is stale until the full reload every
+WALLET_REGISTRY_REFRESH seconds. Lookups which miss fall back to the db.
+Returned wallets are shared, change a copy and `put_on_commit` it.
+"""
+import typing
+import asyncio
+import weakref
+import functools
+
+from wallets import MyManager
+from wallets.settings.config import conf
+from wallets.common.models import Wallet
+from wallets.shared.logging import get_logger
+from wallets.shared.metrics import metrics
+from wallets.utils import on_commit
+from wallets.shared.notify import notify
+from wallets.shared.notify import get_listener
+from wallets.shared.notify import NotificationListener
+from wallets.shared.notify import WALLET_CHANGES
+
+logger = get_logger('registry')
+
+# longer payloads (pg limit is 8000 bytes) ask for a full reload
+MAX_NOTIFY_IDS = 500
+
+
+class WalletRegistry:
+
+    def __init__(
+            self,
+            manager: MyManager,
+            listener: typing.Optional[NotificationListener] = None,
+            refresh_interval: float = conf.get('WALLET_REGISTRY_REFRESH', 300),
+            retry_delay: float = 5,
+    ):
+        self.manager = manager
+        self.listener = listener
+        self.refresh_interval = refresh_interval
+        self.retry_delay = retry_delay
+        self.wallets: typing.Dict[int, Wallet] = {}
+        self.by_external_id: typing.Dict[int, typing.Set[int]] = {}
+        self.by_address: typing.Dict[
+            typing.Tuple[str, str], typing.Set[int]] = {}
+        self.pending: typing.Set[int] = set()
+        self.reload = False
+        self.changed = asyncio.Event()
+        self.touched: typing.Optional[typing.Set[int]] = None  # during load
+        self.task: typing.Optional[asyncio.Task] = None
+        self.ready = asyncio.Event()
+        if listener is not None:
+            listener.add_handler(WALLET_CHANGES, self.invalidate)
+
+    def spawn(self):
+        if self.task is None:
+            if self.listener is not None:
+                self.listener.start()
+            self.task = asyncio.ensure_future(self.run())
+
+    async def start(self):
+        self.spawn()
+        await self.ready.wait()
+
+    async def run(self) -> typing.NoReturn:
+        while not self.ready.is_set():
+            try:
+                await self.load()
+            except Exception as exc:
+                logger.error('wallet registry failed to load: %s', exc)
+                await asyncio.sleep(self.retry_delay)
+                continue
+            self.ready.set()
+
+        while True:
+            # not wait_for, it swallows cancel racing with `changed`
+            waiter = asyncio.ensure_future(self.changed.wait())
+            try:
+                done, _ = await asyncio.wait(
+                    [waiter], timeout=self.refresh_interval)
+            finally:
+                waiter.cancel()
+            if not done:
+                self.reload = True
+            self.changed.clear()
+            reload, self.reload = self.reload, False
+            ids, self.pending = self.pending, set()
+            try:
+                if reload:
+                    await self.load()
+                elif ids:
+                    await self.refresh(ids)
+            except Exception as exc:
+                logger.error('wallet registry refresh failed: %s', exc)
+                self.reload = True
+                await asyncio.sleep(self.retry_delay)
+                self.changed.set()
+
+    async def load(self):
+        """Replace all wallets, keeping ones `put` while loading."""
+        self.touched = set()
+        try:
+            rows = await self.manager.get_all(Wallet.select())
+        except Exception:
+            self.touched = None
+            raise
+        current, touched, self.touched = self.wallets, self.touched, None
+
+        self.wallets = {}
+        self.by_external_id = {}
+        self.by_address = {}
+        for wallet in rows:
+            if wallet.id not in touched:
+                self._index(wallet)
+        for wallet_id in touched:
+            if wallet_id in current:
+                self._index(current[wallet_id])
+        metrics.set('registry.wallets', len(self.wallets))
+
+    async def refresh(self, ids: typing.Iterable[int]):
+        ids = set(ids)
+        rows = await self.manager.get_all(
+            Wallet.select().where(Wallet.id.in_(list(ids))))
+        for wallet in rows:
+            self.put(wallet)
+        for wallet_id in ids - {wallet.id for wallet in rows}:
+            self.discard(wallet_id)
+
+    def invalidate(self, payload: typing.Optional[str]):
+        """WALLET_CHANGES handler, None or empty payload reloads all."""
+        if not payload:
+            self.reload = True
+        else:
+            self.pending.update(int(i) for i in payload.split(','))
+        self.changed.set()
+
+    def _index(self, wallet: Wallet):
+        self.wallets[wallet.id] = wallet
+        self.by_external_id.setdefault(
+            wallet.external_id, set()).add(wallet.id)
+        self.by_address.setdefault(
+            (wallet.address, wallet.currency_slug), set()).add(wallet.id)
+
+    def put(self, wallet: Wallet):
+        self.discard(wallet.id)
+        self._index(wallet)
+
+    def put_on_commit(self, *wallets: Wallet):
+        """Put written wallets once the db transaction commits."""
+        for wallet in wallets:
+            on_commit(functools.partial(self.put, wallet))
+
+    def discard(self, wallet_id: int):
+        if self.touched is not None:
+            self.touched.add(wallet_id)
+        wallet = self.wallets.pop(wallet_id, None)
+        if wallet is None:
+            return
+        for index, key in (
+                (self.by_external_id, wallet.external_id),
+                (self.by_address, (wallet.address, wallet.currency_slug)),
+        ):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(wallet_id)
+                if not ids:
+                    del index[key]
+
+    def find(self, wallet_id: int) -> typing.Optional[Wallet]:
+        return self.wallets.get(wallet_id)
+
+    def find_by_external_id(self, external_id: int) -> typing.Optional[Wallet]:
+        """Client wallet if there is one, platform wallets share ids."""
+        wallets = [self.wallets[i]
+                   for i in sorted(self.by_external_id.get(external_id, ()))]
+        wallets.sort(key=lambda wallet: bool(wallet.is_platform))
+        return wallets[0] if wallets else None
+
+    def find_by_address(
+            self, address: str, slug: str
+    ) -> typing.Optional[Wallet]:
+        ids = self.by_address.get((address, slug))
+        return self.wallets[min(ids)] if ids else None
+
+    async def _get(self, found: typing.Optional[Wallet], **fields) -> Wallet:
+        self.spawn()  # lookups don't wait for the first load
+        if found is not None:
+            metrics.inc('registry.hits')
+            return found
+        metrics.inc('registry.misses')
+        wallet = await self.manager.get(Wallet, **fields)  # DoesNotExist
+        self.put(wallet)
+        return wallet
+
+    async def get(self, wallet_id: int) -> Wallet:
+        return await self._get(self.find(wallet_id), id=wallet_id)
+
+    async def get_by_external_id(self, external_id: int) -> Wallet:
+        return await self._get(self.find_by_external_id(external_id),
+                               external_id=external_id)
+
+    async def get_by_address(self, address: str, slug: str) -> Wallet:
+        return await self._get(self.find_by_address(address, slug),
+                               address=address, currency_slug=slug)
+
+    async def select(self, **fields) -> typing.List[Wallet]:
+        """Wallets with equal field values, ordered by id."""
+        await self.start()
+        return [
+            wallet for _, wallet in sorted(self.wallets.items())
+            if all(getattr(wallet, name) == value
+                   for name, value in fields.items())
+        ]
+
+
+async def notify_changes(manager: MyManager, wallet_ids: typing.Sequence[int]):
+    """Ask registries of all replicas to reload the wallets on commit."""
+    if not wallet_ids:
+        return
+    payload = '' if len(wallet_ids) > MAX_NOTIFY_IDS else \
+        ','.join(str(wallet_id) for wallet_id in wallet_ids)
+    await notify(manager, WALLET_CHANGES, payload)
+
+
+_registries = weakref.WeakKeyDictionary()
+
+
+def get_wallet_registry(manager: MyManager) -> WalletRegistry:
+    """Registry of the manager in the current event loop."""
+    registries = _registries.setdefault(asyncio.get_event_loop(), {})
+    registry = registries.get(manager)
+    if registry is None:
+        registry = WalletRegistry(manager, get_listener())
+        registries[manager] = registry
+    return registry
@@ -41,7 +41,7 @@ class ExchangerServiceGateway(BaseGateway):
         with grpc.insecure_channel(self.GW_ADDRESS) as channel:
             client = self.ServiceStub(channel)
 
-            resp_data = self._base_request(
+            resp_data = await self._async_request(
                 request_message,
                 client.UpdateInputTransaction,
             )
@@ -1,22 +1,36 @@
-currencies_service_gw = None
-blockchain_service_gw = None
-transactions_service_gw = None
-exchanger_service_gw = None
+from wallets.shared.lazy import LazyObject
 
 
-def start_remote_gateways():
-    """Create remote services gateway instances with clients."""
-    from wallets import currencies_gateway, bgw_gateway, \
-        transactions_gateway, exchanger_gateway
+def _currencies_gateway():
+    from wallets import currencies_gateway
+    return currencies_gateway.CurrenciesServiceGateway()
+
+
+def _blockchain_gateway():
+    from wallets import bgw_gateway
+    return bgw_gateway.BlockChainServiceGateWay()
+
 
-    global currencies_service_gw, blockchain_service_gw, \
-        transactions_service_gw, exchanger_service_gw
+def _transactions_gateway():
+    from wallets import transactions_gateway
+    return transactions_gateway.TransactionsServiceGateway()
 
-    currencies_service_gw = currencies_gateway.CurrenciesServiceGateway()
-    blockchain_service_gw = bgw_gateway.BlockChainServiceGateWay()
-    transactions_service_gw = transactions_gateway.TransactionsServiceGateway()
-    exchanger_service_gw = exchanger_gateway.ExchangerServiceGateway()
 
-    return currencies_service_gw, blockchain_service_gw, \
-           transactions_service_gw, exchanger_service_gw
+def _exchanger_gateway():
+    from wallets import exchanger_gateway
+    return exchanger_gateway.ExchangerServiceGateway()
 
+
+# gateways (and their modules) are created on first use
+currencies_service_gw = LazyObject(_currencies_gateway)
+blockchain_service_gw = LazyObject(_blockchain_gateway)
+transactions_service_gw = LazyObject(_transactions_gateway)
+exchanger_service_gw = LazyObject(_exchanger_gateway)
+
+
+def start_remote_gateways():
+    """Create remote services gateway instances with clients."""
+    return tuple(
+        gw._setup() for gw in (currencies_service_gw, blockchain_service_gw,
+                               transactions_service_gw, exchanger_service_gw)
+    )
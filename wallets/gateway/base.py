@@ -1,15 +1,31 @@
 import typing
+import weakref
+import asyncio
 import logging
 from abc import ABC
 from retrying import retry
 from grpclib.client import Channel
-from google.protobuf.json_format import MessageToDict
 from wallets import logger
 from wallets.settings.config import conf
+from wallets.shared.metrics import metrics
+from wallets.utils.proto import message_to_dict
+from wallets.gateway.offload import RawResponse
+from wallets.gateway.offload import OffloadCodec
+from wallets.gateway.offload import decode_payload
+from wallets.gateway.offload import get_executor
+from wallets.gateway.offload import offload_size
+from wallets.gateway.limits import rpc_name
+from wallets.gateway.limits import rate_limiter
+from wallets.gateway.limits import get_concurrency_limiter
+from wallets.gateway.hedging import HedgePolicy
+from wallets.gateway.options import CallOptions
+from wallets.gateway.options import time_left
+from wallets.gateway.options import method_timeout
 
 
 class ResponseHandler:
     response_attr: str
+    TIMEOUT: int
     BAD_RESPONSE_MSG: str
     ALLOWED_STATUTES: typing.Tuple[int]
     NAME: str
@@ -18,10 +34,30 @@ class ResponseHandler:
     EXC_CLASS: typing.Callable
     response_attr: str
 
-    def handle_response(self, response, request_message):
+    def call_options(
+            self,
+            request_method=None,
+            bad_response_msg: str = "",
+            extend_statutes: typing.Optional[tuple] = None,
+            metadata: typing.Optional[typing.Mapping[str, str]] = None,
+    ) -> CallOptions:
+        """Options of one call, class settings are defaults."""
+        return CallOptions(
+            timeout=method_timeout(self.NAME, rpc_name(request_method),
+                                   self.TIMEOUT),
+            allowed_statuses=self.ALLOWED_STATUTES + tuple(
+                extend_statutes or ()),
+            bad_response_msg=bad_response_msg or self.BAD_RESPONSE_MSG,
+            metadata=metadata,
+        )
+
+    def handle_response(self, response, request_message,
+                        decode: typing.Callable = message_to_dict,
+                        options: typing.Optional[CallOptions] = None):
+        options = options or self.call_options()
         resp_header = getattr(response, self.response_attr)
         status = resp_header.status
-        if status in self.ALLOWED_STATUTES:
+        if status in options.allowed_statuses:
             if status != self.MODULE.SUCCESS:
                 self.LOGGER.warning(
                     f"{self.NAME} error",
@@ -31,9 +67,9 @@ class ResponseHandler:
                         'from': self.__class__.__name__,
                     }
                 )
-            return MessageToDict(response, preserving_proto_field_name=True)
+            return decode(response)
         raise self.EXC_CLASS(str(
-            self.BAD_RESPONSE_MSG + f" Got status "
+            options.bad_response_msg + f" Got status "
                                     f"{self.MODULE.ResponseStatus.Name(status)}: "
                                     f"{resp_header.description}.").replace(
             "\n", " "))
@@ -55,23 +91,43 @@ class BaseGateway(ABC, ResponseHandler):
     EXC_CLASS: typing.Callable
     response_attr: str = 'status'
 
+    async def _async_request(self, request_message, request_method,
+                             **kwargs) -> \
+            typing.Optional[typing.Dict[str, typing.Any]]:
+        """
+        `_base_request` for coroutines: rate limit tokens are awaited, so
+        the event loop isn't blocked while waiting for them.
+        """
+        await rate_limiter.acquire(self.NAME, rpc_name(request_method))
+        return self._base_request(request_message, request_method,
+                                  rate_limited=True, **kwargs)
+
     @retry(stop_max_attempt_number=conf['REMOTE_OPERATION_ATTEMPT_NUMBER'])
     def _base_request(self, request_message, request_method,
                       bad_response_msg: str = "",
-                      extend_statutes: typing.Optional = None) -> \
+                      extend_statutes: typing.Optional = None,
+                      options: typing.Optional[CallOptions] = None,
+                      rate_limited: bool = False) -> \
             typing.Optional[typing.Dict[str, typing.Any]]:
         """
         :param request_message: protobuf message request object
         :param request_method: client request method
+        :param options: call options, built from the other params if None
+        :param rate_limited: token is taken already (see `_async_request`),
+        else the calling thread sleeps till its token is due
         """
-        if bad_response_msg:
-            self.BAD_RESPONSE_MSG = bad_response_msg
-
-        if extend_statutes:
-            self.ALLOWED_STATUTES += extend_statutes
+        options = options or self.call_options(
+            request_method, bad_response_msg, extend_statutes)
+        if not rate_limited:
+            rate_limiter.wait(self.NAME, rpc_name(request_method))
         try:
-            response = request_method(request_message, timeout=self.TIMEOUT)
-            return self.handle_response(response, request_message)
+            response = request_method(
+                request_message, timeout=time_left(options.timeout),
+                metadata=tuple(options.metadata.items())
+                if options.metadata else None,
+            )
+            return self.handle_response(response, request_message,
+                                        options=options)
         except Exception as exc:
             self.LOGGER.error(f"{self.NAME} error",
                            {
@@ -87,18 +143,114 @@ class BaseAsyncGateway(ABC, ResponseHandler):
     GW_ADDRESS: str
     GW_PORT: int = 50051
     TIMEOUT: int
-    CLIENT: typing.Optional
     BAD_RESPONSE_MSG: str
     ALLOWED_STATUTES: typing.Tuple[int]
     NAME: str
     MODULE: typing.Any
     ServiceStub: typing.Any
-    LOGGER: logging.Logger
+    LOGGER: logging.Logger = logger
     EXC_CLASS: typing.Callable
     response_attr: str
+    # idempotent methods which may be hedged, see wallets.gateway.hedging
+    HEDGED_METHODS: typing.Tuple[str, ...] = ()
+
+    def __init__(self, pool_size: int = conf.get('GW_CHANNEL_POOL_SIZE', 2)):
+        self._clients = weakref.WeakKeyDictionary()
+        self.pool_size = max(pool_size, 1)
+        self.offload_size = offload_size()
+        self.hedging: typing.Dict[str, HedgePolicy] = {
+            method: HedgePolicy() for method in self.HEDGED_METHODS
+        }
+
+    def _pool(self) -> typing.List[typing.Any]:
+        """
+        Service stubs bound to the current event loop, one per channel.
+        grpclib channels can't be shared between loops, so api and
+        monitoring loops (see server roles) get their own pools.
+        """
+        loop = asyncio.get_event_loop()
+        pool = self._clients.get(loop)
+        if pool is None:
+            codec = OffloadCodec(self.offload_size) \
+                if self.offload_size else None
+            pool = [
+                self.ServiceStub(
+                    Channel(self.GW_ADDRESS, self.GW_PORT, codec=codec))
+                for _ in range(self.pool_size)
+            ]
+            self._clients[loop] = pool
+        return pool
+
+    @property
+    def CLIENT(self):
+        """Service stub of the first channel of the pool."""
+        return self._pool()[0]
 
-    def __init__(self):
-        self.CLIENT = self.ServiceStub(Channel(self.GW_ADDRESS, self.GW_PORT))
+    def _alternate(self, request_method, attempt: int):
+        """Same method on another channel of the pool."""
+        pool = self._pool()
+        channels = [stub for stub in pool
+                    if getattr(stub, rpc_name(request_method)).channel
+                    is not request_method.channel] or pool
+        stub = channels[(attempt - 1) % len(channels)]
+        return getattr(stub, rpc_name(request_method))
+
+    async def _decode_offloaded(
+            self,
+            raw: RawResponse,
+            decode: typing.Callable,
+            options: CallOptions,
+    ) -> typing.Tuple[typing.Any, typing.Callable]:
+        """
+        Parse and decode big response in worker process. Return response
+        with header only and decode function which gives worker result.
+        """
+        loop = asyncio.get_event_loop()
+        started = loop.time()
+        header, result = await loop.run_in_executor(
+            get_executor(), decode_payload, raw, self.response_attr,
+            options.allowed_statuses, decode,
+        )
+        metrics.observe(f'{self.NAME}.offloaded_decode',
+                        loop.time() - started)
+        response = raw.message_type()
+        getattr(response, self.response_attr).CopyFrom(header)
+        return response, lambda _: result
+
+    async def _call(self, request_method, request_message,
+                    options: CallOptions,
+                    hedging: typing.Optional[HedgePolicy] = None):
+        time_left(options.timeout)  # don't queue for calls out of time
+        await rate_limiter.acquire(self.NAME, rpc_name(request_method))
+        async with get_concurrency_limiter(self.NAME).slot(
+                rpc_name(request_method)), \
+                request_method.open(timeout=time_left(options.timeout),
+                                    metadata=options.metadata) as stream:
+            started = asyncio.get_event_loop().time()
+            await stream.send_message(request_message)
+            response = await stream.recv_message()
+        if hedging is not None:
+            hedging.latencies.observe(
+                asyncio.get_event_loop().time() - started)
+        return response
+
+    async def _hedged_call(self, hedging: HedgePolicy, request_method,
+                           request_message, options: CallOptions):
+        name = f'{self.NAME}.{rpc_name(request_method)}'
+
+        def attempt(number: int):
+            method = request_method if number == 0 else \
+                self._alternate(request_method, number)
+            return self._call(method, request_message, options, hedging)
+
+        def on_hedge(allowed: bool):
+            metrics.inc(f'{name}.hedged' if allowed
+                        else f'{name}.hedge_over_budget')
+
+        response, number = await hedging.call(attempt, on_hedge)
+        if number:
+            metrics.inc(f'{name}.hedge_won')
+        return response
 
     @retry(stop_max_attempt_number=conf['REMOTE_OPERATION_ATTEMPT_NUMBER'])
     async def _base_request(
@@ -106,22 +258,29 @@ class BaseAsyncGateway(ABC, ResponseHandler):
             request_message,
             request_method,
             bad_response_msg: str = "",
-            extend_statutes: typing.Optional[tuple] = None
-    ) -> typing.Optional[typing.Dict[str, typing.Any]]:
-
-        if bad_response_msg:
-            self.BAD_RESPONSE_MSG = bad_response_msg
-
-        if extend_statutes:
-            self.ALLOWED_STATUTES += extend_statutes
-
+            extend_statutes: typing.Optional[tuple] = None,
+            decode: typing.Callable = message_to_dict,
+            options: typing.Optional[CallOptions] = None,
+    ) -> typing.Any:
+        """
+        Timeout of the call is the one of GW_METHOD_TIMEOUTS or TIMEOUT,
+        cut to the time the incoming request (if any) has left.
+        """
+        options = options or self.call_options(
+            request_method, bad_response_msg, extend_statutes)
         try:
-
-            async with request_method.open(timeout=self.TIMEOUT) as stream:
-                await stream.send_message(request_message)
-                response = await stream.recv_message()
-                request_method.channel.close()
-            return self.handle_response(response, request_message)
+            hedging = self.hedging.get(rpc_name(request_method))
+            if hedging is None:
+                response = await self._call(
+                    request_method, request_message, options)
+            else:
+                response = await self._hedged_call(
+                    hedging, request_method, request_message, options)
+            if isinstance(response, RawResponse):
+                response, decode = await self._decode_offloaded(
+                    response, decode, options)
+            return self.handle_response(response, request_message, decode,
+                                        options)
 
         except Exception as exc:
             logger.warning(f"{self.NAME} error",
@@ -0,0 +1,289 @@
+"""
+In-process feed of transaction changes for WatchTransactions.
+
+One task per event loop reads new `transaction_event` rows when woken by
+NOTIFY (or every TRANSACTION_FEED_POLL seconds) and fans them out to the
+subscribed streams, so the number of watchers doesn't multiply db load.
+Streams resuming from a cursor read the missed rows from the table first.
+Delivery is at least once, clients skip sequences they have seen. A cursor
+whose event is pruned already (see TRANSACTION_EVENTS_DAYS) can't be
+resumed from, such streams fail with OUT_OF_RANGE and clients resync.
+"""
+import time
+import typing
+import asyncio
+import weakref
+import contextlib
+
+import peewee
+from grpclib.const import Status
+from grpclib.exceptions import GRPCError
+
+from wallets import MyManager
+from wallets.settings.config import conf
+from wallets.common import Wallet
+from wallets.common import Transaction
+from wallets.common import TransactionEvent
+from wallets.rpc import wallets_pb2 as w_pb2
+from wallets.shared.logging import get_logger
+from wallets.shared.metrics import metrics
+from wallets.shared.notify import NotificationListener
+from wallets.shared.notify import TRANSACTION_EVENTS
+from wallets.shared.notify import get_listener
+
+logger = get_logger('feed')
+
+
+class WatchFilter(typing.NamedTuple):
+    wallet_ids: typing.FrozenSet[int]
+    wallet_kind: int
+    statuses: typing.FrozenSet[int]
+
+    @classmethod
+    def from_message(
+            cls, request: w_pb2.WatchTransactionsRequest
+    ) -> 'WatchFilter':
+        return cls(frozenset(request.wallet_ids), request.wallet_kind,
+                   frozenset(request.statuses))
+
+    def matches(self, event: w_pb2.TransactionEvent) -> bool:
+        if self.wallet_ids and \
+                event.transaction.wallet_id not in self.wallet_ids:
+            return False
+        if self.wallet_kind == w_pb2.PLATFORM_WALLETS:
+            if not event.is_platform:
+                return False
+        elif self.wallet_kind == w_pb2.CLIENT_WALLETS:
+            if event.is_platform:
+                return False
+        return not self.statuses or event.status in self.statuses
+
+    def where(self, query: peewee.Select) -> peewee.Select:
+        """Same filter for `TransactionEvent.select_changes` query."""
+        if self.wallet_ids:
+            query = query.where(Transaction.wallet.in_(list(self.wallet_ids)))
+        if self.wallet_kind == w_pb2.PLATFORM_WALLETS:
+            query = query.where(Wallet.is_platform == True)
+        elif self.wallet_kind == w_pb2.CLIENT_WALLETS:
+            query = query.where(Wallet.is_platform != True)
+        if self.statuses:
+            query = query.where(
+                TransactionEvent.status.in_(list(self.statuses)))
+        return query
+
+
+class FeedOverflow(Exception):
+    """Subscriber didn't keep up with the feed, it has to resume."""
+
+
+class Subscription:
+
+    def __init__(self, watch_filter: WatchFilter, start: int, maxsize: int):
+        self.filter = watch_filter
+        self.start = start  # rows after it come from the feed
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflow = False
+
+    def put(self, event: w_pb2.TransactionEvent):
+        if self.overflow or not self.filter.matches(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflow = True  # reader raises on the next get()
+            metrics.inc('feed.overflows')
+
+    async def get(self) -> w_pb2.TransactionEvent:
+        event = await self.queue.get()
+        if self.overflow:
+            raise FeedOverflow('transactions watcher is too slow')
+        return event
+
+
+class ChangeFeed:
+    """
+    :param batch_size: rows read by one query
+    :param gap_timeout: seconds to wait for rows of transactions which
+        took sequence numbers but were not committed yet
+    """
+
+    def __init__(
+            self,
+            manager: MyManager,
+            listener: typing.Optional[NotificationListener] = None,
+            poll_interval: float = conf.get('TRANSACTION_FEED_POLL', 5),
+            batch_size: int = conf.get('TRANSACTION_FEED_BATCH_SIZE', 500),
+            queue_size: int = conf.get('TRANSACTION_FEED_QUEUE_SIZE', 1000),
+            gap_timeout: float = 10,
+            max_gap: int = 1000,
+    ):
+        self.manager = manager
+        self.listener = listener
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.gap_timeout = gap_timeout
+        self.max_gap = max_gap
+        self.last_seen: typing.Optional[int] = None
+        self.gaps: typing.Dict[int, float] = {}
+        self.subscriptions: typing.Set[Subscription] = set()
+        self.task: typing.Optional[asyncio.Task] = None
+        self.ready = asyncio.Event()
+
+    async def start(self):
+        if self.task is None:
+            if self.listener is not None:
+                self.listener.start()
+            self.task = asyncio.ensure_future(self.run())
+        await self.ready.wait()
+
+    async def tail(self) -> int:
+        rows = await self.manager.get_all(
+            TransactionEvent.select(TransactionEvent.id).order_by(
+                TransactionEvent.id.desc()).limit(1))
+        return rows[0].id if rows else 0
+
+    async def oldest(self) -> typing.Optional[int]:
+        rows = await self.manager.get_all(
+            TransactionEvent.select(TransactionEvent.id).order_by(
+                TransactionEvent.id).limit(1))
+        return rows[0].id if rows else None
+
+    async def run(self) -> typing.NoReturn:
+        while self.last_seen is None:
+            try:
+                self.last_seen = await self.tail()
+            except Exception as exc:
+                logger.error('transactions feed failed to start: %s', exc)
+                await asyncio.sleep(self.poll_interval)
+        self.ready.set()
+
+        while True:
+            if self.listener is None:
+                await asyncio.sleep(self.poll_interval)
+            else:
+                await self.listener.wait(TRANSACTION_EVENTS,
+                                         self.poll_interval)
+            if not self.subscriptions:
+                continue
+            try:
+                while await self.poll() == self.batch_size:
+                    pass
+            except Exception as exc:
+                logger.error('transactions feed failed: %s', exc)
+
+    async def poll(self) -> int:
+        condition = TransactionEvent.id > self.last_seen
+        if self.gaps:
+            condition |= TransactionEvent.id.in_(list(self.gaps))
+        rows = await self.manager.get_all(
+            TransactionEvent.select_changes().where(condition).limit(
+                self.batch_size))
+
+        now = time.monotonic()
+        for row in rows:
+            if row.id > self.last_seen:
+                if row.id - self.last_seen <= self.max_gap:
+                    for missing in range(self.last_seen + 1, row.id):
+                        self.gaps[missing] = now
+                self.last_seen = row.id
+            else:
+                self.gaps.pop(row.id, None)
+            self.publish(row.to_message())
+
+        for missing, since in list(self.gaps.items()):
+            if now - since > self.gap_timeout:  # rolled back
+                del self.gaps[missing]
+        return len(rows)
+
+    def publish(self, event: w_pb2.TransactionEvent):
+        metrics.inc('feed.events')
+        for subscription in self.subscriptions:
+            subscription.put(event)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(
+            self, watch_filter: WatchFilter
+    ) -> typing.AsyncIterator[Subscription]:
+        await self.start()
+        if not self.subscriptions:  # feed doesn't read rows without them
+            self.last_seen = max(self.last_seen, await self.tail())
+            self.gaps.clear()
+        subscription = Subscription(
+            watch_filter, self.last_seen, self.queue_size)
+        self.subscriptions.add(subscription)
+        metrics.set('feed.subscriptions', len(self.subscriptions))
+        try:
+            yield subscription
+        finally:
+            self.subscriptions.discard(subscription)
+            metrics.set('feed.subscriptions', len(self.subscriptions))
+
+    async def backlog(
+            self,
+            watch_filter: WatchFilter,
+            cursor: int,
+            until: int,
+    ) -> typing.AsyncIterator[w_pb2.TransactionEvent]:
+        """
+        Events in (cursor, until] from the table. The event of the cursor
+        has to be there still, else events after it may be pruned too.
+        """
+        oldest = await self.oldest()
+        if oldest is None or oldest > cursor:
+            metrics.inc('feed.pruned_cursors')
+            raise GRPCError(
+                Status.OUT_OF_RANGE,
+                f'Events after cursor {cursor} are pruned, resync the '
+                f'transactions and watch without cursor.')
+        while cursor < until:
+            rows = await self.manager.get_all(watch_filter.where(
+                TransactionEvent.select_changes().where(
+                    (TransactionEvent.id > cursor) &
+                    (TransactionEvent.id <= until)
+                ).limit(self.batch_size)))
+            if not rows:
+                return
+            for row in rows:
+                yield row.to_message()
+            cursor = rows[-1].id
+
+
+_feeds = weakref.WeakKeyDictionary()
+
+
+def get_change_feed(manager: MyManager) -> ChangeFeed:
+    """Feed of the current event loop."""
+    loop = asyncio.get_event_loop()
+    feed = _feeds.get(loop)
+    if feed is None:
+        listener = get_listener()
+        if listener is not None:
+            listener.add_channel(TRANSACTION_EVENTS)
+        feed = ChangeFeed(manager, listener)
+        _feeds[loop] = feed
+    return feed
+
+
+async def watch_transactions(
+        request: w_pb2.WatchTransactionsRequest,
+        send: typing.Callable[[w_pb2.TransactionEvent], typing.Awaitable],
+        manager: MyManager,
+) -> typing.NoReturn:
+    """
+    Send events after `request.cursor` (only new ones without it) until the
+    client disconnects.
+    """
+    watch_filter = WatchFilter.from_message(request)
+    feed = get_change_feed(manager)
+    async with feed.subscribe(watch_filter) as subscription:
+        if request.cursor:
+            async for event in feed.backlog(
+                    watch_filter, request.cursor, subscription.start):
+                await send(event)
+        while True:
+            try:
+                event = await subscription.get()
+            except FeedOverflow as exc:
+                raise GRPCError(Status.RESOURCE_EXHAUSTED, str(exc))
+            await send(event)
@@ -0,0 +1,105 @@
+"""
+Hedged calls of idempotent gateway methods (HEDGED_METHODS of gateway).
+
+If the first attempt hasn't answered in the GW_HEDGE_PERCENTILE of recent
+latencies of the method, the same request goes out once more on another
+channel of the pool, the first reply wins and the other attempt is
+cancelled. Every call earns GW_HEDGE_BUDGET of a hedge, so hedges add at
+most that share of calls, however slow the upstream gets. Methods are not
+hedged until `min_samples` latencies are known.
+"""
+import typing
+import asyncio
+import threading
+from collections import deque
+
+from wallets.settings.config import conf
+
+_T = typing.TypeVar('_T')
+
+
+class LatencyWindow:
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.samples: typing.Deque[float] = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def observe(self, latency: float):
+        self.samples.append(latency)
+
+    def percentile(self, percent: float) -> typing.Optional[float]:
+        if len(self.samples) < self.min_samples:
+            return None
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1,
+                           int(len(samples) * percent / 100))]
+
+
+class HedgeBudget:
+
+    def __init__(self, ratio: float, max_tokens: float = 10):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = 0.0
+        self._lock = threading.Lock()
+
+    def earn(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def spend(self) -> bool:
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class HedgePolicy:
+
+    def __init__(
+            self,
+            percentile: float = conf.get('GW_HEDGE_PERCENTILE', 95),
+            budget: float = conf.get('GW_HEDGE_BUDGET', 0.05),
+    ):
+        self.percentile = percentile
+        self.latencies = LatencyWindow()
+        self.budget = HedgeBudget(budget)
+
+    def delay(self) -> typing.Optional[float]:
+        """Seconds to wait for the first attempt, None to not hedge."""
+        self.budget.earn()
+        return self.latencies.percentile(self.percentile)
+
+    async def call(
+            self,
+            attempt: typing.Callable[[int], typing.Awaitable[_T]],
+            on_hedge: typing.Callable[[bool], None] = lambda allowed: None,
+    ) -> typing.Tuple[_T, int]:
+        """
+        Run `attempt(0)` and, if it's late, `attempt(1)`. Return the first
+        result and number of the attempt which gave it. Errors of the first
+        attempt before the hedge are raised, after it the other attempt is
+        waited for; if both fail, the later error is raised.
+        """
+        delay = self.delay()
+        attempts = [asyncio.ensure_future(attempt(0))]
+        try:
+            if delay is not None:
+                await asyncio.wait(attempts, timeout=delay)
+                if not attempts[0].done():
+                    allowed = self.budget.spend()
+                    on_hedge(allowed)
+                    if allowed:
+                        attempts.append(asyncio.ensure_future(attempt(1)))
+            pending = set(attempts)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: bool(t.exception())):
+                    if not task.exception() or not pending:
+                        return task.result(), attempts.index(task)
+        finally:
+            for task in attempts:
+                task.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
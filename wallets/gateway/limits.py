@@ -0,0 +1,242 @@
+"""
+Rate and concurrency limits of calls to remote gateways.
+
+GW_RATE_LIMITS maps gateway NAME or NAME.Method to [rate, burst]: calls
+per second and how many calls can go at once after idle time. A call
+takes a token from the bucket of its method and from the bucket of its
+gateway, if they are configured, calls without buckets are not limited.
+
+Tokens are reserved: a caller is told when its token is due and sleeps
+till then, so callers go in the order they came (no stampede after a
+refill) and none of them fails because of the limit. Buckets are shared
+by all loops and threads of the process, as upstream quotas are per
+replica.
+
+Calls in flight are limited by `AdaptiveLimiter` of the gateway, which
+finds the limit by AIMD from latency and transport errors of the calls,
+see GW_CONCURRENCY.
+"""
+import time
+import typing
+import asyncio
+import weakref
+import threading
+import contextlib
+from collections import deque
+
+from wallets.settings.config import conf
+from wallets.shared.metrics import metrics
+from wallets.gateway.options import deadline_exceeded
+
+
+def rpc_name(request_method: typing.Any) -> str:
+    """'/package.Service/Method' of grpclib or grpc stub method -> Method"""
+    path = getattr(request_method, 'name', None) or \
+        getattr(request_method, '_method', '')
+    if isinstance(path, bytes):
+        path = path.decode()
+    return str(path).rsplit('/', 1)[-1]
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, burst: float = 1,
+                 clock: typing.Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.clock = clock
+        self.tokens = self.burst  # negative for tokens promised to waiters
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, return seconds till it's due."""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def cancel(self):
+        """Give back the token of a caller which stopped waiting."""
+        with self._lock:
+            self.tokens += 1
+
+
+class RateLimiter:
+
+    def __init__(self, limits: typing.Optional[typing.Dict] = None):
+        if limits is None:
+            limits = conf.get('GW_RATE_LIMITS') or {}
+        self.limits = limits
+        self.buckets: typing.Dict[str, typing.Optional[TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key: str) -> typing.Optional[TokenBucket]:
+        try:
+            return self.buckets[key]
+        except KeyError:
+            pass
+        limit = self.limits.get(key)
+        bucket = TokenBucket(*limit) if limit else None
+        with self._lock:
+            return self.buckets.setdefault(key, bucket)
+
+    def reserve(
+            self, gateway: str, method: str
+    ) -> typing.Tuple[float, typing.List[TokenBucket]]:
+        buckets = [
+            bucket for bucket in (self.bucket(f'{gateway}.{method}'),
+                                  self.bucket(gateway))
+            if bucket is not None
+        ]
+        delay = max([bucket.reserve() for bucket in buckets], default=0.0)
+        if buckets:
+            metrics.observe(f'{gateway}.{method}.rate_limit_wait', delay)
+        return delay, buckets
+
+    async def acquire(self, gateway: str, method: str):
+        delay, buckets = self.reserve(gateway, method)
+        if delay <= 0:
+            return
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            for bucket in buckets:
+                bucket.cancel()
+            raise
+
+    def wait(self, gateway: str, method: str):
+        """Blocking `acquire` for sync gateways."""
+        delay, _ = self.reserve(gateway, method)
+        if delay > 0:
+            time.sleep(delay)
+
+
+rate_limiter = RateLimiter()
+
+# baseline moves this part of the way to each slower latency, so it
+# follows the upstream if it gets slower for good
+BASELINE_DRIFT = 0.01
+
+
+class AdaptiveLimiter:
+    """
+    Limit of calls in flight. It grows by one per `limit` calls which
+    went fine and is cut by `backoff` on a transport error or when a call
+    took `tolerance` times longer than the baseline of its method (lowest
+    recent latency, methods of a gateway differ a lot). Calls started
+    before the last cut don't cut it again, they saw the old load. Calls
+    which ran out of the time of their caller (see `options.deadline`)
+    tell nothing of the upstream and are not counted. Callers over the
+    limit wait in FIFO order.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            initial: float = 20,
+            min_limit: float = 1,
+            max_limit: float = 200,
+            tolerance: float = conf.get('GW_CONCURRENCY_TOLERANCE', 2),
+            backoff: float = 0.5,
+            clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.clock = clock
+        self.in_flight = 0
+        self.waiters: typing.Deque[asyncio.Future] = deque()
+        self.baselines: typing.Dict[str, float] = {}
+        self.decreased = float('-inf')
+        metrics.set(f'{name}.concurrency_limit', self.limit)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, method: str = ''):
+        await self.acquire()
+        started = self.clock()
+        error = None  # no sample for cancelled calls
+        try:
+            yield
+            error = False
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if not deadline_exceeded():
+                error = True
+            raise
+        finally:
+            self.release()
+            if error is not None:
+                self.update(method, self.clock() - started, started, error)
+
+    async def acquire(self):
+        if not self.waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_event_loop().create_future()
+        self.waiters.append(waiter)
+        started = self.clock()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if not waiter.cancelled():  # woken meanwhile, pass the slot on
+                self.release()
+            elif waiter in self.waiters:
+                self.waiters.remove(waiter)
+            raise
+        metrics.observe(f'{self.name}.concurrency_wait',
+                        self.clock() - started)
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self.waiters and self.in_flight < int(self.limit):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def update(self, method: str, latency: float, started: float,
+               error: bool):
+        baseline = self.baselines.get(method)
+        if baseline is None or latency < baseline:
+            baseline = latency
+        else:
+            baseline += (latency - baseline) * BASELINE_DRIFT
+        self.baselines[method] = baseline
+        if error or latency > baseline * self.tolerance:
+            if started < self.decreased:
+                return
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            self.decreased = self.clock()
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._wake()
+        metrics.set(f'{self.name}.concurrency_limit', self.limit)
+
+
+_concurrency_limiters = weakref.WeakKeyDictionary()
+
+
+def get_concurrency_limiter(name: str) -> AdaptiveLimiter:
+    """
+    Limiter of the gateway in the current event loop, GW_CONCURRENCY maps
+    gateway NAME (or default) to [initial, min, max] limit.
+    """
+    limiters = _concurrency_limiters.setdefault(asyncio.get_event_loop(), {})
+    limiter = limiters.get(name)
+    if limiter is None:
+        settings = conf.get('GW_CONCURRENCY') or {}
+        limiter = AdaptiveLimiter(
+            name, *(settings.get(name) or settings.get('default') or ()))
+        limiters[name] = limiter
+    return limiter
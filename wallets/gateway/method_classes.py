@@ -3,24 +3,35 @@ import typing
 import pytz
 import traceback
 from abc import ABC
+from collections import Counter
 from datetime import datetime, timedelta
 from decimal import Decimal
-from flask import render_template
+from peewee import chunked
 
 from wallets import app
-from wallets import logger
+from wallets.shared.logging import get_logger
 from wallets import objects
 from wallets import MyManager
 from wallets import request_objects
 from wallets.utils.consts import TransactionStatus
-from wallets.utils import send_message
-from wallets.utils import nested_commit_on_success
+from wallets.shared.alerts import Alert, get_alert_dispatcher
+from wallets.shared.notify import notify
+from wallets.shared.notify import NEW_TRANSACTIONS
+from wallets.shared.notify import CONFIRMED_TRANSACTIONS
+from wallets.shared.notify import TRANSACTION_EVENTS
+from wallets.utils import atomic
 from wallets.utils import get_exchanger_wallet
 from wallets.common import Wallet
 from wallets.common import Transaction
+from wallets.common import Outbox
+from wallets.common import TransactionEvent
+from wallets.common.registry import get_wallet_registry
+from wallets.common.registry import notify_changes
 from wallets.gateway import blockchain_service_gw
 from wallets.rpc import wallets_pb2 as w_pb2
 
+logger = get_logger('server')
+
 
 class ServerMethod(ABC):
     """Base class for abstracting server-side logic.
@@ -40,19 +51,19 @@ class ServerMethod(ABC):
     manager: MyManager = objects
 
     @classmethod
-    @nested_commit_on_success
     async def process(cls, request):
         """
         The main method, which is called to process the request by the server.
         Must return an object of the message class that is defined individually
         for each method using
         response_msg_cls attribute.
+        `_execute` runs in db transaction, which is rolled back if it fails.
         """
         response = cls._get_response_msg()
         request_obj = None
         try:
-            logger.debug(
-                f"{cls.__name__}.process got request message {request}.")
+            logger.debug("%s.process got request message %s.",
+                         cls.__name__, request)
             request_obj = cls.request_obj_cls.from_message(request)
             if not request_obj:
                 logger.error(
@@ -62,7 +73,8 @@ class ServerMethod(ABC):
                 response.header.status = w_pb2.INVALID_REQUEST
                 response.header.description = request_obj.error
             else:
-                response = await cls._execute(request_obj, response)
+                async with atomic(cls.manager):
+                    response = await cls._execute(request_obj, response)
         except Exception as exc:
             output = io.StringIO()
             traceback.print_tb(exc.__traceback__, None, output)
@@ -104,14 +116,24 @@ class SaveWallet:
                 request_objects.PlatformWLTMonitoringRequestObject
             ],
     ):
-        data = request.dict()
-        if await cls.manager.exists(Wallet, external_id=data['external_id']):
+        await cls._save_wallet(request.dict())
+
+    @classmethod
+    async def _save_wallet(cls, data: dict):
+        registry = get_wallet_registry(cls.manager)
+        try:
+            await registry.get_by_external_id(data['external_id'])
+        except Wallet.DoesNotExist:
+            pass
+        else:
             raise ValueError(f'Wallet with params: '
                              f'currency:{data["currency_slug"]} '
                              f'id:{data["external_id"]} '
                              f'address: {data["address"]} '
                              f'is already exists')
-        await cls.manager.create(Wallet, **data)
+        wallet = await cls.manager.create(Wallet, **data)
+        registry.put_on_commit(wallet)
+        await notify_changes(cls.manager, [wallet.id])
 
 
 class HeathzMethod(ServerMethod):
@@ -146,14 +168,14 @@ class CheckBalanceMethod(ServerMethod):
                 body=request_obj.body_amount,
                 balance=balance,
             )
-            html = cls.get_html(ctx)
-            try:
-                await send_message(html, 'Warning')
-                desc = 'success with send email'
-            except Exception as exc:
-                logger.error(f"{cls.__name__} failed. "
-                             f"Error: {exc.__class__.__name__}: {exc}.",
-                             'cant send email')
+            key = (request_obj.body_currency, request_obj.body_amount)
+            alerts = get_alert_dispatcher()
+            if alerts.is_suppressed(key):
+                desc = 'email was already sent'
+            elif alerts.submit(
+                    Alert(key, 'Warning', app.config['ALARM_TEMPLATE'], ctx)):
+                desc = 'email is queued'
+            else:
                 desc = 'cant send email'
             response_msg.header.description = desc
 
@@ -164,10 +186,6 @@ class CheckBalanceMethod(ServerMethod):
     async def get_balance(cls, slug):
         return await blockchain_service_gw.get_balance_by_slug(slug)
 
-    @classmethod
-    def get_html(cls, context):
-        return render_template(app.config['ALARM_TEMPLATE'], **context)
-
 
 class StartMonitoringMethod(ServerMethod,
                             SaveWallet):
@@ -195,11 +213,18 @@ class StopMonitoringMethod(ServerMethod):
             request_obj: request_objects.MonitoringRequestObject,
             response_msg: w_pb2.MonitoringResponse,
     ) -> w_pb2.MonitoringResponse:
+        registry = get_wallet_registry(cls.manager)
         try:
-            wallet = await cls.manager.get(
-                Wallet, external_id=request_obj.wallet.id)
-            wallet.on_monitoring = False
-            await cls.manager.update(wallet)
+            cached = await registry.get_by_external_id(request_obj.wallet.id)
+            # cached copy may be stale, write only the changed columns
+            rows = await cls.manager.returning(Wallet.update(
+                on_monitoring=False,
+                updated_at=datetime.now(),
+            ).where(Wallet.id == cached.id).returning(Wallet))
+            if not rows:  # deleted meanwhile
+                raise Wallet.DoesNotExist
+            registry.put_on_commit(*rows)
+            await notify_changes(cls.manager, [row.id for row in rows])
         except Wallet.DoesNotExist:
             text = f'Wallet with external_id ' \
                    f'{request_obj.wallet.id} does not exists in db'
@@ -208,6 +233,99 @@ class StopMonitoringMethod(ServerMethod):
         return response_msg
 
 
+class StartMonitoringBatchMethod(ServerMethod,
+                                 SaveWallet):
+    """
+    Wallets are inserted by multi-row statements which skip external_id
+    of any existing wallet, as StartMonitoring does. Platform wallets can
+    share external_id, so they are saved one by one like in StartMonitoring.
+    """
+    request_obj_cls = request_objects.MonitoringBatchRequestObject
+    response_msg_cls = w_pb2.MonitoringBatchResponse
+    chunk_size: int = app.config.get('WALLETS_BATCH_CHUNK', 1000)
+
+    @classmethod
+    async def _execute(
+            cls,
+            request_obj: request_objects.MonitoringBatchRequestObject,
+            response_msg: w_pb2.MonitoringBatchResponse,
+    ) -> w_pb2.MonitoringBatchResponse:
+        registry = get_wallet_registry(cls.manager)
+        wallets = [wallet.wallet_data() for wallet in request_obj.wallets]
+        inserted = Counter()
+        for chunk in chunked([data for data in wallets
+                              if not data['is_platform']], cls.chunk_size):
+            # unique index covers client wallets only, not platform ones
+            existing = {row.external_id for row in await cls.manager.get_all(
+                Wallet.select(Wallet.external_id).where(
+                    Wallet.external_id.in_(
+                        [data['external_id'] for data in chunk])))}
+            chunk = [data for data in chunk
+                     if data['external_id'] not in existing]
+            if not chunk:
+                continue
+            rows = await cls.manager.returning(
+                Wallet.insert_many(chunk).on_conflict_ignore().returning(
+                    Wallet))
+            registry.put_on_commit(*rows)
+            inserted.update(row.external_id for row in rows)
+            await notify_changes(cls.manager, [row.id for row in rows])
+
+        for data in wallets:
+            external_id = data['external_id']
+            result = response_msg.results.add(id=external_id or 0)
+            result.status = w_pb2.SUCCESS
+            if data['is_platform']:
+                try:
+                    await cls._save_wallet(data)
+                except ValueError as exc:
+                    result.status = w_pb2.ERROR
+                    result.description = str(exc)
+            elif inserted[external_id] > 0:
+                inserted[external_id] -= 1
+            else:
+                result.status = w_pb2.ERROR
+                result.description = f'Wallet with id {external_id} ' \
+                                     f'is already exists'
+
+        response_msg.header.status = w_pb2.SUCCESS
+        return response_msg
+
+
+class StopMonitoringBatchMethod(ServerMethod):
+    request_obj_cls = request_objects.MonitoringBatchRequestObject
+    response_msg_cls = w_pb2.MonitoringBatchResponse
+    chunk_size: int = app.config.get('WALLETS_BATCH_CHUNK', 1000)
+
+    @classmethod
+    async def _execute(
+            cls,
+            request_obj: request_objects.MonitoringBatchRequestObject,
+            response_msg: w_pb2.MonitoringBatchResponse,
+    ) -> w_pb2.MonitoringBatchResponse:
+        registry = get_wallet_registry(cls.manager)
+        external_ids = [wallet.id for wallet in request_obj.wallets]
+        stopped = set()
+        for chunk in chunked(external_ids, cls.chunk_size):
+            rows = await cls.manager.returning(Wallet.update(
+                on_monitoring=False,
+                updated_at=datetime.now(),
+            ).where(Wallet.external_id.in_(chunk)).returning(Wallet))
+            registry.put_on_commit(*rows)
+            stopped.update(row.external_id for row in rows)
+            await notify_changes(cls.manager, [row.id for row in rows])
+
+        for external_id in external_ids:
+            result = response_msg.results.add(id=external_id or 0)
+            result.status = w_pb2.SUCCESS
+            if external_id not in stopped:
+                result.description = f'Wallet with external_id ' \
+                                     f'{external_id} does not exists in db'
+
+        response_msg.header.status = w_pb2.SUCCESS
+        return response_msg
+
+
 class UpdateTrxMethod(ServerMethod):
     request_obj_cls = request_objects.TransactionRequestObject
     response_msg_cls = w_pb2.TransactionResponse
@@ -218,7 +336,7 @@ class UpdateTrxMethod(ServerMethod):
             request_obj: request_objects.TransactionRequestObject,
             response_msg: w_pb2.TransactionResponse,
     ) -> w_pb2.TransactionResponse:
-        counter = 0
+        confirmed = []
         for trx in request_obj.transactions:
             try:
                 query = Transaction.select().where(
@@ -227,16 +345,32 @@ class UpdateTrxMethod(ServerMethod):
                 )
 
                 trx = await cls.manager.get(query)
+                if trx.status == TransactionStatus.CONFIRMED.value:
+                    continue  # already waiting for delivery
                 trx.status = TransactionStatus.CONFIRMED.value
                 trx.confirmed_at = datetime.now()
                 trx.value = Decimal(trx.value)
                 await cls.manager.update(trx)
-                counter += 1
+                confirmed.append(trx.id)
             except Transaction.DoesNotExist:
                 pass
 
+        if confirmed:
+            await cls.manager.execute(Outbox.put_from(
+                Outbox.EXCHANGER,
+                Transaction.select().join(Wallet).where(
+                    Transaction.id.in_(confirmed) &
+                    (Transaction.uuid != None) &
+                    (Wallet.is_platform == True)
+                ),
+            ))
+            await cls.manager.execute(TransactionEvent.put_from(
+                Transaction.select().where(Transaction.id.in_(confirmed))))
+            await notify(cls.manager, CONFIRMED_TRANSACTIONS)
+            await notify(cls.manager, TRANSACTION_EVENTS)
         response_msg.header.status = w_pb2.SUCCESS
-        response_msg.header.description = f'Confirmed {counter} Transactions'
+        response_msg.header.description = \
+            f'Confirmed {len(confirmed)} Transactions'
         return response_msg
 
 
@@ -311,6 +445,11 @@ class StartMonitoringPlatformWLTMethod(ServerMethod):
 
 
 class AddInputTransactionMethod(ServerMethod):
+    """
+    Transaction to the exchanger wallet is added by one
+    INSERT ... ON CONFLICT DO NOTHING RETURNING, the wallet is taken from
+    the registry.
+    """
     request_obj_cls = request_objects.AddInputTrxRequestObject
     response_msg_cls = w_pb2.InputTransactionResponse
 
@@ -318,35 +457,87 @@ class AddInputTransactionMethod(ServerMethod):
     async def _execute(
             cls,
             request_obj: request_objects.AddInputTrxRequestObject,
-            response_msg: w_pb2.PlatformWLTMonitoringResponse,
-    ) -> w_pb2.PlatformWLTMonitoringResponse:
+            response_msg: w_pb2.InputTransactionResponse,
+    ) -> w_pb2.InputTransactionResponse:
         wallet = await get_exchanger_wallet(
             request_obj.wallet_address, request_obj.currency)
 
-        await cls.find_in_base(request_obj)
+        rows = await cls.manager.returning(
+            Transaction.insert(
+                **request_obj.transaction_data(wallet)
+            ).on_conflict_ignore().returning(Transaction))
+        if not rows:
+            raise ValueError(
+                f'Get Transaction error: transaction '
+                f'with hash {request_obj.hash} is already in base'
+            )
 
-        trx = await cls.manager.create(Transaction, **dict(
-            address_to=wallet.address,
-            currency_slug=request_obj.currency,
-            address_from=request_obj.from_address,
-            value=request_obj.value,
-            wallet_id=wallet.id,
-            uuid=request_obj.uuid,
-            hash=request_obj.hash
-        ))
+        await cls._added(rows)
         response_msg.header.status = w_pb2.SUCCESS
         response_msg.header.description = f'added Input transaction ' \
-                                          f'hash: {trx.hash}'
+                                          f'hash: {rows[0].hash}'
         return response_msg
 
     @classmethod
-    async def find_in_base(
+    async def _added(cls, transactions: typing.List[Transaction]):
+        """Queue new transactions for delivery and the change feed."""
+        await cls.manager.execute(
+            Outbox.put(Outbox.TRANSACTIONS, *transactions))
+        await cls.manager.execute(TransactionEvent.put(*transactions))
+        await notify(cls.manager, NEW_TRANSACTIONS)
+        await notify(cls.manager, TRANSACTION_EVENTS)
+
+
+class AddInputTransactionsMethod(AddInputTransactionMethod):
+    """
+    AddInputTransaction for many transactions, one multi-row INSERT per
+    chunk of INPUT_TRX_BATCH_CHUNK rows. Transactions already in base and
+    ones of unknown wallets get ERROR results, the rest is added.
+    """
+    request_obj_cls = request_objects.AddInputTrxBatchRequestObject
+    response_msg_cls = w_pb2.InputTransactionsBatchResponse
+    chunk_size: int = app.config.get('INPUT_TRX_BATCH_CHUNK', 1000)
+
+    @classmethod
+    async def _execute(
             cls,
-            request_obj: request_objects.AddInputTrxRequestObject,
-    ) -> typing.NoReturn:
+            request_obj: request_objects.AddInputTrxBatchRequestObject,
+            response_msg: w_pb2.InputTransactionsBatchResponse,
+    ) -> w_pb2.InputTransactionsBatchResponse:
+        keyed = [(trx, (trx.wallet_address, trx.currency))
+                 for trx in request_obj.transactions]
+        wallets = {}
+        for _, key in keyed:
+            if key not in wallets:
+                try:
+                    wallets[key] = await get_exchanger_wallet(*key)
+                except Wallet.DoesNotExist:
+                    wallets[key] = None
+
+        data = [trx.transaction_data(wallets[key]) for trx, key in keyed
+                if wallets[key] is not None]
+        inserted = Counter()
+        for chunk in chunked(data, cls.chunk_size):
+            rows = await cls.manager.returning(
+                Transaction.insert_many(chunk).on_conflict_ignore().returning(
+                    Transaction))
+            if rows:
+                await cls._added(rows)
+            inserted.update(row.hash for row in rows)
+
+        for trx, key in keyed:
+            result = response_msg.results.add(hash=trx.hash)
+            result.status = w_pb2.SUCCESS
+            if wallets[key] is None:
+                result.status = w_pb2.ERROR
+                result.description = f'Wallet with address {key[0]} ' \
+                                     f'and currency {key[1]} does not exist'
+            elif inserted[trx.hash] > 0:
+                inserted[trx.hash] -= 1
+            else:
+                result.status = w_pb2.ERROR
+                result.description = f'Transaction with hash {trx.hash} ' \
+                                     f'is already in base'
 
-        if await cls.manager.exists(Transaction, hash=request_obj.hash):
-            raise ValueError(
-                f'Get Transaction error: transaction '
-                f'with hash {request_obj.hash} is already in base'
-            )
+        response_msg.header.status = w_pb2.SUCCESS
+        return response_msg
@@ -0,0 +1,88 @@
+"""
+Decoding of big gateway responses in worker processes.
+
+`OffloadCodec` keeps responses bigger than the threshold as raw bytes
+(`RawResponse`), gateway then parses and decodes them with
+`decode_payload` in `ProcessPoolExecutor`, so the event loop is not blocked
+by protobuf parsing and normalization of tens of thousands of entries.
+Decode callables must be picklable (module level functions).
+Pool processes are started by forkserver: the server process runs threads
+(logging listener, monitoring loop) and db pools which forked copies
+would inherit in an arbitrary state.
+"""
+import os
+import typing
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from grpclib.encoding.proto import ProtoCodec
+
+from wallets.settings.config import conf
+
+
+def offload_size() -> typing.Optional[int]:
+    """Response size in bytes from which decoding goes to worker process."""
+    value = os.getenv('GW_OFFLOAD_DECODE_SIZE',
+                      conf.get('GW_OFFLOAD_DECODE_SIZE'))
+    return int(value) if value else None
+
+
+class RawResponse(typing.NamedTuple):
+    data: bytes
+    message_type: typing.Any
+
+
+class OffloadCodec(ProtoCodec):
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+
+    def decode(self, data: bytes, message_type):
+        if len(data) >= self.threshold:
+            return RawResponse(data, message_type)
+        return super().decode(data, message_type)
+
+
+def decode_payload(
+        raw: RawResponse,
+        response_attr: str,
+        allowed_statutes: typing.Tuple[int],
+        decode: typing.Callable,
+) -> typing.Tuple[typing.Any, typing.Any]:
+    """
+    Runs in worker process. Return response header and decoded response,
+    failed responses are not decoded.
+    """
+    response = raw.message_type.FromString(raw.data)
+    header = getattr(response, response_attr)
+    if header.status not in allowed_statutes:
+        return header, None
+    return header, decode(response)
+
+
+_executor: typing.Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()  # api and monitoring loops may race
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Process pool is created on first big response in every process."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = os.getenv('GW_OFFLOAD_DECODE_WORKERS',
+                                conf.get('GW_OFFLOAD_DECODE_WORKERS'))
+            _executor = ProcessPoolExecutor(
+                max_workers=int(workers) if workers else None,
+                mp_context=multiprocessing.get_context('forkserver'),
+            )
+    return _executor
+
+
+def _forget_executor():
+    # pool of the parent process is not usable in forked server workers
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_executor)
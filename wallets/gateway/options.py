@@ -0,0 +1,83 @@
+"""
+Options of one gateway call and the deadline it has to meet.
+
+Gateways build `CallOptions` for every call from their class settings,
+GW_METHOD_TIMEOUTS and arguments of `_base_request`, instead of changing
+the class settings. Handlers of the server run with the deadline of the
+incoming request (see `propagate_deadlines`), gateway calls made by them
+get no more time than the caller has left.
+"""
+import typing
+import asyncio
+import contextlib
+import contextvars
+
+from grpclib.events import listen
+from grpclib.events import RecvRequest
+from grpclib.metadata import Deadline
+
+from wallets.settings.config import conf
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """No time is left for the call, it's not sent."""
+
+
+class CallOptions(typing.NamedTuple):
+    timeout: typing.Optional[float]
+    allowed_statuses: typing.Tuple[int, ...]
+    bad_response_msg: str = ''
+    metadata: typing.Optional[typing.Mapping[str, str]] = None
+
+
+def method_timeout(gateway: str, method: str,
+                   default: typing.Optional[float]) -> typing.Optional[float]:
+    timeouts = conf.get('GW_METHOD_TIMEOUTS') or {}
+    return timeouts.get(f'{gateway}.{method}', default)
+
+
+_deadline: contextvars.ContextVar = contextvars.ContextVar(
+    'gw_deadline', default=None)
+
+
+def get_deadline() -> typing.Optional[Deadline]:
+    return _deadline.get()
+
+
+@contextlib.contextmanager
+def deadline(seconds: float):
+    """Calls in the block have to finish in `seconds`, or earlier."""
+    new = Deadline.from_timeout(seconds)
+    current = _deadline.get()
+    token = _deadline.set(new if current is None else min(current, new))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def deadline_exceeded() -> bool:
+    """Deadline of the current request has passed."""
+    current = _deadline.get()
+    return current is not None and current.time_remaining() <= 0
+
+
+def time_left(timeout: typing.Optional[float]) -> typing.Optional[float]:
+    """`timeout` cut to the time left till the deadline."""
+    current = _deadline.get()
+    if current is None:
+        return timeout
+    remaining = current.time_remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded('deadline of the request is exceeded')
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+async def _on_recv_request(event: RecvRequest):
+    # runs in the task of the handler, before it
+    _deadline.set(event.deadline)
+
+
+def propagate_deadlines(server):
+    """Run handlers of grpclib `server` with deadlines of their requests."""
+    listen(server, RecvRequest, _on_recv_request)
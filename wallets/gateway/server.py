@@ -1,5 +1,6 @@
 from wallets.rpc import wallets_grpc
 from wallets.gateway import method_classes
+from wallets.gateway.feed import watch_transactions
 
 
 class WalletsService(wallets_grpc.WalletsBase):
@@ -22,6 +23,18 @@ class WalletsService(wallets_grpc.WalletsBase):
             await method_classes.StopMonitoringMethod.process(request)
         )
 
+    async def StartMonitoringBatch(self, stream):
+        request = await stream.recv_message()
+        await stream.send_message(
+            await method_classes.StartMonitoringBatchMethod.process(request)
+        )
+
+    async def StopMonitoringBatch(self, stream):
+        request = await stream.recv_message()
+        await stream.send_message(
+            await method_classes.StopMonitoringBatchMethod.process(request)
+        )
+
     async def CheckBalance(self, stream):
         request = await stream.recv_message()
         await stream.send_message(
@@ -53,3 +66,14 @@ class WalletsService(wallets_grpc.WalletsBase):
         await stream.send_message(
             await method_classes.AddInputTransactionMethod.process(request)
         )
+
+    async def AddInputTransactions(self, stream):
+        request = await stream.recv_message()
+        await stream.send_message(
+            await method_classes.AddInputTransactionsMethod.process(request)
+        )
+
+    async def WatchTransactions(self, stream):
+        request = await stream.recv_message()
+        await watch_transactions(request, stream.send_message,
+                                 method_classes.ServerMethod.manager)
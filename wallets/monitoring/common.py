@@ -1,28 +1,41 @@
-import os
 import abc
 import typing
+import asyncio
+import peewee
+import contextlib
 
 from decimal import Decimal
 from decimal import ROUND_HALF_UP
 from datetime import datetime
 from datetime import timedelta
-from aioredlock import Aioredlock
 from wallets.utils.consts import TransactionStatus
 
 from wallets import (
     app,
-    logger,
     objects,
     MyManager
 )
 
 from wallets.common import (
     Wallet,
-    Transaction
+    Outbox,
+    Transaction,
+    TransactionEvent,
 )
-from wallets.utils import (
-    send_message,
-    nested_commit_on_success
+from wallets.common.registry import get_wallet_registry
+from wallets.shared.lazy import LazyObject
+from wallets.shared.locks import fenced
+from wallets.shared.locks import StaleLease
+from wallets.shared.locks import create_lock_backend
+from wallets.shared.logging import get_logger
+from wallets.utils import nested_commit_on_success
+from wallets.shared.alerts import Alert, get_alert_dispatcher
+from wallets.shared.notify import (
+    notify,
+    NotificationListener,
+    NEW_TRANSACTIONS,
+    CONFIRMED_TRANSACTIONS,
+    TRANSACTION_EVENTS,
 )
 
 from wallets.gateway.base import (
@@ -30,6 +43,8 @@ from wallets.gateway.base import (
     BaseAsyncGateway
 )
 
+from wallets.bgw_gateway.decoders import TransactionRow
+from wallets.monitoring.matching import ExpectationIndex
 from wallets.gateway import (
     exchanger_service_gw,
     transactions_service_gw,
@@ -39,13 +54,9 @@ from wallets.gateway import (
 
 
 conf = app.config
+logger = get_logger('monitoring')
 
-REDIS_HOST = os.environ.get('REDIS_HOST', conf.get('REDIS_HOST'))
-REDIS_PASSWORD = os.environ.get('REDIS_PASSWORD', '')
-
-lock_manager = Aioredlock(
-    dict(host=REDIS_HOST, password=REDIS_PASSWORD), lock_timeout=120
-)
+lock_manager = LazyObject(create_lock_backend)
 
 
 class BaseMonitorClass(abc.ABC):
@@ -55,6 +66,41 @@ class BaseMonitorClass(abc.ABC):
     timeout: int = conf['MONITORING_TRANSACTIONS_PERIOD']
     counter: int = 0  # for logging
     manager: MyManager = objects
+    channel: typing.Optional[str] = None  # NOTIFY channel which wakes task
+
+    @classmethod
+    async def wait(
+            cls,
+            listener: typing.Optional[NotificationListener] = None,
+    ) -> typing.NoReturn:
+        """
+        Sleep until the next run: for `timeout` or until notification
+        on the task channel.
+        """
+        if listener is None or cls.channel is None:
+            await asyncio.sleep(cls.timeout)
+        else:
+            await listener.wait(cls.channel, cls.timeout)
+
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def locked(cls, key: str) -> typing.AsyncIterator[bool]:
+        """
+        Hold the lock of `key`, False if it's held elsewhere. The block
+        runs in its own db transaction, committed before the lock is
+        released and rolled back if the lease is lost meanwhile.
+        """
+        async with lock_manager.acquire(key, cls.manager) as lease:
+            if lease is None:
+                yield False
+                return
+            counter = cls.counter
+            try:
+                async with fenced(lease, cls.manager):
+                    yield True
+            except StaleLease as exc:
+                cls.counter = counter
+                logger.warning('%s dropped writes: %s', cls.__name__, exc)
 
     @classmethod
     async def get_data(cls):
@@ -73,17 +119,15 @@ class BaseMonitorClass(abc.ABC):
         raise NotImplementedError('Method not implemented!')
 
     @classmethod
-    @nested_commit_on_success
     async def process(
             cls,
     ) -> typing.NoReturn:
         """
-        Method to release logic
+        Method to release logic. Runs are not wrapped in a db transaction,
+        writes are committed per locked wallet (see `locked`) or batch.
         """
         try:
             await cls._execute()
-        except Exception as e:
-            raise e
         finally:
             cls.counter = 0
 
@@ -134,7 +178,8 @@ class CompareRemains:
         if result:
             context = dict(wallets=result)
             context['warning'] = warning
-            await send_message('', msg)
+            get_alert_dispatcher().submit(
+                Alert(None, msg, conf['MONITORING_TEMPLATE'], context))
 
 
 class SaveTrx:
@@ -147,43 +192,63 @@ class SaveTrx:
     async def save(
             cls,
             wallet: Wallet,
-            request_object: typing.Dict,
+            row: TransactionRow,
     ) -> typing.NoReturn:
 
-        trx = await cls.manager.create(Transaction, **request_object)
-        trx.wallet_id = wallet.id
-        await cls.manager.update(trx)
+        trx = await cls.manager.create(Transaction, wallet_id=wallet.id,
+                                       **row._asdict())
+        await cls.manager.execute(Outbox.put(Outbox.TRANSACTIONS, trx))
+        await cls.manager.execute(TransactionEvent.put(trx))
 
 
 class UpdateTrx:
     """
-    Class for update transaction if it necessary
+    Give expected transactions of the wallet hashes and amounts of the
+    matching incoming ones (see `matching`), with one bulk update.
     """
 
     manager: MyManager
     counter: int
 
+    @classmethod
+    async def get_expected(cls, wallet: Wallet) -> typing.List[Transaction]:
+        return await cls.manager.get_all(Transaction.select().where(
+            (Transaction.wallet == wallet.id) &
+            (Transaction.status == TransactionStatus.NEW.value) &
+            Transaction.hash.is_null()
+        ).order_by(Transaction.created_at, Transaction.id))
+
     @classmethod
     async def update(
             cls,
-            wallet: typing.Type['Wallet'],
-            trx: typing.Dict,
+            wallet: Wallet,
+            rows: typing.List[TransactionRow],
     ) -> typing.NoReturn:
-        try:
-            trx: Transaction = await cls.manager.get(
-                Transaction,
-                wallet_id=wallet.id,
-                status=TransactionStatus.NEW.value,
-                address_from=trx['address_from'].lower(),
-                currency_slug=trx['currency_slug'].lower(),
-                hash=None
-            )
-            trx.hash = trx['hash']
-            trx.value = trx['value']
-            await cls.manager.update(trx)
-            cls.counter += 1
-        except Transaction.DoesNotExist:
-            pass
+        expected = await cls.get_expected(wallet)
+        if not expected or not rows:
+            return
+        matches = ExpectationIndex(expected).match(rows)
+        if not matches:
+            return
+
+        ids = [match.expected.id for match in matches]
+        hashes = [(match.expected.id, match.row.hash) for match in matches]
+        values = [(match.expected.id, match.row.value) for match in matches
+                  if match.row.value is not None]
+        updated = await cls.manager.returning(Transaction.update(
+            hash=peewee.Case(Transaction.id, hashes),
+            value=peewee.Case(Transaction.id, values, Transaction.value)
+            if values else Transaction.value,
+            updated_at=datetime.now(),
+        ).where(
+            Transaction.id.in_(ids) &
+            Transaction.hash.is_null()  # matched meanwhile by UpdateTrx RPC
+        ).returning(Transaction))
+        if updated:
+            await cls.manager.execute(
+                Outbox.put(Outbox.TRANSACTIONS, *updated))
+            await cls.manager.execute(TransactionEvent.put(*updated))
+        cls.counter += len(updated)
 
 
 class ValidateTRX:
@@ -195,18 +260,40 @@ class ValidateTRX:
     @classmethod
     def is_input_trx(
             cls,
-            address: str,
+            address: typing.Optional[str],
             wallet: Wallet
     ) -> bool:
-        return wallet.address.lower() == address.lower()
+        return address is not None and \
+            wallet.address.lower() == address.lower()
 
     @classmethod
-    async def is_valid(cls, trx: dict, wallet: Wallet) -> bool:
+    async def is_valid(cls, trx: TransactionRow, wallet: Wallet) -> bool:
         return (
-                not await cls.manager.exists(Transaction, hash=trx['hash'])
-                and cls.is_input_trx(trx['address_to'], wallet)
+                not await cls.manager.exists(Transaction, hash=trx.hash)
+                and cls.is_input_trx(trx.address_to, wallet)
         )
 
+    @classmethod
+    async def new_input_rows(
+            cls,
+            rows: typing.Iterable[TransactionRow],
+            wallet: Wallet,
+    ) -> typing.List[TransactionRow]:
+        """`is_valid` for many rows with one query."""
+        rows = [row for row in rows
+                if cls.is_input_trx(row.address_to, wallet)]
+        if not rows:
+            return rows
+        known = {trx.hash for trx in await cls.manager.get_all(
+            Transaction.select(Transaction.hash).where(
+                Transaction.hash.in_([row.hash for row in rows])))}
+        new_rows = []
+        for row in rows:
+            if row.hash not in known:
+                known.add(row.hash)  # hash is unique
+                new_rows.append(row)
+        return new_rows
+
 
 class CheckWalletMonitor(BaseMonitorClass,
                          CompareRemains):
@@ -264,41 +351,66 @@ class CheckTransactionsMonitor(BaseMonitorClass,
                                ValidateTRX):
     """
     This method monitors the wallet for input transactions and
-    then stores them in the database
+    then stores them in the database. Wallets which share address and
+    external_id (token wallets of one account) are fetched from the
+    blockchain gateway once, transactions are routed by currency_slug.
     """
 
     @classmethod
     async def get_data(cls) -> typing.Optional[list]:
-        return await cls.manager.get_all(Wallet,
-                                         on_monitoring=True,
-                                         is_platform=False,
-                                         is_active=True)
+        return await get_wallet_registry(cls.manager).select(
+            on_monitoring=True, is_platform=False, is_active=True)
+
+    @staticmethod
+    def group_wallets(
+            wallets: typing.Iterable[Wallet],
+    ) -> typing.Dict[typing.Tuple[str, int], typing.Dict[str, Wallet]]:
+        """Wallets by (address, external_id), then by currency_slug."""
+        groups = {}
+        for wallet in wallets:
+            groups.setdefault((wallet.address, wallet.external_id), {})[
+                wallet.currency_slug.lower()] = wallet
+        return groups
+
+    @staticmethod
+    def route(
+            group: typing.Dict[str, Wallet],
+            trx: TransactionRow,
+    ) -> typing.Optional[Wallet]:
+        if len(group) == 1:  # wallet own history, whatever slug it has
+            return next(iter(group.values()))
+        return group.get(trx.currency_slug)
 
     @classmethod
     async def _execute(
             cls,
     ) -> typing.NoReturn:
 
-        for wallet in await cls.get_data():
-            key = Wallet.lock_name_by_id(wallet.id)
-
-            if not await lock_manager.is_locked(key):
-                async with await lock_manager.lock(key) as lock:
-                    assert lock.valid
-
-                    trx_list = await b_gw.get_transactions_list(
-                        wallet_address=wallet.address,
-                        external_id=wallet.external_id
-                    )
-                    for trx in trx_list:
-                        if await cls.is_valid(trx, wallet):
-                            await cls.save(wallet, trx)
-                            cls.counter += 1
-
-                assert lock.valid is False
-
-        logger.info(f'{cls.__name__} saved {cls.counter} '
-                    f'transactions')
+        for (address, external_id), group in cls.group_wallets(
+                await cls.get_data()).items():
+            # replicas build the same groups, one lock covers the group
+            key = Wallet.lock_name_by_id(
+                min(wallet.id for wallet in group.values()))
+
+            async with cls.locked(key) as locked:
+                if not locked:
+                    continue
+
+                trx_list = await b_gw.get_transactions_list(
+                    wallet_address=address,
+                    external_id=external_id
+                )
+                for trx in trx_list:
+                    wallet = cls.route(group, trx)
+                    if wallet is not None and \
+                            await cls.is_valid(trx, wallet):
+                        await cls.save(wallet, trx)
+                        cls.counter += 1
+
+        if cls.counter:
+            await notify(cls.manager, NEW_TRANSACTIONS)
+            await notify(cls.manager, TRANSACTION_EVENTS)
+        logger.info('%s saved %s transactions', cls.__name__, cls.counter)
 
 
 class CheckPlatformWalletsMonitor(CheckTransactionsMonitor,
@@ -312,43 +424,53 @@ class CheckPlatformWalletsMonitor(CheckTransactionsMonitor,
 
     @classmethod
     async def get_data(cls) -> typing.Optional[list]:
-        return await cls.manager.get_all(Wallet,
-                                         on_monitoring=True,
-                                         is_platform=True,
-                                         is_active=True)
+        return await get_wallet_registry(cls.manager).select(
+            on_monitoring=True, is_platform=True, is_active=True)
 
     @classmethod
     async def _execute(
             cls,
     ) -> typing.NoReturn:
 
+        trx_lists = {}  # wallets of one currency get the same list
         for wallet in await cls.get_data():
             key = Wallet.lock_name_by_id(wallet.id)
 
-            if not await lock_manager.is_locked(key):
-                async with await lock_manager.lock(key) as lock:
-                    assert lock.valid
+            async with cls.locked(key) as locked:
+                if not locked:
+                    continue
 
-                    trx_list = await b_gw.get_exchanger_wallet_trx_list(
-                        slug=wallet.currency_slug,
+                slug = wallet.currency_slug
+                if slug not in trx_lists:
+                    trx_lists[slug] = await b_gw.get_exchanger_wallet_trx_list(
+                        slug=slug,
                         from_time=datetime.now() - timedelta(
                             days=cls.time_delta_days)
                     )
-                    for trx in trx_list:
-                        if await cls.is_valid(trx, wallet):
-                            await cls.update(wallet, trx)
-                assert lock.valid is False
+                await cls.update(wallet, await cls.new_input_rows(
+                    trx_lists[slug], wallet))
 
-        logger.info(f'{cls.__name__} updated {cls.counter} '
-                    f'transactions')
+        if cls.counter:  # NEW transactions got hashes
+            await notify(cls.manager, NEW_TRANSACTIONS)
+            await notify(cls.manager, TRANSACTION_EVENTS)
+        logger.info('%s updated %s transactions', cls.__name__, cls.counter)
 
 
 class SendTrxToExternalService(BaseMonitorClass, abc.ABC):
+    """
+    Deliver transactions from the outbox of `topic` in batches. Delivered
+    rows are deleted, failed ones stay for the next run. Every batch is
+    claimed, sent and acked in its own db transaction, so rows are locked
+    only while their batch is sent and a failure doesn't undo the acks of
+    delivered batches.
+    """
     status: TransactionStatus
     gw: typing.Union[
         typing.Type['BaseGateway'], typing.Type['BaseAsyncGateway']
     ]
-    func = typing.Awaitable[typing.Callable]
+    func_name: str  # gateway method, looked up on use as gw is lazy
+    topic: str
+    batch_size: int = conf.get('OUTBOX_BATCH_SIZE', 100)
 
     @classmethod
     def get_status_from_resp(cls, response: dict):
@@ -356,36 +478,56 @@ class SendTrxToExternalService(BaseMonitorClass, abc.ABC):
             response[cls.gw.response_attr]['status'])
 
     @classmethod
-    async def set_status(cls, resp: dict, trx: Transaction):
-        if cls.get_status_from_resp(resp) in cls.gw.ALLOWED_STATUTES:
-            trx.status = cls.status
-            trx.save()
-            cls.counter += 1
+    async def get_data(cls, after_id: int = 0) -> typing.List[Outbox]:
+        return await cls.manager.get_all(
+            Outbox.claim(cls.topic, after_id, cls.batch_size))
 
     @classmethod
-    async def _execute(
-            cls,
-    ) -> typing.NoReturn:
+    async def ack(cls, batch: typing.List[Outbox]) -> typing.NoReturn:
+        ids = [row.transaction_id for row in batch]
+        await cls.manager.execute(Transaction.update(
+            status=cls.status,
+            updated_at=datetime.now(),
+        ).where(Transaction.id.in_(ids)))
+        await cls.manager.execute(TransactionEvent.put_from(
+            Transaction.select().where(Transaction.id.in_(ids))))
+        await cls.manager.execute(
+            Outbox.delete().where(Outbox.id.in_([row.id for row in batch])))
+        await notify(cls.manager, TRANSACTION_EVENTS)
+        cls.counter += len(batch)
 
-        for trx in await cls.get_data():
-            key = Transaction.lock_name_by_id(trx.id)
+    @classmethod
+    @nested_commit_on_success
+    async def deliver(cls, after_id: int) -> typing.Optional[int]:
+        """
+        Send the next batch after `after_id`.
+        :return: id of the last claimed row, None if there are no more
+        """
+        batch = await cls.get_data(after_id)
+        if not batch:
+            return None
 
-            if not await lock_manager.is_locked(key):
-                async with await lock_manager.lock(key) as lock:
-                    assert lock.valid
+        try:
+            resp = await getattr(cls.gw, cls.func_name)(
+                [row.transaction for row in batch])
+        except cls.gw.EXC_CLASS as exc:
+            logger.error(f'{cls.__name__} got exc from '
+                         f'{cls.gw.NAME} {exc}')
+            return batch[-1].id
 
-                    try:
-                        resp = await cls.func([trx])
-                    except cls.gw.EXC_CLASS as exc:
-                        logger.error(f'{cls.__name__} got exc from '
-                                     f'TransactionService {exc}')
-                        continue
+        if cls.get_status_from_resp(resp) in cls.gw.ALLOWED_STATUTES:
+            await cls.ack(batch)
+        return batch[-1].id
 
-                    await cls.set_status(resp, trx)
-                assert lock.valid is False
+    @classmethod
+    async def _execute(
+            cls,
+    ) -> typing.NoReturn:
 
-            logger.info(f'{cls.__name__} sent {cls.counter} '
-                        f'transactions')
+        after_id = 0
+        while after_id is not None:
+            after_id = await cls.deliver(after_id)
+        logger.info('%s sent %s transactions', cls.__name__, cls.counter)
 
 
 class SendToTransactionService(SendTrxToExternalService):
@@ -395,16 +537,9 @@ class SendToTransactionService(SendTrxToExternalService):
     """
     gw = transactions_service_gw
     status = TransactionStatus.SENT.value
-    func = transactions_service_gw.put_on_monitoring
-
-    @classmethod
-    async def get_data(cls) -> typing.Optional[list]:
-
-        return await cls.manager.get_all(
-            Transaction,
-            Transaction.hash != None,
-            Transaction.status == TransactionStatus.NEW.value,
-        )
+    func_name = 'put_on_monitoring'
+    channel = NEW_TRANSACTIONS
+    topic = Outbox.TRANSACTIONS
 
 
 class SendToExchangerService(SendTrxToExternalService):
@@ -415,24 +550,44 @@ class SendToExchangerService(SendTrxToExternalService):
 
     gw = exchanger_service_gw
     status = TransactionStatus.REPORTED.value
-    func = exchanger_service_gw.update_transactions
+    func_name = 'update_transactions'
+    channel = CONFIRMED_TRANSACTIONS
+    topic = Outbox.EXCHANGER
 
-    @classmethod
-    async def get_data(cls) -> typing.Optional[list]:
 
-        query = Transaction.select().join(Wallet).where(
-            (Transaction.hash != None) &
-            (Transaction.uuid != None) &
-            (Wallet.is_platform == True) &
-            (Transaction.status == TransactionStatus.CONFIRMED.value)
+class PruneTransactionEvents(BaseMonitorClass):
+    """
+    Delete transaction changes older than TRANSACTION_EVENTS_DAYS, watchers
+    can't resume from cursors older than that.
+    """
+    timeout = conf['MONITORING_WALLETS_PERIOD']
+    keep_days = conf.get('TRANSACTION_EVENTS_DAYS', 7)
+
+    @classmethod
+    async def _execute(
+            cls,
+    ) -> typing.NoReturn:
+        cls.counter = await cls.manager.execute(
+            TransactionEvent.delete().where(
+                TransactionEvent.created_at <
+                datetime.now() - timedelta(days=cls.keep_days)
+            )
         )
+        logger.info('%s deleted %s events', cls.__name__, cls.counter)
+
 
-        return await cls.manager.get_all(query)
+def set_manager(manager: MyManager) -> typing.NoReturn:
+    """
+    Switch all monitors to another database manager, e.g. to a separate
+    connections pool when api and monitoring share one process.
+    """
+    BaseMonitorClass.manager = manager
 
 
 __TRANSACTIONS_TASKS__ = [
     SendToExchangerService,
     SendToTransactionService,
     CheckTransactionsMonitor,
-   # CheckPlatformWalletsMonitor
+    PruneTransactionEvents,
+    CheckPlatformWalletsMonitor,
 ]
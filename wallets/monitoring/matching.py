@@ -0,0 +1,83 @@
+"""
+Matching of blockchain transactions to expected ones: NEW transactions
+without hash, which StartMonitoringPlatformWallet creates for exchanges.
+
+Expectations of a wallet are indexed once by (address_from, currency_slug,
+amount). Incoming rows first take expectations with the same amount, rows
+left over take any expectation of their sender and currency (the amount
+is corrected then, as `UpdateTrx` always did). Among candidates the
+oldest expectation wins, ties are broken by id, so every replica and
+every run matches the same way.
+"""
+import typing
+from collections import deque
+from decimal import Decimal
+
+from wallets.common import Transaction
+from wallets.bgw_gateway.decoders import TransactionRow
+
+# Transaction.value precision
+_AMOUNT_EXP = Decimal(10) ** -10
+
+_SenderKey = typing.Tuple[str, str]
+_AmountKey = typing.Tuple[str, str, Decimal]
+
+
+class Match(typing.NamedTuple):
+    expected: Transaction
+    row: TransactionRow
+
+
+def _amount(value: typing.Any) -> typing.Optional[Decimal]:
+    if value is None:
+        return None
+    return Decimal(value).quantize(_AMOUNT_EXP)
+
+
+def _sender_key(address_from: str, slug: str) -> _SenderKey:
+    return address_from.lower(), slug.lower()
+
+
+class ExpectationIndex:
+
+    def __init__(self, expected: typing.Iterable[Transaction]):
+        self.by_amount: typing.Dict[_AmountKey, typing.Deque] = {}
+        self.by_sender: typing.Dict[_SenderKey, typing.Deque] = {}
+        self.taken: typing.Set[int] = set()
+        for trx in sorted(expected, key=lambda t: (t.created_at, t.id)):
+            sender = _sender_key(trx.address_from, trx.currency_slug)
+            self.by_sender.setdefault(sender, deque()).append(trx)
+            amount = _amount(trx.value)
+            if amount is not None:
+                self.by_amount.setdefault(
+                    sender + (amount,), deque()).append(trx)
+
+    def _take(self, candidates: typing.Optional[typing.Deque]
+              ) -> typing.Optional[Transaction]:
+        while candidates:
+            trx = candidates.popleft()
+            if trx.id not in self.taken:
+                self.taken.add(trx.id)
+                return trx
+        return None
+
+    def match(
+            self, rows: typing.Iterable[TransactionRow]
+    ) -> typing.List[Match]:
+        """Amount matches first, then sender ones; each taken once."""
+        matches = []
+        left = []
+        for row in rows:
+            sender = _sender_key(row.address_from, row.currency_slug)
+            amount = _amount(row.value)
+            trx = None if amount is None else \
+                self._take(self.by_amount.get(sender + (amount,)))
+            if trx is None:
+                left.append((sender, row))
+            else:
+                matches.append(Match(trx, row))
+        for sender, row in left:
+            trx = self._take(self.by_sender.get(sender))
+            if trx is not None:
+                matches.append(Match(trx, row))
+        return matches
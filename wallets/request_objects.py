@@ -1,32 +1,185 @@
 import abc
 import typing
-from google.protobuf.json_format import MessageToDict
+import operator
 from wallets.utils.consts import TransactionStatus
+from wallets.utils.proto import message_to_dict
 from wallets.rpc import wallets_pb2 as w_p2
 
 
-class BaseRequestObject:
+_TO_TRX_STATUS_ = {
+    w_p2.TransactionStatus.Name(w_p2.NEW): TransactionStatus.NEW.value,
+    w_p2.TransactionStatus.Name(w_p2.CONFIRMED): TransactionStatus.CONFIRMED.value,
+    w_p2.TransactionStatus.Name(w_p2.FAILED): TransactionStatus.FAILED.value,
+    w_p2.TransactionStatus.Name(w_p2.PENDING): TransactionStatus.PENDING.value,
+    w_p2.TransactionStatus.Name(w_p2.NOT_FOUND): TransactionStatus.NOT_FOUND.value,
+    w_p2.TransactionStatus.Name(w_p2.SUCCESSFUL): TransactionStatus.SUCCESSFUL.value,
+    w_p2.TransactionStatus.Name(w_p2.UNDEFINED): TransactionStatus.UNDEFINED.value,
+}
+
+_MISSING = object()
+# protobuf json mapping gives int64 values as strings
+_COERCED_TYPES = (int, float)
+
+
+class Field:
+    """
+    Request object field declaration.
+    :param field_type: value type, request object classes are built
+    from nested dicts automatically, int and float values are coerced
+    :param required: request is invalid without this value
+    :param default: value for missing key
+    :param key: key in message dict if it differs from attribute name
+    :param many: value is a list of `field_type`
+    :param convert: callable applied to present values
+    """
+
+    __slots__ = ('field_type', 'required', 'default', 'key', 'many',
+                 'convert', 'name')
+
+    def __init__(self, field_type: typing.Any = None, required: bool = False,
+                 default: typing.Any = None, key: str = None,
+                 many: bool = False, convert: typing.Callable = None):
+        self.field_type = field_type
+        self.required = required
+        self.default = default
+        self.key = key
+        self.many = many
+        self.convert = convert
+        self.name = None
 
-    _errors: set
+    @property
+    def nested(self) -> bool:
+        return isinstance(self.field_type, type) and \
+            issubclass(self.field_type, BaseRequestObject)
+
+    def loader(self) -> typing.Optional[typing.Callable]:
+        if self.convert is not None:
+            return self.convert
+        if self.nested:
+            from_dict = self.field_type.from_dict
+            if self.many:
+                return lambda values: [from_dict(v) for v in values]
+            return from_dict
+        if self.field_type in _COERCED_TYPES:
+            coerce = self.field_type
+            if self.many:
+                return lambda values: [coerce(v) for v in values]
+            return coerce
+        return None
+
+
+def _getter(names: typing.Tuple[str, ...]) -> typing.Callable:
+    """attrgetter which always returns tuple."""
+    if len(names) == 1:
+        name = names[0]
+        return lambda obj: (getattr(obj, name),)
+    return operator.attrgetter(*names)
+
+
+def _compile_validator(cls) -> typing.Callable:
+    """
+    Build `is_valid` for request object class from its fields declaration:
+    all `required` fields and at least one of `required_any` must be set,
+    nested request objects must be valid.
+    """
+    required = tuple(f.name for f in cls._fields if f.required)
+    nested = tuple((f.name, f.many) for f in cls._fields if f.nested)
+    required_any = tuple(cls.required_any)
+    error_message = cls.error_message or \
+        f'{", ".join(required + required_any)} should be provided'
+    get_required = _getter(required) if required else None
+    get_any = _getter(required_any) if required_any else None
+
+    def is_valid(self) -> bool:
+        if (get_required is not None and not all(get_required(self))) or \
+                (get_any is not None and not any(get_any(self))):
+            self._add_error(ValueError(error_message))
+            return False
+        valid = True
+        for name, many in nested:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            for item in (value if many else (value,)):
+                if not item.is_valid():
+                    self._add_error(item.error)
+                    valid = False
+        return valid
+
+    return is_valid
+
+
+class RequestObjectMeta(abc.ABCMeta):
+    """
+    Collects `Field` declarations into `__slots__` and compiles loader and
+    validator once per class, so request objects are cheap to build for
+    big messages (thousands of transactions in UpdateTrx).
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        own_fields = []
+        for attr, value in list(namespace.items()):
+            if isinstance(value, Field):
+                value.name = attr
+                own_fields.append(value)
+                del namespace[attr]
+        namespace['__slots__'] = tuple(f.name for f in own_fields) + \
+            tuple(namespace.get('__slots__', ()))
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        inherited = [f for base in reversed(cls.__mro__[1:])
+                     for f in getattr(base, '_fields', ())]
+        fields = {f.name: f for f in inherited + own_fields}
+        cls._fields = tuple(fields.values())
+        cls._field_names = tuple(fields)
+        cls._loaders = tuple(
+            (f.name, f.key or f.name, f.default, f.loader())
+            for f in cls._fields
+        )
+        if 'is_valid' not in namespace:
+            cls.is_valid = _compile_validator(cls)
+        return cls
+
+
+class BaseRequestObject(metaclass=RequestObjectMeta):
+
+    __slots__ = ('_errors', '_dict')
+
+    _fields: typing.Tuple[Field, ...] = ()
+    # at least one of these fields should be set
+    required_any: typing.Tuple[str, ...] = ()
+    # error for failed required / required_any check
+    error_message: str = None
+
+    def __init__(self, **kwargs):
+        self._load(kwargs)
 
-    def __init__(self, *args, **kwargs):
-        self._errors = set()
-        for k, v in kwargs.items():
-            self.__dict__[k] = v
+    def _load(self, data: dict):
+        self._errors = None
+        self._dict = None
+        for name, key, default, loader in self._loaders:
+            value = data.get(key, _MISSING)
+            if value is _MISSING:
+                value = default
+            elif loader is not None:
+                value = loader(value)
+            setattr(self, name, value)
 
-    def is_valid(self):
-        self._errors.add(NotImplementedError)
-        return False
+    def _add_error(self, error: Exception):
+        if self._errors is None:
+            self._errors = set()
+        self._errors.add(error)
 
     @classmethod
     def from_message(cls, msg):
-        data: dict = MessageToDict(msg, preserving_proto_field_name=True)
+        data: dict = message_to_dict(msg)
         res = cls.from_dict(data)
         return res
 
     @classmethod
     def from_dict(cls, d: dict):
-        res = cls(**d)
+        res = cls.__new__(cls)
+        res._load(d)
         res._dict = d
         return res
 
@@ -38,51 +191,42 @@ class BaseRequestObject:
         return next(iter(self._errors))  # get without removing
 
     def __str__(self):
-        return f'<{self.__class__.__name__}: {self.__dict__}>'
+        values = {name: getattr(self, name) for name in self._field_names}
+        return f'<{self.__class__.__name__}: {values}>'
 
     def dict(self) -> typing.Optional[dict]:
-        if hasattr(self, '_dict'):
-            return self._dict
-        return None
+        return self._dict
 
 
 class HealthzRequest(BaseRequestObject):
-
-    def is_valid(self):
-        return True
+    pass
 
 
 class BalanceRequestObject(BaseRequestObject):
-    body_amount: str
-    body_currency: str
-
-    def is_valid(self):
-        if self.body_currency and self.body_amount:
-            return True
-        self._errors.add(ValueError(
-            'body_amount and body_currency should be provided')
-        )
-        return False
+    body_amount = Field(str, required=True)
+    body_currency = Field(str, required=True)
+
+    error_message = 'body_amount and body_currency should be provided'
 
 
 class WalletMessage(BaseRequestObject):
-    id: int
-    currency_slug: str
-    address: str
-    is_platform: bool
-    external_id: int
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.external_id = self.id
-
-    def is_valid(self):
-        if not any([self.id, self.address, self.currency_slug]):
-            self._errors.add(ValueError(
-                'id, address, currency_slug should be provided')
-            )
-            return False
-        return True
+    id = Field(int)
+    currency_slug = Field(str)
+    address = Field(str)
+    is_platform = Field(bool, default=False)
+    external_id = Field(int, key='id')
+
+    required_any = ('id', 'address', 'currency_slug')
+    error_message = 'id, address, currency_slug should be provided'
+
+    def wallet_data(self) -> dict:
+        """Wallet model fields."""
+        return {
+            'external_id': self.id,
+            'is_platform': self.is_platform,
+            'address': self.address,
+            'currency_slug': self.currency_slug,
+        }
 
 
 class BaseMonitoringRequest(BaseRequestObject,
@@ -93,91 +237,55 @@ class BaseMonitoringRequest(BaseRequestObject,
 
 
 class MonitoringRequestObject(BaseMonitoringRequest):
-    wallet: typing.Union[WalletMessage, typing.Dict]
+    wallet = Field(WalletMessage, required=True)
+
+    error_message = 'need wallet message to send'
 
     def dict(self):
-        return {
-            'external_id': self.wallet.id,
-            'is_platform': getattr(self.wallet, 'is_platform', False),
-            'address': self.wallet.address,
-            'currency_slug': self.wallet.currency_slug,
-        }
+        return self.wallet.wallet_data()
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._errors = set()
-        self.wallet = WalletMessage.from_dict(self.wallet)
 
-    def is_valid(self) -> bool:
-        wlt = getattr(self, 'wallet', None)
-        if wlt:
-            if wlt.is_valid():
-                return True
-            else:
-                self._errors.add(wlt.error)
-                return False
-        self._errors.add(ValueError('need wallet message to send'))
-        return False
+class MonitoringBatchRequestObject(BaseRequestObject):
+    wallets = Field(WalletMessage, required=True, many=True)
+
+    error_message = 'need wallets to send'
 
 
 class WalletBalanceRequestObject(BaseRequestObject):
 
-    address: str
-    external_id: int
+    address = Field(str)
+    external_id = Field(int)
 
-    def is_valid(self):
-        if not self.address or self.external_id:
-            self._errors.add(ValueError(
-                'address or external_id should be provided')
-            )
-            return False
-        return True
+    required_any = ('address', 'external_id')
+    error_message = 'address or external_id should be provided'
 
 
 class TransactionMessage(BaseRequestObject):
-    fromAddr: str  # be carefull! This name is different from proto-file
-    to: str
-    currencySlug: str
-    value: str
-    hash: str
-    status: int
-    is_fee_trx: bool
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.status = self.get_status(self.status)
-
-    @classmethod
-    def from_dict(cls, d: dict):
-        """
-        we should override this method for field with name 'from'
-        due to python reserved words
-        """
-        fromAddr = d.pop('from', None)
-        if fromAddr:
-            d['fromAddr'] = fromAddr
-        return cls(**d)
-
-    def is_valid(self) -> bool:
-        if getattr(self, 'fromAddr', None) and \
-                getattr(self, 'hash', None) and \
-                getattr(self, 'to', None) and \
-                getattr(self, 'value', None) and \
-                getattr(self, 'currencySlug', None):
-            return True
-        self._errors.add(ValueError('Not enough transaction params to send!'))
-        return False
+    id = Field(int)
+    # be carefull! This name is different from proto-file
+    # due to python reserved words
+    fromAddr = Field(str, required=True, key='from')
+    to = Field(str, required=True)
+    currencySlug = Field(str, required=True)
+    value = Field(str, required=True)
+    hash = Field(str, required=True)
+    status = Field(int, convert=_TO_TRX_STATUS_.get)
+    is_fee_trx = Field(bool)
+    wallet_id = Field(int)
+    time_confirmed = Field(int)
+
+    error_message = 'Not enough transaction params to send!'
 
     def dict(self) -> typing.Dict:
         return self.clean_dict({
-            'id': getattr(self, 'id', None),
+            'id': self.id,
             'address_to': self.to,
             'address_from': self.fromAddr,
             'currency_slug': self.currencySlug,
             'value': self.value,
             'hash': self.hash,
             'status': self.status,
-            'is_fee_trx': getattr(self, 'is_fee_trx', None),
+            'is_fee_trx': self.is_fee_trx,
         })
 
     @staticmethod
@@ -188,100 +296,70 @@ class TransactionMessage(BaseRequestObject):
 
     @staticmethod
     def get_status(value):
-        _TO_TRX_STATUS_ = {
-            w_p2.TransactionStatus.Name(w_p2.NEW): TransactionStatus.NEW.value,
-            w_p2.TransactionStatus.Name(w_p2.CONFIRMED): TransactionStatus.CONFIRMED.value,
-            w_p2.TransactionStatus.Name(w_p2.FAILED): TransactionStatus.FAILED.value,
-            w_p2.TransactionStatus.Name(w_p2.PENDING): TransactionStatus.PENDING.value,
-            w_p2.TransactionStatus.Name(w_p2.NOT_FOUND): TransactionStatus.NOT_FOUND.value,
-            w_p2.TransactionStatus.Name(w_p2.SUCCESSFUL): TransactionStatus.SUCCESSFUL.value,
-            w_p2.TransactionStatus.Name(w_p2.UNDEFINED): TransactionStatus.UNDEFINED.value,
-        }
         return _TO_TRX_STATUS_[value] if value else None
 
 
 class TransactionRequestObject(BaseMonitoringRequest):
 
-    transactions: typing.List[TransactionMessage]
-
-    def __init__(self, transaction: typing.List):
-        self._errors = set()
-        self.transactions = [
-            TransactionMessage.from_dict(trx) for trx in transaction
-        ] if transaction else None
+    transactions = Field(TransactionMessage, required=True, many=True,
+                         key='transaction')
 
-    def is_valid(self) -> bool:
-        validated = []
-
-        if getattr(self, 'transactions'):
-            for trx in self.transactions:
-                if not trx.is_valid():
-                    self._errors.add(trx.error)
-                else:
-                    validated.append(trx)
-            is_valid = self.__eq__(validated)
-            if not is_valid:
-                return False
-            return True
-
-        self._errors.add(ValueError('Not enough transaction to update!'))
-        return False
+    error_message = 'Not enough transaction to update!'
 
     def dict(self) -> dict:
         return {}
 
-    def __eq__(self, other):
-        return len(self.transactions) == len(other)
-
 
 class GetInputTrxRequestObject(BaseRequestObject):
 
-    wallet_id: int
-    wallet_address: str
-    currencySlug: str
-    time_from: int
-    time_to: int
+    wallet_id = Field(int, required=True)
+    wallet_address = Field(str)
+    currencySlug = Field(str)
+    time_from = Field(int)
+    time_to = Field(int)
 
-    def is_valid(self):
-        if not self.wallet_id:
-            self._errors.add(
-                ValueError('wallet_id is required'))
-            return False
-        return True
+    error_message = 'wallet_id is required'
 
 
 class PlatformWLTMonitoringRequestObject(BaseRequestObject):
-    uuid: str = None
-    expected_address: str = None
-    expected_amount: str = None
-    expected_currency: str = None
-    wallet_id: int = None
-    wallet_address: str = None
-
-    def is_valid(self):
-        if not all([self.wallet_id, self.wallet_address]) or not\
-                any([self.uuid, self.expected_address, self.expected_currency]):
-            self._errors.add(
-                ValueError('wallet_id or wallet_address, uuid, '
-                           'expected_address, expected_currency is required'))
-            return False
-        return True
+    uuid = Field(str)
+    expected_address = Field(str)
+    expected_amount = Field(str)
+    expected_currency = Field(str)
+    wallet_id = Field(int, required=True)
+    wallet_address = Field(str, required=True)
+
+    required_any = ('uuid', 'expected_address', 'expected_currency')
+    error_message = 'wallet_id or wallet_address, uuid, ' \
+                    'expected_address, expected_currency is required'
 
 
 class AddInputTrxRequestObject(BaseRequestObject):
 
-    uuid: str = None
-    from_address: str = None
-    hash: str = None
-    currency: str = None
-    wallet_address: str = None
-    value: str = None
-
-    def is_valid(self):
-        if not all([self.value, self.wallet_address,
-                    self.uuid, self.from_address, self.currency, self.hash]):
-            self._errors.add(
-                ValueError('value , wallet_address, uuid, '
-                           'from_address, currency, hash is required'))
-            return False
-        return True
+    uuid = Field(str, required=True)
+    from_address = Field(str, required=True)
+    hash = Field(str, required=True)
+    currency = Field(str, required=True)
+    wallet_address = Field(str, required=True)
+    value = Field(str, required=True)
+
+    error_message = 'value , wallet_address, uuid, ' \
+                    'from_address, currency, hash is required'
+
+    def transaction_data(self, wallet) -> dict:
+        """Transaction model fields for the exchanger wallet."""
+        return {
+            'address_to': wallet.address,
+            'currency_slug': self.currency,
+            'address_from': self.from_address,
+            'value': self.value,
+            'wallet_id': wallet.id,
+            'uuid': self.uuid,
+            'hash': self.hash,
+        }
+
+
+class AddInputTrxBatchRequestObject(BaseRequestObject):
+    transactions = Field(AddInputTrxRequestObject, required=True, many=True)
+
+    error_message = 'need transactions to add'
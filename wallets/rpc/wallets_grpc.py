@@ -30,6 +30,14 @@ class WalletsBase(abc.ABC):
     async def StopMonitoring(self, stream: 'grpclib.server.Stream[wallets_pb2.MonitoringRequest, wallets_pb2.MonitoringResponse]') -> None:
         pass
 
+    @abc.abstractmethod
+    async def StartMonitoringBatch(self, stream: 'grpclib.server.Stream[wallets_pb2.MonitoringBatchRequest, wallets_pb2.MonitoringBatchResponse]') -> None:
+        pass
+
+    @abc.abstractmethod
+    async def StopMonitoringBatch(self, stream: 'grpclib.server.Stream[wallets_pb2.MonitoringBatchRequest, wallets_pb2.MonitoringBatchResponse]') -> None:
+        pass
+
     @abc.abstractmethod
     async def CheckBalance(self, stream: 'grpclib.server.Stream[wallets_pb2.CheckBalanceRequest, wallets_pb2.CheckBalanceResponse]') -> None:
         pass
@@ -50,6 +58,14 @@ class WalletsBase(abc.ABC):
     async def AddInputTransaction(self, stream: 'grpclib.server.Stream[wallets_pb2.InputTransactionRequest, wallets_pb2.InputTransactionResponse]') -> None:
         pass
 
+    @abc.abstractmethod
+    async def AddInputTransactions(self, stream: 'grpclib.server.Stream[wallets_pb2.InputTransactionsBatchRequest, wallets_pb2.InputTransactionsBatchResponse]') -> None:
+        pass
+
+    @abc.abstractmethod
+    async def WatchTransactions(self, stream: 'grpclib.server.Stream[wallets_pb2.WatchTransactionsRequest, wallets_pb2.TransactionEvent]') -> None:
+        pass
+
     def __mapping__(self) -> typing.Dict[str, grpclib.const.Handler]:
         return {
             '/wallets.Wallets/Healthz': grpclib.const.Handler(
@@ -70,6 +86,18 @@ class WalletsBase(abc.ABC):
                 wallets_pb2.MonitoringRequest,
                 wallets_pb2.MonitoringResponse,
             ),
+            '/wallets.Wallets/StartMonitoringBatch': grpclib.const.Handler(
+                self.StartMonitoringBatch,
+                grpclib.const.Cardinality.UNARY_UNARY,
+                wallets_pb2.MonitoringBatchRequest,
+                wallets_pb2.MonitoringBatchResponse,
+            ),
+            '/wallets.Wallets/StopMonitoringBatch': grpclib.const.Handler(
+                self.StopMonitoringBatch,
+                grpclib.const.Cardinality.UNARY_UNARY,
+                wallets_pb2.MonitoringBatchRequest,
+                wallets_pb2.MonitoringBatchResponse,
+            ),
             '/wallets.Wallets/CheckBalance': grpclib.const.Handler(
                 self.CheckBalance,
                 grpclib.const.Cardinality.UNARY_UNARY,
@@ -100,6 +128,18 @@ class WalletsBase(abc.ABC):
                 wallets_pb2.InputTransactionRequest,
                 wallets_pb2.InputTransactionResponse,
             ),
+            '/wallets.Wallets/AddInputTransactions': grpclib.const.Handler(
+                self.AddInputTransactions,
+                grpclib.const.Cardinality.UNARY_UNARY,
+                wallets_pb2.InputTransactionsBatchRequest,
+                wallets_pb2.InputTransactionsBatchResponse,
+            ),
+            '/wallets.Wallets/WatchTransactions': grpclib.const.Handler(
+                self.WatchTransactions,
+                grpclib.const.Cardinality.UNARY_STREAM,
+                wallets_pb2.WatchTransactionsRequest,
+                wallets_pb2.TransactionEvent,
+            ),
         }
 
 
@@ -124,6 +164,18 @@ class WalletsStub:
             wallets_pb2.MonitoringRequest,
             wallets_pb2.MonitoringResponse,
         )
+        self.StartMonitoringBatch = grpclib.client.UnaryUnaryMethod(
+            channel,
+            '/wallets.Wallets/StartMonitoringBatch',
+            wallets_pb2.MonitoringBatchRequest,
+            wallets_pb2.MonitoringBatchResponse,
+        )
+        self.StopMonitoringBatch = grpclib.client.UnaryUnaryMethod(
+            channel,
+            '/wallets.Wallets/StopMonitoringBatch',
+            wallets_pb2.MonitoringBatchRequest,
+            wallets_pb2.MonitoringBatchResponse,
+        )
         self.CheckBalance = grpclib.client.UnaryUnaryMethod(
             channel,
             '/wallets.Wallets/CheckBalance',
@@ -154,3 +206,15 @@ class WalletsStub:
             wallets_pb2.InputTransactionRequest,
             wallets_pb2.InputTransactionResponse,
         )
+        self.AddInputTransactions = grpclib.client.UnaryUnaryMethod(
+            channel,
+            '/wallets.Wallets/AddInputTransactions',
+            wallets_pb2.InputTransactionsBatchRequest,
+            wallets_pb2.InputTransactionsBatchResponse,
+        )
+        self.WatchTransactions = grpclib.client.UnaryStreamMethod(
+            channel,
+            '/wallets.Wallets/WatchTransactions',
+            wallets_pb2.WatchTransactionsRequest,
+            wallets_pb2.TransactionEvent,
+        )
@@ -25,7 +25,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='wallets',
   syntax='proto3',
   serialized_options=_b('Z\006wlt-go\222AH\022\026\n\017Wallets service2\0031.0\"\007/api/v1*\001\0012\020application/json:\020application/json'),
-  serialized_pb=_b('\n\rwallets.proto\x12\x07wallets\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1egoogle/protobuf/duration.proto\x1a\x1cgoogle/api/annotations.proto\x1a,protoc-gen-swagger/options/annotations.proto\"N\n\x0eResponseHeader\x12\'\n\x06status\x18\x01 \x01(\x0e\x32\x17.wallets.ResponseStatus\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\"\x10\n\x0eHealthzRequest\":\n\x0fHealthzResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\"f\n\x06Wallet\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x15\n\rcurrency_slug\x18\x02 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x03 \x01(\t\x12\x13\n\x0bis_platform\x18\x04 \x01(\x08\x12\x13\n\x0b\x65xternal_id\x18\x05 \x01(\x03\"4\n\x11MonitoringRequest\x12\x1f\n\x06wallet\x18\x01 \x01(\x0b\x32\x0f.wallets.Wallet\"=\n\x12MonitoringResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\"A\n\x13\x43heckBalanceRequest\x12\x15\n\rbody_currency\x18\x01 \x01(\t\x12\x13\n\x0b\x62ody_amount\x18\x02 \x01(\t\"?\n\x14\x43heckBalanceResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\"\xc5\x01\n\x0bTransaction\x12\x0c\n\x04\x66rom\x18\x01 \x01(\t\x12\n\n\x02to\x18\x02 \x01(\t\x12\x0c\n\x04hash\x18\x03 \x01(\t\x12\r\n\x05value\x18\x05 \x01(\t\x12\x11\n\twallet_id\x18\x06 \x01(\x03\x12\x14\n\x0c\x63urrencySlug\x18\x07 \x01(\t\x12*\n\x06status\x18\x08 \x01(\x0e\x32\x1a.wallets.TransactionStatus\x12\x12\n\nis_fee_trx\x18\t \x01(\x08\x12\x16\n\x0etime_confirmed\x18\n \x01(\x03\"?\n\x12TransactionRequest\x12)\n\x0btransaction\x18\x01 \x03(\x0b\x32\x14.wallets.Transaction\">\n\x13TransactionResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\"i\n\x18InputTransactionsRequest\x12\x11\n\twallet_id\x18\x01 \x01(\x03\x12\x16\n\x0ewallet_address\x18\x02 \x01(\t\x12\x11\n\ttime_from\x18\x03 \x01(\x03\x12\x0f\n\x07time_to\x18\x04 \x01(\x03\"p\n\x19InputTransactionsResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\x12*\n\x0ctransactions\x18\x02 \x03(\x0b\x32\x14.wallets.Transaction\"\xa5\x01\n\x1cPlatformWLTMonitoringRequest\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\x18\n\x10\x65xpected_address\x18\x02 \x01(\t\x12\x17\n\x0f\x65xpected_amount\x18\x03 \x01(\t\x12\x11\n\twallet_id\x18\x04 \x01(\x03\x12\x16\n\x0ewallet_address\x18\x05 \x01(\t\x12\x19\n\x11\x65xpected_currency\x18\x06 \x01(\t\"H\n\x1dPlatformWLTMonitoringResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\"\x84\x01\n\x17InputTransactionRequest\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x66rom_address\x18\x02 \x01(\t\x12\x0c\n\x04hash\x18\x03 \x01(\t\x12\x16\n\x0ewallet_address\x18\x05 \x01(\t\x12\x10\n\x08\x63urrency\x18\x06 \x01(\t\x12\r\n\x05value\x18\x07 \x01(\t\"C\n\x18InputTransactionResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader*J\n\x0eResponseStatus\x12\x0b\n\x07NOT_SET\x10\x00\x12\x0b\n\x07SUCCESS\x10\x01\x12\t\n\x05\x45RROR\x10\x02\x12\x13\n\x0fINVALID_REQUEST\x10\x03*r\n\x11TransactionStatus\x12\r\n\tUNDEFINED\x10\x00\x12\x07\n\x03NEW\x10\x01\x12\r\n\tNOT_FOUND\x10\x02\x12\x0e\n\nSUCCESSFUL\x10\x03\x12\n\n\x06\x46\x41ILED\x10\x04\x12\x0b\n\x07PENDING\x10\x05\x12\r\n\tCONFIRMED\x10\x06\x32\xc7\x0c\n\x07Wallets\x12\x9d\x01\n\x07Healthz\x12\x17.wallets.HealthzRequest\x1a\x18.wallets.HealthzResponse\"_\x82\xd3\xe4\x93\x02\t\x12\x07/health\x92\x41M\x12\x18Health checking endpoint\x1a\x31Health checking endpoint. Returns HealthzResponse\x12\xd1\x01\n\x0fStartMonitoring\x12\x1a.wallets.MonitoringRequest\x1a\x1b.wallets.MonitoringResponse\"\x84\x01\x82\xd3\xe4\x93\x02\x16\"\x11/start_monitoring:\x01*\x92\x41\x65\x12+Start monitoring wallet on service endpoint\x1a\x36Send wallet with params to start monitoring on service\x12\xcd\x01\n\x0eStopMonitoring\x12\x1a.wallets.MonitoringRequest\x1a\x1b.wallets.MonitoringResponse\"\x81\x01\x82\xd3\xe4\x93\x02\x15\"\x10/stop_monitoring:\x01*\x92\x41\x63\x12*Stop monitoring wallet on service endpoint\x1a\x35Send wallet with params to stop monitoring on service\x12\xbb\x01\n\x0c\x43heckBalance\x12\x1c.wallets.CheckBalanceRequest\x1a\x1d.wallets.CheckBalanceResponse\"n\x82\xd3\xe4\x93\x02\x10\x12\x0e/check_balance\x92\x41U\x12\x31\x43heck Balance of platform wallets when issue loan\x1a Check balance when we issue loan\x12\xad\x01\n\tUpdateTrx\x12\x1b.wallets.TransactionRequest\x1a\x1c.wallets.TransactionResponse\"e\x82\xd3\xe4\x93\x02\x10\"\x0b/update_trx:\x01*\x92\x41L\x12\x1e\x45ndpoint to update transaction\x1a*Update status transactions from blockchain\x12\xce\x01\n\x14GetInputTransactions\x12!.wallets.InputTransactionsRequest\x1a\".wallets.InputTransactionsResponse\"o\x82\xd3\xe4\x93\x02\x10\x12\x0e/get_input_trx\x92\x41V\x12)Endpoint to get wallet input transactions\x1a)Endpoint to get wallet input transactions\x12\xf5\x01\n\x1dStartMonitoringPlatformWallet\x12%.wallets.PlatformWLTMonitoringRequest\x1a&.wallets.PlatformWLTMonitoringResponse\"\x84\x01\x82\xd3\xe4\x93\x02\x1f\"\x1a/start_monitoring/platform:\x01*\x92\x41\\\x12,Endpoint to start monitoring platform wallet\x1a,Endpoint to start monitoring platform wallet\x12\xc0\x01\n\x13\x41\x64\x64InputTransaction\x12 .wallets.InputTransactionRequest\x1a!.wallets.InputTransactionResponse\"d\x82\xd3\xe4\x93\x02\x15\"\x10/transaction/add:\x01*\x92\x41\x46\x12!Endpoint to add input transaction\x1a!Endpoint to add input transactionBSZ\x06wlt-go\x92\x41H\x12\x16\n\x0fWallets service2\x03\x31.0\"\x07/api/v1*\x01\x01\x32\x10\x61pplication/json:\x10\x61pplication/jsonb\x06proto3')
+  serialized_pb=_b('\n\rwallets.proto\x12\x07wallets\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1egoogle/protobuf/duration.proto\x1a\x1cgoogle/api/annotations.proto\x1a,protoc-gen-swagger/options/annotations.proto\"N\n\x0eResponseHeader\x12\'\n\x06status\x18\x01 \x01(\x0e\x32\x17.wallets.ResponseStatus\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\"\x10\n\x0eHealthzRequest\":\n\x0fHealthzResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\"f\n\x06Wallet\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x15\n\rcurrency_slug\x18\x02 \x01(\t\x12\x0f\n\x07\x61\x64\x64ress\x18\x03 \x01(\t\x12\x13\n\x0bis_platform\x18\x04 \x01(\x08\x12\x13\n\x0b\x65xternal_id\x18\x05 \x01(\x03\"4\n\x11MonitoringRequest\x12\x1f\n\x06wallet\x18\x01 \x01(\x0b\x32\x0f.wallets.Wallet\"=\n\x12MonitoringResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\":\n\x16MonitoringBatchRequest\x12 \n\x07wallets\x18\x01 \x03(\x0b\x32\x0f.wallets.Wallet\"X\n\x0cWalletResult\x12\n\n\x02id\x18\x01 \x01(\x03\x12\'\n\x06status\x18\x02 \x01(\x0e\x32\x17.wallets.ResponseStatus\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\"j\n\x17MonitoringBatchResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\x12&\n\x07results\x18\x02 \x03(\x0b\x32\x15.wallets.WalletResult\"A\n\x13\x43heckBalanceRequest\x12\x15\n\rbody_currency\x18\x01 \x01(\t\x12\x13\n\x0b\x62ody_amount\x18\x02 \x01(\t\"?\n\x14\x43heckBalanceResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\"\xc5\x01\n\x0bTransaction\x12\x0c\n\x04\x66rom\x18\x01 \x01(\t\x12\n\n\x02to\x18\x02 \x01(\t\x12\x0c\n\x04hash\x18\x03 \x01(\t\x12\r\n\x05value\x18\x05 \x01(\t\x12\x11\n\twallet_id\x18\x06 \x01(\x03\x12\x14\n\x0c\x63urrencySlug\x18\x07 \x01(\t\x12*\n\x06status\x18\x08 \x01(\x0e\x32\x1a.wallets.TransactionStatus\x12\x12\n\nis_fee_trx\x18\t \x01(\x08\x12\x16\n\x0etime_confirmed\x18\n \x01(\x03\"?\n\x12TransactionRequest\x12)\n\x0btransaction\x18\x01 \x03(\x0b\x32\x14.wallets.Transaction\">\n\x13TransactionResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\"i\n\x18InputTransactionsRequest\x12\x11\n\twallet_id\x18\x01 \x01(\x03\x12\x16\n\x0ewallet_address\x18\x02 \x01(\t\x12\x11\n\ttime_from\x18\x03 \x01(\x03\x12\x0f\n\x07time_to\x18\x04 \x01(\x03\"p\n\x19InputTransactionsResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\x12*\n\x0ctransactions\x18\x02 \x03(\x0b\x32\x14.wallets.Transaction\"\xa5\x01\n\x1cPlatformWLTMonitoringRequest\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\x18\n\x10\x65xpected_address\x18\x02 \x01(\t\x12\x17\n\x0f\x65xpected_amount\x18\x03 \x01(\t\x12\x11\n\twallet_id\x18\x04 \x01(\x03\x12\x16\n\x0ewallet_address\x18\x05 \x01(\t\x12\x19\n\x11\x65xpected_currency\x18\x06 \x01(\t\"H\n\x1dPlatformWLTMonitoringResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\"\x84\x01\n\x17InputTransactionRequest\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\x14\n\x0c\x66rom_address\x18\x02 \x01(\t\x12\x0c\n\x04hash\x18\x03 \x01(\t\x12\x16\n\x0ewallet_address\x18\x05 \x01(\t\x12\x10\n\x08\x63urrency\x18\x06 \x01(\t\x12\r\n\x05value\x18\x07 \x01(\t\"C\n\x18InputTransactionResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\"W\n\x1dInputTransactionsBatchRequest\x12\x36\n\x0ctransactions\x18\x01 \x03(\x0b\x32 .wallets.InputTransactionRequest\"_\n\x11TransactionResult\x12\x0c\n\x04hash\x18\x01 \x01(\t\x12\'\n\x06status\x18\x02 \x01(\x0e\x32\x17.wallets.ResponseStatus\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\"v\n\x1eInputTransactionsBatchResponse\x12\'\n\x06header\x18\x01 \x01(\x0b\x32\x17.wallets.ResponseHeader\x12+\n\x07results\x18\x02 \x03(\x0b\x32\x1a.wallets.TransactionResult\"\x96\x01\n\x18WatchTransactionsRequest\x12\x12\n\nwallet_ids\x18\x01 \x03(\x03\x12(\n\x0bwallet_kind\x18\x02 \x01(\x0e\x32\x13.wallets.WalletKind\x12,\n\x08statuses\x18\x03 \x03(\x0e\x32\x1a.wallets.TransactionStatus\x12\x0e\n\x06\x63ursor\x18\x04 \x01(\x03\"\xb6\x01\n\x10TransactionEvent\x12\x10\n\x08sequence\x18\x01 \x01(\x03\x12\x16\n\x0etransaction_id\x18\x02 \x01(\x03\x12*\n\x06status\x18\x03 \x01(\x0e\x32\x1a.wallets.TransactionStatus\x12)\n\x0btransaction\x18\x04 \x01(\x0b\x32\x14.wallets.Transaction\x12\x13\n\x0bis_platform\x18\x05 \x01(\x08\x12\x0c\n\x04uuid\x18\x06 \x01(\t*J\n\x0eResponseStatus\x12\x0b\n\x07NOT_SET\x10\x00\x12\x0b\n\x07SUCCESS\x10\x01\x12\t\n\x05\x45RROR\x10\x02\x12\x13\n\x0fINVALID_REQUEST\x10\x03*\x8a\x01\n\x11TransactionStatus\x12\r\n\tUNDEFINED\x10\x00\x12\x07\n\x03NEW\x10\x01\x12\r\n\tNOT_FOUND\x10\x02\x12\x0e\n\nSUCCESSFUL\x10\x03\x12\n\n\x06\x46\x41ILED\x10\x04\x12\x0b\n\x07PENDING\x10\x05\x12\r\n\tCONFIRMED\x10\x06\x12\x0c\n\x08REPORTED\x10\x07\x12\x08\n\x04SENT\x10\x08*G\n\nWalletKind\x12\x0f\n\x0b\x41LL_WALLETS\x10\x00\x12\x14\n\x10PLATFORM_WALLETS\x10\x01\x12\x12\n\x0e\x43LIENT_WALLETS\x10\x02\x32\xe7\x13\n\x07Wallets\x12\x9d\x01\n\x07Healthz\x12\x17.wallets.HealthzRequest\x1a\x18.wallets.HealthzResponse\"_\x82\xd3\xe4\x93\x02\t\x12\x07/health\x92\x41M\x12\x18Health checking endpoint\x1a\x31Health checking endpoint. Returns HealthzResponse\x12\xd1\x01\n\x0fStartMonitoring\x12\x1a.wallets.MonitoringRequest\x1a\x1b.wallets.MonitoringResponse\"\x84\x01\x82\xd3\xe4\x93\x02\x16\"\x11/start_monitoring:\x01*\x92\x41\x65\x12+Start monitoring wallet on service endpoint\x1a\x36Send wallet with params to start monitoring on service\x12\xcd\x01\n\x0eStopMonitoring\x12\x1a.wallets.MonitoringRequest\x1a\x1b.wallets.MonitoringResponse\"\x81\x01\x82\xd3\xe4\x93\x02\x15\"\x10/stop_monitoring:\x01*\x92\x41\x63\x12*Stop monitoring wallet on service endpoint\x1a\x35Send wallet with params to stop monitoring on service\x12\xef\x01\n\x14StartMonitoringBatch\x12\x1f.wallets.MonitoringBatchRequest\x1a .wallets.MonitoringBatchResponse\"\x93\x01\x82\xd3\xe4\x93\x02\x1c\"\x17/start_monitoring/batch:\x01*\x92\x41n\x12 Start monitoring of many wallets\x1aJSend wallets to start monitoring on service, result is returned per wallet\x12\xeb\x01\n\x13StopMonitoringBatch\x12\x1f.wallets.MonitoringBatchRequest\x1a .wallets.MonitoringBatchResponse\"\x90\x01\x82\xd3\xe4\x93\x02\x1b\"\x16/stop_monitoring/batch:\x01*\x92\x41l\x12\x1fStop monitoring of many wallets\x1aISend wallets to stop monitoring on service, result is returned per wallet\x12\xbb\x01\n\x0c\x43heckBalance\x12\x1c.wallets.CheckBalanceRequest\x1a\x1d.wallets.CheckBalanceResponse\"n\x82\xd3\xe4\x93\x02\x10\x12\x0e/check_balance\x92\x41U\x12\x31\x43heck Balance of platform wallets when issue loan\x1a Check balance when we issue loan\x12\xad\x01\n\tUpdateTrx\x12\x1b.wallets.TransactionRequest\x1a\x1c.wallets.TransactionResponse\"e\x82\xd3\xe4\x93\x02\x10\"\x0b/update_trx:\x01*\x92\x41L\x12\x1e\x45ndpoint to update transaction\x1a*Update status transactions from blockchain\x12\xce\x01\n\x14GetInputTransactions\x12!.wallets.InputTransactionsRequest\x1a\".wallets.InputTransactionsResponse\"o\x82\xd3\xe4\x93\x02\x10\x12\x0e/get_input_trx\x92\x41V\x12)Endpoint to get wallet input transactions\x1a)Endpoint to get wallet input transactions\x12\xf5\x01\n\x1dStartMonitoringPlatformWallet\x12%.wallets.PlatformWLTMonitoringRequest\x1a&.wallets.PlatformWLTMonitoringResponse\"\x84\x01\x82\xd3\xe4\x93\x02\x1f\"\x1a/start_monitoring/platform:\x01*\x92\x41\\\x12,Endpoint to start monitoring platform wallet\x1a,Endpoint to start monitoring platform wallet\x12\xc0\x01\n\x13\x41\x64\x64InputTransaction\x12 .wallets.InputTransactionRequest\x1a!.wallets.InputTransactionResponse\"d\x82\xd3\xe4\x93\x02\x15\"\x10/transaction/add:\x01*\x92\x41\x46\x12!Endpoint to add input transaction\x1a!Endpoint to add input transaction\x12\x85\x02\n\x14\x41\x64\x64InputTransactions\x12&.wallets.InputTransactionsBatchRequest\x1a\'.wallets.InputTransactionsBatchResponse\"\x9b\x01\x82\xd3\xe4\x93\x02\x1b\"\x16/transaction/add/batch:\x01*\x92\x41w\x12\'Endpoint to add many input transactions\x1aLTransactions already in base are skipped, result is returned per transaction\x12\xb5\x01\n\x11WatchTransactions\x12!.wallets.WatchTransactionsRequest\x1a\x19.wallets.TransactionEvent\"`\x92\x41]\x12$Stream of transaction status changes\x1a\x35Stream of transaction status changes after the cursor0\x01\x42SZ\x06wlt-go\x92\x41H\x12\x16\n\x0fWallets service2\x03\x31.0\"\x07/api/v1*\x01\x01\x32\x10\x61pplication/json:\x10\x61pplication/jsonb\x06proto3')
   ,
   dependencies=[google_dot_protobuf_dot_timestamp__pb2.DESCRIPTOR,google_dot_protobuf_dot_duration__pb2.DESCRIPTOR,google_dot_api_dot_annotations__pb2.DESCRIPTOR,protoc__gen__swagger_dot_options_dot_annotations__pb2.DESCRIPTOR,])
 
@@ -54,8 +54,8 @@ _RESPONSESTATUS = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=1674,
-  serialized_end=1748,
+  serialized_start=2576,
+  serialized_end=2650,
 )
 _sym_db.RegisterEnumDescriptor(_RESPONSESTATUS)
 
@@ -94,15 +94,50 @@ _TRANSACTIONSTATUS = _descriptor.EnumDescriptor(
       name='CONFIRMED', index=6, number=6,
       serialized_options=None,
       type=None),
+    _descriptor.EnumValueDescriptor(
+      name='REPORTED', index=7, number=7,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='SENT', index=8, number=8,
+      serialized_options=None,
+      type=None),
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=1750,
-  serialized_end=1864,
+  serialized_start=2653,
+  serialized_end=2791,
 )
 _sym_db.RegisterEnumDescriptor(_TRANSACTIONSTATUS)
 
 TransactionStatus = enum_type_wrapper.EnumTypeWrapper(_TRANSACTIONSTATUS)
+_WALLETKIND = _descriptor.EnumDescriptor(
+  name='WalletKind',
+  full_name='wallets.WalletKind',
+  filename=None,
+  file=DESCRIPTOR,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='ALL_WALLETS', index=0, number=0,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='PLATFORM_WALLETS', index=1, number=1,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='CLIENT_WALLETS', index=2, number=2,
+      serialized_options=None,
+      type=None),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=2793,
+  serialized_end=2864,
+)
+_sym_db.RegisterEnumDescriptor(_WALLETKIND)
+
+WalletKind = enum_type_wrapper.EnumTypeWrapper(_WALLETKIND)
 NOT_SET = 0
 SUCCESS = 1
 ERROR = 2
@@ -114,6 +149,11 @@ SUCCESSFUL = 3
 FAILED = 4
 PENDING = 5
 CONFIRMED = 6
+REPORTED = 7
+SENT = 8
+ALL_WALLETS = 0
+PLATFORM_WALLETS = 1
+CLIENT_WALLETS = 2
 
 
 
@@ -331,6 +371,120 @@ _MONITORINGRESPONSE = _descriptor.Descriptor(
 )
 
 
+_MONITORINGBATCHREQUEST = _descriptor.Descriptor(
+  name='MonitoringBatchRequest',
+  full_name='wallets.MonitoringBatchRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='wallets', full_name='wallets.MonitoringBatchRequest.wallets', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=546,
+  serialized_end=604,
+)
+
+
+_WALLETRESULT = _descriptor.Descriptor(
+  name='WalletResult',
+  full_name='wallets.WalletResult',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='id', full_name='wallets.WalletResult.id', index=0,
+      number=1, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='status', full_name='wallets.WalletResult.status', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='description', full_name='wallets.WalletResult.description', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=606,
+  serialized_end=694,
+)
+
+
+_MONITORINGBATCHRESPONSE = _descriptor.Descriptor(
+  name='MonitoringBatchResponse',
+  full_name='wallets.MonitoringBatchResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='header', full_name='wallets.MonitoringBatchResponse.header', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='results', full_name='wallets.MonitoringBatchResponse.results', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=696,
+  serialized_end=802,
+)
+
+
 _CHECKBALANCEREQUEST = _descriptor.Descriptor(
   name='CheckBalanceRequest',
   full_name='wallets.CheckBalanceRequest',
@@ -364,8 +518,8 @@ _CHECKBALANCEREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=546,
-  serialized_end=611,
+  serialized_start=804,
+  serialized_end=869,
 )
 
 
@@ -395,8 +549,8 @@ _CHECKBALANCERESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=613,
-  serialized_end=676,
+  serialized_start=871,
+  serialized_end=934,
 )
 
 
@@ -482,8 +636,8 @@ _TRANSACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=679,
-  serialized_end=876,
+  serialized_start=937,
+  serialized_end=1134,
 )
 
 
@@ -513,8 +667,8 @@ _TRANSACTIONREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=878,
-  serialized_end=941,
+  serialized_start=1136,
+  serialized_end=1199,
 )
 
 
@@ -544,8 +698,8 @@ _TRANSACTIONRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=943,
-  serialized_end=1005,
+  serialized_start=1201,
+  serialized_end=1263,
 )
 
 
@@ -596,8 +750,8 @@ _INPUTTRANSACTIONSREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1007,
-  serialized_end=1112,
+  serialized_start=1265,
+  serialized_end=1370,
 )
 
 
@@ -634,8 +788,8 @@ _INPUTTRANSACTIONSRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1114,
-  serialized_end=1226,
+  serialized_start=1372,
+  serialized_end=1484,
 )
 
 
@@ -700,8 +854,8 @@ _PLATFORMWLTMONITORINGREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1229,
-  serialized_end=1394,
+  serialized_start=1487,
+  serialized_end=1652,
 )
 
 
@@ -731,8 +885,8 @@ _PLATFORMWLTMONITORINGRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1396,
-  serialized_end=1468,
+  serialized_start=1654,
+  serialized_end=1726,
 )
 
 
@@ -797,8 +951,8 @@ _INPUTTRANSACTIONREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1471,
-  serialized_end=1603,
+  serialized_start=1729,
+  serialized_end=1861,
 )
 
 
@@ -828,14 +982,250 @@ _INPUTTRANSACTIONRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1605,
-  serialized_end=1672,
+  serialized_start=1863,
+  serialized_end=1930,
+)
+
+
+_INPUTTRANSACTIONSBATCHREQUEST = _descriptor.Descriptor(
+  name='InputTransactionsBatchRequest',
+  full_name='wallets.InputTransactionsBatchRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='transactions', full_name='wallets.InputTransactionsBatchRequest.transactions', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1932,
+  serialized_end=2019,
+)
+
+
+_TRANSACTIONRESULT = _descriptor.Descriptor(
+  name='TransactionResult',
+  full_name='wallets.TransactionResult',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='hash', full_name='wallets.TransactionResult.hash', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='status', full_name='wallets.TransactionResult.status', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='description', full_name='wallets.TransactionResult.description', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2021,
+  serialized_end=2116,
+)
+
+
+_INPUTTRANSACTIONSBATCHRESPONSE = _descriptor.Descriptor(
+  name='InputTransactionsBatchResponse',
+  full_name='wallets.InputTransactionsBatchResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='header', full_name='wallets.InputTransactionsBatchResponse.header', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='results', full_name='wallets.InputTransactionsBatchResponse.results', index=1,
+      number=2, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2118,
+  serialized_end=2236,
+)
+
+
+_WATCHTRANSACTIONSREQUEST = _descriptor.Descriptor(
+  name='WatchTransactionsRequest',
+  full_name='wallets.WatchTransactionsRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='wallet_ids', full_name='wallets.WatchTransactionsRequest.wallet_ids', index=0,
+      number=1, type=3, cpp_type=2, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='wallet_kind', full_name='wallets.WatchTransactionsRequest.wallet_kind', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='statuses', full_name='wallets.WatchTransactionsRequest.statuses', index=2,
+      number=3, type=14, cpp_type=8, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='cursor', full_name='wallets.WatchTransactionsRequest.cursor', index=3,
+      number=4, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2239,
+  serialized_end=2389,
+)
+
+
+_TRANSACTIONEVENT = _descriptor.Descriptor(
+  name='TransactionEvent',
+  full_name='wallets.TransactionEvent',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='sequence', full_name='wallets.TransactionEvent.sequence', index=0,
+      number=1, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='transaction_id', full_name='wallets.TransactionEvent.transaction_id', index=1,
+      number=2, type=3, cpp_type=2, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='status', full_name='wallets.TransactionEvent.status', index=2,
+      number=3, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='transaction', full_name='wallets.TransactionEvent.transaction', index=3,
+      number=4, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='is_platform', full_name='wallets.TransactionEvent.is_platform', index=4,
+      number=5, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='uuid', full_name='wallets.TransactionEvent.uuid', index=5,
+      number=6, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2392,
+  serialized_end=2574,
 )
 
 _RESPONSEHEADER.fields_by_name['status'].enum_type = _RESPONSESTATUS
 _HEALTHZRESPONSE.fields_by_name['header'].message_type = _RESPONSEHEADER
 _MONITORINGREQUEST.fields_by_name['wallet'].message_type = _WALLET
 _MONITORINGRESPONSE.fields_by_name['header'].message_type = _RESPONSEHEADER
+_MONITORINGBATCHREQUEST.fields_by_name['wallets'].message_type = _WALLET
+_WALLETRESULT.fields_by_name['status'].enum_type = _RESPONSESTATUS
+_MONITORINGBATCHRESPONSE.fields_by_name['header'].message_type = _RESPONSEHEADER
+_MONITORINGBATCHRESPONSE.fields_by_name['results'].message_type = _WALLETRESULT
 _CHECKBALANCERESPONSE.fields_by_name['header'].message_type = _RESPONSEHEADER
 _TRANSACTION.fields_by_name['status'].enum_type = _TRANSACTIONSTATUS
 _TRANSACTIONREQUEST.fields_by_name['transaction'].message_type = _TRANSACTION
@@ -844,12 +1234,23 @@ _INPUTTRANSACTIONSRESPONSE.fields_by_name['header'].message_type = _RESPONSEHEAD
 _INPUTTRANSACTIONSRESPONSE.fields_by_name['transactions'].message_type = _TRANSACTION
 _PLATFORMWLTMONITORINGRESPONSE.fields_by_name['header'].message_type = _RESPONSEHEADER
 _INPUTTRANSACTIONRESPONSE.fields_by_name['header'].message_type = _RESPONSEHEADER
+_INPUTTRANSACTIONSBATCHREQUEST.fields_by_name['transactions'].message_type = _INPUTTRANSACTIONREQUEST
+_TRANSACTIONRESULT.fields_by_name['status'].enum_type = _RESPONSESTATUS
+_INPUTTRANSACTIONSBATCHRESPONSE.fields_by_name['header'].message_type = _RESPONSEHEADER
+_INPUTTRANSACTIONSBATCHRESPONSE.fields_by_name['results'].message_type = _TRANSACTIONRESULT
+_WATCHTRANSACTIONSREQUEST.fields_by_name['wallet_kind'].enum_type = _WALLETKIND
+_WATCHTRANSACTIONSREQUEST.fields_by_name['statuses'].enum_type = _TRANSACTIONSTATUS
+_TRANSACTIONEVENT.fields_by_name['status'].enum_type = _TRANSACTIONSTATUS
+_TRANSACTIONEVENT.fields_by_name['transaction'].message_type = _TRANSACTION
 DESCRIPTOR.message_types_by_name['ResponseHeader'] = _RESPONSEHEADER
 DESCRIPTOR.message_types_by_name['HealthzRequest'] = _HEALTHZREQUEST
 DESCRIPTOR.message_types_by_name['HealthzResponse'] = _HEALTHZRESPONSE
 DESCRIPTOR.message_types_by_name['Wallet'] = _WALLET
 DESCRIPTOR.message_types_by_name['MonitoringRequest'] = _MONITORINGREQUEST
 DESCRIPTOR.message_types_by_name['MonitoringResponse'] = _MONITORINGRESPONSE
+DESCRIPTOR.message_types_by_name['MonitoringBatchRequest'] = _MONITORINGBATCHREQUEST
+DESCRIPTOR.message_types_by_name['WalletResult'] = _WALLETRESULT
+DESCRIPTOR.message_types_by_name['MonitoringBatchResponse'] = _MONITORINGBATCHRESPONSE
 DESCRIPTOR.message_types_by_name['CheckBalanceRequest'] = _CHECKBALANCEREQUEST
 DESCRIPTOR.message_types_by_name['CheckBalanceResponse'] = _CHECKBALANCERESPONSE
 DESCRIPTOR.message_types_by_name['Transaction'] = _TRANSACTION
@@ -861,8 +1262,14 @@ DESCRIPTOR.message_types_by_name['PlatformWLTMonitoringRequest'] = _PLATFORMWLTM
 DESCRIPTOR.message_types_by_name['PlatformWLTMonitoringResponse'] = _PLATFORMWLTMONITORINGRESPONSE
 DESCRIPTOR.message_types_by_name['InputTransactionRequest'] = _INPUTTRANSACTIONREQUEST
 DESCRIPTOR.message_types_by_name['InputTransactionResponse'] = _INPUTTRANSACTIONRESPONSE
+DESCRIPTOR.message_types_by_name['InputTransactionsBatchRequest'] = _INPUTTRANSACTIONSBATCHREQUEST
+DESCRIPTOR.message_types_by_name['TransactionResult'] = _TRANSACTIONRESULT
+DESCRIPTOR.message_types_by_name['InputTransactionsBatchResponse'] = _INPUTTRANSACTIONSBATCHRESPONSE
+DESCRIPTOR.message_types_by_name['WatchTransactionsRequest'] = _WATCHTRANSACTIONSREQUEST
+DESCRIPTOR.message_types_by_name['TransactionEvent'] = _TRANSACTIONEVENT
 DESCRIPTOR.enum_types_by_name['ResponseStatus'] = _RESPONSESTATUS
 DESCRIPTOR.enum_types_by_name['TransactionStatus'] = _TRANSACTIONSTATUS
+DESCRIPTOR.enum_types_by_name['WalletKind'] = _WALLETKIND
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
 ResponseHeader = _reflection.GeneratedProtocolMessageType('ResponseHeader', (_message.Message,), {
@@ -907,6 +1314,27 @@ MonitoringResponse = _reflection.GeneratedProtocolMessageType('MonitoringRespons
   })
 _sym_db.RegisterMessage(MonitoringResponse)
 
+MonitoringBatchRequest = _reflection.GeneratedProtocolMessageType('MonitoringBatchRequest', (_message.Message,), {
+  'DESCRIPTOR' : _MONITORINGBATCHREQUEST,
+  '__module__' : 'wallets_pb2'
+  # @@protoc_insertion_point(class_scope:wallets.MonitoringBatchRequest)
+  })
+_sym_db.RegisterMessage(MonitoringBatchRequest)
+
+WalletResult = _reflection.GeneratedProtocolMessageType('WalletResult', (_message.Message,), {
+  'DESCRIPTOR' : _WALLETRESULT,
+  '__module__' : 'wallets_pb2'
+  # @@protoc_insertion_point(class_scope:wallets.WalletResult)
+  })
+_sym_db.RegisterMessage(WalletResult)
+
+MonitoringBatchResponse = _reflection.GeneratedProtocolMessageType('MonitoringBatchResponse', (_message.Message,), {
+  'DESCRIPTOR' : _MONITORINGBATCHRESPONSE,
+  '__module__' : 'wallets_pb2'
+  # @@protoc_insertion_point(class_scope:wallets.MonitoringBatchResponse)
+  })
+_sym_db.RegisterMessage(MonitoringBatchResponse)
+
 CheckBalanceRequest = _reflection.GeneratedProtocolMessageType('CheckBalanceRequest', (_message.Message,), {
   'DESCRIPTOR' : _CHECKBALANCEREQUEST,
   '__module__' : 'wallets_pb2'
@@ -984,6 +1412,41 @@ InputTransactionResponse = _reflection.GeneratedProtocolMessageType('InputTransa
   })
 _sym_db.RegisterMessage(InputTransactionResponse)
 
+InputTransactionsBatchRequest = _reflection.GeneratedProtocolMessageType('InputTransactionsBatchRequest', (_message.Message,), {
+  'DESCRIPTOR' : _INPUTTRANSACTIONSBATCHREQUEST,
+  '__module__' : 'wallets_pb2'
+  # @@protoc_insertion_point(class_scope:wallets.InputTransactionsBatchRequest)
+  })
+_sym_db.RegisterMessage(InputTransactionsBatchRequest)
+
+TransactionResult = _reflection.GeneratedProtocolMessageType('TransactionResult', (_message.Message,), {
+  'DESCRIPTOR' : _TRANSACTIONRESULT,
+  '__module__' : 'wallets_pb2'
+  # @@protoc_insertion_point(class_scope:wallets.TransactionResult)
+  })
+_sym_db.RegisterMessage(TransactionResult)
+
+InputTransactionsBatchResponse = _reflection.GeneratedProtocolMessageType('InputTransactionsBatchResponse', (_message.Message,), {
+  'DESCRIPTOR' : _INPUTTRANSACTIONSBATCHRESPONSE,
+  '__module__' : 'wallets_pb2'
+  # @@protoc_insertion_point(class_scope:wallets.InputTransactionsBatchResponse)
+  })
+_sym_db.RegisterMessage(InputTransactionsBatchResponse)
+
+WatchTransactionsRequest = _reflection.GeneratedProtocolMessageType('WatchTransactionsRequest', (_message.Message,), {
+  'DESCRIPTOR' : _WATCHTRANSACTIONSREQUEST,
+  '__module__' : 'wallets_pb2'
+  # @@protoc_insertion_point(class_scope:wallets.WatchTransactionsRequest)
+  })
+_sym_db.RegisterMessage(WatchTransactionsRequest)
+
+TransactionEvent = _reflection.GeneratedProtocolMessageType('TransactionEvent', (_message.Message,), {
+  'DESCRIPTOR' : _TRANSACTIONEVENT,
+  '__module__' : 'wallets_pb2'
+  # @@protoc_insertion_point(class_scope:wallets.TransactionEvent)
+  })
+_sym_db.RegisterMessage(TransactionEvent)
+
 
 DESCRIPTOR._options = None
 
@@ -993,8 +1456,8 @@ _WALLETS = _descriptor.ServiceDescriptor(
   file=DESCRIPTOR,
   index=0,
   serialized_options=None,
-  serialized_start=1867,
-  serialized_end=3474,
+  serialized_start=2867,
+  serialized_end=5402,
   methods=[
   _descriptor.MethodDescriptor(
     name='Healthz',
@@ -1023,10 +1486,28 @@ _WALLETS = _descriptor.ServiceDescriptor(
     output_type=_MONITORINGRESPONSE,
     serialized_options=_b('\202\323\344\223\002\025\"\020/stop_monitoring:\001*\222Ac\022*Stop monitoring wallet on service endpoint\0325Send wallet with params to stop monitoring on service'),
   ),
+  _descriptor.MethodDescriptor(
+    name='StartMonitoringBatch',
+    full_name='wallets.Wallets.StartMonitoringBatch',
+    index=3,
+    containing_service=None,
+    input_type=_MONITORINGBATCHREQUEST,
+    output_type=_MONITORINGBATCHRESPONSE,
+    serialized_options=_b('\202\323\344\223\002\034\"\027/start_monitoring/batch:\001*\222An\022 Start monitoring of many wallets\032JSend wallets to start monitoring on service, result is returned per wallet'),
+  ),
+  _descriptor.MethodDescriptor(
+    name='StopMonitoringBatch',
+    full_name='wallets.Wallets.StopMonitoringBatch',
+    index=4,
+    containing_service=None,
+    input_type=_MONITORINGBATCHREQUEST,
+    output_type=_MONITORINGBATCHRESPONSE,
+    serialized_options=_b('\202\323\344\223\002\033\"\026/stop_monitoring/batch:\001*\222Al\022\037Stop monitoring of many wallets\032ISend wallets to stop monitoring on service, result is returned per wallet'),
+  ),
   _descriptor.MethodDescriptor(
     name='CheckBalance',
     full_name='wallets.Wallets.CheckBalance',
-    index=3,
+    index=5,
     containing_service=None,
     input_type=_CHECKBALANCEREQUEST,
     output_type=_CHECKBALANCERESPONSE,
@@ -1035,7 +1516,7 @@ _WALLETS = _descriptor.ServiceDescriptor(
   _descriptor.MethodDescriptor(
     name='UpdateTrx',
     full_name='wallets.Wallets.UpdateTrx',
-    index=4,
+    index=6,
     containing_service=None,
     input_type=_TRANSACTIONREQUEST,
     output_type=_TRANSACTIONRESPONSE,
@@ -1044,7 +1525,7 @@ _WALLETS = _descriptor.ServiceDescriptor(
   _descriptor.MethodDescriptor(
     name='GetInputTransactions',
     full_name='wallets.Wallets.GetInputTransactions',
-    index=5,
+    index=7,
     containing_service=None,
     input_type=_INPUTTRANSACTIONSREQUEST,
     output_type=_INPUTTRANSACTIONSRESPONSE,
@@ -1053,7 +1534,7 @@ _WALLETS = _descriptor.ServiceDescriptor(
   _descriptor.MethodDescriptor(
     name='StartMonitoringPlatformWallet',
     full_name='wallets.Wallets.StartMonitoringPlatformWallet',
-    index=6,
+    index=8,
     containing_service=None,
     input_type=_PLATFORMWLTMONITORINGREQUEST,
     output_type=_PLATFORMWLTMONITORINGRESPONSE,
@@ -1062,12 +1543,30 @@ _WALLETS = _descriptor.ServiceDescriptor(
   _descriptor.MethodDescriptor(
     name='AddInputTransaction',
     full_name='wallets.Wallets.AddInputTransaction',
-    index=7,
+    index=9,
     containing_service=None,
     input_type=_INPUTTRANSACTIONREQUEST,
     output_type=_INPUTTRANSACTIONRESPONSE,
     serialized_options=_b('\202\323\344\223\002\025\"\020/transaction/add:\001*\222AF\022!Endpoint to add input transaction\032!Endpoint to add input transaction'),
   ),
+  _descriptor.MethodDescriptor(
+    name='AddInputTransactions',
+    full_name='wallets.Wallets.AddInputTransactions',
+    index=10,
+    containing_service=None,
+    input_type=_INPUTTRANSACTIONSBATCHREQUEST,
+    output_type=_INPUTTRANSACTIONSBATCHRESPONSE,
+    serialized_options=_b('\202\323\344\223\002\033\"\026/transaction/add/batch:\001*\222Aw\022\'Endpoint to add many input transactions\032LTransactions already in base are skipped, result is returned per transaction'),
+  ),
+  _descriptor.MethodDescriptor(
+    name='WatchTransactions',
+    full_name='wallets.Wallets.WatchTransactions',
+    index=11,
+    containing_service=None,
+    input_type=_WATCHTRANSACTIONSREQUEST,
+    output_type=_TRANSACTIONEVENT,
+    serialized_options=_b('\222A]\022$Stream of transaction status changes\0325Stream of transaction status changes after the cursor'),
+  ),
 ])
 _sym_db.RegisterServiceDescriptor(_WALLETS)
 
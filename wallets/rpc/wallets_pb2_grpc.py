@@ -29,6 +29,16 @@ class WalletsStub(object):
         request_serializer=wallets__pb2.MonitoringRequest.SerializeToString,
         response_deserializer=wallets__pb2.MonitoringResponse.FromString,
         )
+    self.StartMonitoringBatch = channel.unary_unary(
+        '/wallets.Wallets/StartMonitoringBatch',
+        request_serializer=wallets__pb2.MonitoringBatchRequest.SerializeToString,
+        response_deserializer=wallets__pb2.MonitoringBatchResponse.FromString,
+        )
+    self.StopMonitoringBatch = channel.unary_unary(
+        '/wallets.Wallets/StopMonitoringBatch',
+        request_serializer=wallets__pb2.MonitoringBatchRequest.SerializeToString,
+        response_deserializer=wallets__pb2.MonitoringBatchResponse.FromString,
+        )
     self.CheckBalance = channel.unary_unary(
         '/wallets.Wallets/CheckBalance',
         request_serializer=wallets__pb2.CheckBalanceRequest.SerializeToString,
@@ -54,6 +64,16 @@ class WalletsStub(object):
         request_serializer=wallets__pb2.InputTransactionRequest.SerializeToString,
         response_deserializer=wallets__pb2.InputTransactionResponse.FromString,
         )
+    self.AddInputTransactions = channel.unary_unary(
+        '/wallets.Wallets/AddInputTransactions',
+        request_serializer=wallets__pb2.InputTransactionsBatchRequest.SerializeToString,
+        response_deserializer=wallets__pb2.InputTransactionsBatchResponse.FromString,
+        )
+    self.WatchTransactions = channel.unary_stream(
+        '/wallets.Wallets/WatchTransactions',
+        request_serializer=wallets__pb2.WatchTransactionsRequest.SerializeToString,
+        response_deserializer=wallets__pb2.TransactionEvent.FromString,
+        )
 
 
 class WalletsServicer(object):
@@ -81,6 +101,20 @@ class WalletsServicer(object):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def StartMonitoringBatch(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def StopMonitoringBatch(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
   def CheckBalance(self, request, context):
     # missing associated documentation comment in .proto file
     pass
@@ -116,6 +150,20 @@ class WalletsServicer(object):
     context.set_details('Method not implemented!')
     raise NotImplementedError('Method not implemented!')
 
+  def AddInputTransactions(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
+  def WatchTransactions(self, request, context):
+    # missing associated documentation comment in .proto file
+    pass
+    context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+    context.set_details('Method not implemented!')
+    raise NotImplementedError('Method not implemented!')
+
 
 def add_WalletsServicer_to_server(servicer, server):
   rpc_method_handlers = {
@@ -134,6 +182,16 @@ def add_WalletsServicer_to_server(servicer, server):
           request_deserializer=wallets__pb2.MonitoringRequest.FromString,
           response_serializer=wallets__pb2.MonitoringResponse.SerializeToString,
       ),
+      'StartMonitoringBatch': grpc.unary_unary_rpc_method_handler(
+          servicer.StartMonitoringBatch,
+          request_deserializer=wallets__pb2.MonitoringBatchRequest.FromString,
+          response_serializer=wallets__pb2.MonitoringBatchResponse.SerializeToString,
+      ),
+      'StopMonitoringBatch': grpc.unary_unary_rpc_method_handler(
+          servicer.StopMonitoringBatch,
+          request_deserializer=wallets__pb2.MonitoringBatchRequest.FromString,
+          response_serializer=wallets__pb2.MonitoringBatchResponse.SerializeToString,
+      ),
       'CheckBalance': grpc.unary_unary_rpc_method_handler(
           servicer.CheckBalance,
           request_deserializer=wallets__pb2.CheckBalanceRequest.FromString,
@@ -159,6 +217,16 @@ def add_WalletsServicer_to_server(servicer, server):
           request_deserializer=wallets__pb2.InputTransactionRequest.FromString,
           response_serializer=wallets__pb2.InputTransactionResponse.SerializeToString,
       ),
+      'AddInputTransactions': grpc.unary_unary_rpc_method_handler(
+          servicer.AddInputTransactions,
+          request_deserializer=wallets__pb2.InputTransactionsBatchRequest.FromString,
+          response_serializer=wallets__pb2.InputTransactionsBatchResponse.SerializeToString,
+      ),
+      'WatchTransactions': grpc.unary_stream_rpc_method_handler(
+          servicer.WatchTransactions,
+          request_deserializer=wallets__pb2.WatchTransactionsRequest.FromString,
+          response_serializer=wallets__pb2.TransactionEvent.SerializeToString,
+      ),
   }
   generic_handler = grpc.method_handlers_generic_handler(
       'wallets.Wallets', rpc_method_handlers)
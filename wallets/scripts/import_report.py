@@ -0,0 +1,67 @@
+"""
+Script to find slow imports.
+Imports modules in a fresh interpreter with `-X importtime` and prints
+the slowest ones by cumulative and by own time.
+
+Usage: python -m wallets.scripts.import_report [modules...] [--top N]
+"""
+import sys
+import typing
+import argparse
+import subprocess
+
+DEFAULT_MODULES = ['wallets', 'wallets.server']
+
+
+class ImportTime(typing.NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure(modules: typing.List[str]) -> typing.List[ImportTime]:
+    code = '; '.join(f'import {module}' for module in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if result.returncode:
+        print(result.stderr.splitlines()[-1], file=sys.stderr)
+    return parse(result.stderr)
+
+
+def parse(output: str) -> typing.List[ImportTime]:
+    times = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():  # header
+            continue
+        times.append(ImportTime(
+            module.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def report(times: typing.List[ImportTime], top: int = 20) -> str:
+    lines = []
+    for title, key in (('cumulative', lambda t: t.cumulative_us),
+                       ('self', lambda t: t.self_us)):
+        lines.append(f'Slowest imports by {title} time:')
+        for item in sorted(times, key=key, reverse=True)[:top]:
+            lines.append(f'{key(item) / 1000:10.1f} ms  {item.module}')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Import time report')
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--top', type=int, default=20)
+    options = parser.parse_args(args)
+    print(report(measure(options.modules), options.top))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,36 @@
 import os
 import sys
 import json
+import time
+import typing
+import signal
 import asyncio
+import argparse
+import threading
 import consul.aio
 sys.path.extend(["../", "./", "../rpc", "./rpc"])
 
 from grpclib.server import Server
-from wallets import app, logger
+from wallets import app, logger, objects, MyManager
 from wallets.gateway.server import WalletsService
+from wallets.gateway.options import propagate_deadlines
 from wallets.tasks import run_monitoring
+from wallets.common.registry import get_wallet_registry
 from wallets.monitoring.common import __TRANSACTIONS_TASKS__
+from wallets.monitoring.common import set_manager
+from wallets.monitoring.common import BaseMonitorClass
+from wallets.shared.database import create_database
+from wallets.shared.database import pool_setting
+from wallets.shared.database import to_bool
+from wallets.shared.logging import stop_listener
+from wallets.shared.notify import get_listener
+from wallets.shared.templates import load_templates
+from wallets.shared.alerts import flush_alerts
+
+API_ROLE = 'api'
+WORKER_ROLE = 'worker'
+BOTH_ROLE = 'both'
+ROLES = (API_ROLE, WORKER_ROLE, BOTH_ROLE)
 
 
 async def watch_config():
@@ -35,6 +56,7 @@ async def watch_config():
 
 
 def end_gracefully_tasks(loop):
+    loop.run_until_complete(flush_alerts())
     to_cancel = asyncio.all_tasks(loop)
 
     for task in to_cancel:
@@ -54,26 +76,215 @@ def end_gracefully_tasks(loop):
             })
 
 
-def serve():
+def start_monitoring(loop):
+    listener = get_listener()
+    if listener is not None:
+        for t in __TRANSACTIONS_TASKS__:
+            if t.channel:
+                listener.add_channel(t.channel)
+        listener.start()
+    get_wallet_registry(BaseMonitorClass.manager).spawn()
+    for t in __TRANSACTIONS_TASKS__:
+        loop.create_task(run_monitoring(t, listener))
+
+
+class MonitoringThread(threading.Thread):
+    """
+    Runs all monitoring tasks on their own event loop, so slow monitor
+    cycles can't delay RPC handling on the main loop.
+    """
+
+    def __init__(self):
+        super().__init__(name='monitoring', daemon=True)
+        self.loop = asyncio.new_event_loop()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        start_monitoring(self.loop)
+        self.loop.run_forever()
+        end_gracefully_tasks(self.loop)
+        self.loop.close()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.join()
+
+
+def isolate_monitoring_database():
+    """Give monitors a connections pool of their own."""
+    database = create_database(
+        pool_name='worker',
+        max_size=pool_setting('WORKER_POOL_MAX_SIZE'),
+    )
+    set_manager(MyManager(database))
+
+
+def serve(role: str = BOTH_ROLE, worker_thread: bool = False,
+          reuse_port: bool = False):
     addr, port = app.config['ADDRESS'], app.config['PORT']
     loop = asyncio.get_event_loop()
     loop.set_exception_handler(None)
-    for t in __TRANSACTIONS_TASKS__:
-        loop.create_task(run_monitoring(t))
-    server = Server([WalletsService()], loop=loop)
-    loop.run_until_complete(server.start(addr, port))
-    logger.info(f"starting wallets server {addr}:{port}")
+    loop.add_signal_handler(signal.SIGTERM, loop.stop)
+
+    monitoring_thread = None
+    if role == BOTH_ROLE:
+        isolate_monitoring_database()
+    if role in (WORKER_ROLE, BOTH_ROLE):
+        if role == BOTH_ROLE and worker_thread:
+            monitoring_thread = MonitoringThread()
+            monitoring_thread.start()
+        else:
+            start_monitoring(loop)
+
+    server = None
+    if role in (API_ROLE, BOTH_ROLE):
+        get_wallet_registry(objects).spawn()
+        server = Server([WalletsService()], loop=loop)
+        propagate_deadlines(server)
+        loop.run_until_complete(
+            server.start(addr, port, reuse_port=reuse_port or None))
+        logger.info(f"starting wallets server {addr}:{port}")
+    logger.info(f"wallets service role: {role}, pid: {os.getpid()}")
 
     try:
         loop.run_forever()
     except KeyboardInterrupt:
         logger.info('Got signal SIGINT, "shutting down"')
 
+    if monitoring_thread is not None:
+        monitoring_thread.stop()
     end_gracefully_tasks(loop)
-    server.close()
-    loop.run_until_complete(server.wait_closed())
+    if server is not None:
+        server.close()
+        loop.run_until_complete(server.wait_closed())
     loop.close()
 
 
+def run_worker(index: int, role: str, worker_thread: bool):
+    """
+    Entry point of forked worker process. Only the first worker runs
+    monitoring, the others serve RPC only.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # supervisor sends SIGTERM
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    worker_role = role if index == 0 else API_ROLE
+    serve(role=worker_role, worker_thread=worker_thread, reuse_port=True)
+
+
+def serve_workers(
+        workers: int,
+        role: str = BOTH_ROLE,
+        worker_thread: bool = False,
+        restart_delay: float = app.config.get('WORKER_RESTART_DELAY', 1),
+        max_restarts: int = app.config.get('WORKER_MAX_RESTARTS', 5),
+        min_uptime: float = 60,
+) -> int:
+    """
+    Fork `workers` processes which listen on the same port with
+    SO_REUSEPORT. Each one has its own event loop and db pool.
+    The parent process only supervises them: it restarts workers which
+    died unexpectedly and forwards SIGINT/SIGTERM to stop all of them.
+    Workers which die sooner than `min_uptime` are restarted with doubling
+    delay, after `max_restarts` such crashes in a row they are given up.
+    Giving up the monitoring worker stops all of them, so the orchestrator
+    restarts the service instead of it serving RPC without monitoring.
+    :return: exit status, 1 if the monitoring worker was given up
+    """
+    children: typing.Dict[int, int] = {}
+    started: typing.Dict[int, float] = {}
+    crashes: typing.Dict[int, int] = {}
+    stopping = False
+    code = 0
+
+    def spawn(index: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(index, role, worker_thread)
+            except Exception:
+                logger.exception(f'wallets worker {index} failed')
+                code = 1
+            finally:
+                stop_listener()
+                os._exit(code)
+        children[pid] = index
+        started[index] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    for index in range(workers):
+        spawn(index)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    logger.info(f"started {workers} wallets workers: {list(children)}")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if index is None or stopping:
+            continue
+        if time.monotonic() - started[index] < min_uptime:
+            crashes[index] = crashes.get(index, 0) + 1
+        else:
+            crashes[index] = 0
+        if crashes[index] > max_restarts:
+            logger.error(f"wallets worker {index} (pid {pid}) crashed "
+                         f"{crashes[index]} times in a row, giving up")
+            if index == 0 and role != API_ROLE:
+                logger.error("monitoring worker is given up, "
+                             "stopping all wallets workers")
+                code = 1
+                stop(None, None)
+            continue
+        delay = restart_delay * 2 ** (crashes[index] - 1) \
+            if crashes[index] else 0
+        logger.error(f"wallets worker {index} (pid {pid}) exited "
+                     f"with status {status}, restarting in {delay}s")
+        time.sleep(min(delay, 60))
+        if not stopping:
+            spawn(index)
+    logger.info("all wallets workers stopped")
+    return code
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description='Wallets service')
+    parser.add_argument(
+        '--role',
+        choices=ROLES,
+        default=os.getenv('WALLETS_ROLE', app.config.get('ROLE', BOTH_ROLE)),
+        help='api - only gRPC server, worker - only monitoring tasks, '
+             'both - server and monitoring with separate db pools',
+    )
+    parser.add_argument(
+        '--worker-thread',
+        action='store_true',
+        default=to_bool(os.getenv(
+            'MONITORING_THREAD', app.config.get('MONITORING_THREAD', False))),
+        help='in "both" role run monitoring on a dedicated thread and loop',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=int(os.getenv('WORKERS', app.config.get('WORKERS', 1))),
+        help='number of server processes sharing the port (SO_REUSEPORT)',
+    )
+    return parser.parse_args(args)
+
+
 if __name__ == '__main__':
-    serve()
+    options = parse_args()
+    load_templates()  # compiled once, inherited by forked workers
+    if options.workers > 1 and options.role != WORKER_ROLE:
+        sys.exit(serve_workers(
+            options.workers, options.role, options.worker_thread))
+    else:
+        serve(role=options.role, worker_thread=options.worker_thread)
@@ -3,7 +3,7 @@ import typing
 from ruamel import yaml
 
 
-yaml = yaml.YAML(typ='unsafe')
+yaml = yaml.YAML(typ='safe')
 CONFIG_FILE_NAME = 'config.yaml'
 LOCAL_CONFIG_FILE_NAME = 'local_config.yaml'
 CURRENT_PATH = os.path.dirname(os.path.abspath(__file__))
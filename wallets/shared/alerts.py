@@ -0,0 +1,243 @@
+"""
+Background delivery of email alerts.
+
+RPC methods and monitors only `submit` alerts, a task per event loop sends
+them: alerts collected during ALERT_DIGEST_DELAY go out as one digest email,
+emails are sent not more often than ALERT_MIN_INTERVAL and failed ones are
+retried. Alerts with the same key are suppressed for ALERT_SUPPRESS_WINDOW
+seconds after being queued. Templates are rendered by the sender task too.
+Queued alerts are flushed on shutdown, see `flush_alerts`.
+"""
+import math
+import typing
+import asyncio
+import weakref
+
+from wallets.settings.config import conf
+from wallets.shared.logging import get_logger
+from wallets.shared.metrics import metrics
+from wallets.shared.templates import render_template
+
+logger = get_logger('alerts')
+
+
+class Alert(typing.NamedTuple):
+    key: typing.Hashable  # equal keys are deduplicated, None is never
+    subject: str
+    template: str
+    context: typing.Optional[dict] = None
+
+
+class AlertDispatcher:
+    """
+    Alerts queue with background sender bound to one event loop.
+    :param sender: coroutine function (html, subject, session)
+    :param renderer: coroutine function (template, **context) -> html
+    """
+
+    def __init__(
+            self,
+            sender: typing.Callable[..., typing.Awaitable],
+            renderer: typing.Callable[..., typing.Awaitable] = render_template,
+            suppress_window: float = conf.get('ALERT_SUPPRESS_WINDOW', 3600),
+            digest_delay: float = conf.get('ALERT_DIGEST_DELAY', 5),
+            digest_size: int = conf.get('ALERT_DIGEST_MAX_SIZE', 20),
+            min_interval: float = conf.get('ALERT_MIN_INTERVAL', 10),
+            max_attempts: int = conf.get('ALERT_MAX_ATTEMPTS', 5),
+            queue_size: int = conf.get('ALERT_QUEUE_SIZE', 1000),
+            retry_delay: float = 1,
+    ):
+        self.sender = sender
+        self.renderer = renderer
+        self.suppress_window = suppress_window
+        self.digest_delay = digest_delay
+        self.digest_size = digest_size
+        self.min_interval = min_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.task: typing.Optional[asyncio.Task] = None
+        self.session = None
+        self.batch: typing.List[Alert] = []  # taken from queue, not sent
+        # in order of queueing, expired keys are pruned from the start
+        self._queued_at: typing.Dict[typing.Hashable, float] = {}
+        self._last_sent = -math.inf
+
+    @staticmethod
+    def _now() -> float:
+        return asyncio.get_event_loop().time()
+
+    def is_suppressed(self, key: typing.Hashable) -> bool:
+        queued_at = self._queued_at.get(key)
+        return queued_at is not None and \
+            self._now() - queued_at < self.suppress_window
+
+    def _prune(self):
+        expired = self._now() - self.suppress_window
+        for key, queued_at in list(self._queued_at.items()):
+            if queued_at > expired:
+                break
+            del self._queued_at[key]
+
+    def submit(self, alert: Alert) -> bool:
+        """Queue alert without waiting. False if it is suppressed or
+        the queue is full."""
+        if self.is_suppressed(alert.key):
+            metrics.inc('alerts.suppressed')
+            return False
+        try:
+            self.queue.put_nowait(alert)
+        except asyncio.QueueFull:
+            metrics.inc('alerts.dropped')
+            logger.error('alerts queue is full, dropped %s', alert.key)
+            return False
+        if alert.key is not None:
+            self._prune()
+            self._queued_at.pop(alert.key, None)
+            self._queued_at[alert.key] = self._now()
+        metrics.inc('alerts.queued')
+        if self.task is None or self.task.done():
+            self.task = asyncio.ensure_future(self.run())
+        return True
+
+    async def run(self):
+        try:
+            while True:
+                await self._collect()
+                await self._wait_rate_limit()
+                await self._deliver(self.batch)
+                self.batch = []
+        finally:
+            await self._close_session()
+
+    async def _close_session(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _collect(self):
+        """Fill `batch`, so alerts are not lost if the task is cancelled."""
+        self.batch.append(await self.queue.get())
+        deadline = self._now() + self.digest_delay
+        while len(self.batch) < self.digest_size:
+            timeout = deadline - self._now()
+            if timeout <= 0 or not await self._get(timeout):
+                break
+
+    async def _get(self, timeout: float) -> bool:
+        """
+        Move next alert to `batch`. Unlike wait_for, cancellation is not
+        swallowed when an alert arrives at the same time.
+        """
+        getter = asyncio.ensure_future(self.queue.get())
+        try:
+            await asyncio.wait({getter}, timeout=timeout)
+        except asyncio.CancelledError:
+            if getter.done():
+                self.batch.append(getter.result())
+            else:
+                getter.cancel()
+            raise
+        if not getter.done():
+            getter.cancel()
+            return False
+        self.batch.append(getter.result())
+        return True
+
+    async def flush(self, timeout: float = 10):
+        """Stop the sender task and send all queued alerts right away."""
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        batch, self.batch = self.batch, []
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        if not batch:
+            return
+        try:
+            await asyncio.wait_for(self._deliver_all(batch), timeout)
+        except asyncio.TimeoutError:
+            logger.error('alerts were not flushed in %s seconds', timeout)
+        finally:
+            await self._close_session()
+
+    async def _deliver_all(self, alerts: typing.List[Alert]):
+        for start in range(0, len(alerts), self.digest_size):
+            await self._deliver(alerts[start:start + self.digest_size])
+
+    async def _wait_rate_limit(self):
+        delay = self._last_sent + self.min_interval - self._now()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _get_session(self):
+        if self.session is None:
+            from aiohttp import ClientSession
+            self.session = ClientSession()
+        return self.session
+
+    async def digest(
+            self, batch: typing.List[Alert]
+    ) -> typing.Tuple[str, str]:
+        parts = [
+            await self.renderer(alert.template, **(alert.context or {}))
+            for alert in batch
+        ]
+        subject = batch[0].subject
+        if len(batch) > 1:
+            subject = f'{subject} (+{len(batch) - 1} more alerts)'
+        return '<hr/>'.join(parts), subject
+
+    async def _deliver(self, batch: typing.List[Alert]):
+        try:
+            html, subject = await self.digest(batch)
+        except Exception:
+            logger.exception('alerts rendering failed')
+            return self._fail(batch)
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await self.sender(html, subject, session=self._get_session())
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning('sending alerts failed (attempt %s): %s',
+                               attempt, exc)
+                if attempt < self.max_attempts:
+                    await asyncio.sleep(
+                        min(self.retry_delay * 2 ** (attempt - 1), 60))
+                continue
+            self._last_sent = self._now()
+            metrics.inc('alerts.sent', len(batch))
+            return
+        self._fail(batch)
+
+    def _fail(self, batch: typing.List[Alert]):
+        metrics.inc('alerts.failed', len(batch))
+        logger.error('alerts were not sent: %s',
+                     {'keys': [alert.key for alert in batch]})
+        for alert in batch:  # let the next call raise them again
+            self._queued_at.pop(alert.key, None)
+
+
+_dispatchers = weakref.WeakKeyDictionary()
+
+
+async def flush_alerts(timeout: float = 10):
+    """Send alerts queued in the current event loop, before shutdown."""
+    dispatcher = _dispatchers.get(asyncio.get_event_loop())
+    if dispatcher is not None:
+        await dispatcher.flush(timeout)
+
+
+def get_alert_dispatcher() -> AlertDispatcher:
+    """Dispatcher of the current event loop (api and monitoring loops
+    may differ, see server roles)."""
+    loop = asyncio.get_event_loop()
+    dispatcher = _dispatchers.get(loop)
+    if dispatcher is None:
+        from wallets.utils import send_message
+        dispatcher = AlertDispatcher(send_message)
+        _dispatchers[loop] = dispatcher
+    return dispatcher
@@ -0,0 +1,121 @@
+import os
+import time
+import typing
+import asyncio
+
+import peewee
+import peewee_async
+
+from wallets.settings.config import conf
+from wallets.shared.metrics import metrics
+
+
+def to_bool(value) -> bool:
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+
+def pool_setting(key: str, cast: typing.Callable = int):
+    """
+    Read pool option from the environment (PG<KEY>) or from config
+    (DB_<KEY>). Environment has priority, like for the other PG* options.
+    """
+    value = os.getenv(f'PG{key}', conf.get(f'DB_{key}'))
+    return cast(value) if value is not None else None
+
+
+class MonitoredPoolConnection(peewee_async.AsyncPostgresqlConnection):
+    """
+    aiopg pool wrapper which bounds the time spent waiting for a free
+    connection and reports the waiting time to metrics.
+    """
+
+    def __init__(self, *, acquire_timeout: float = None,
+                 pool_name: str = 'db', **kwargs):
+        super().__init__(**kwargs)
+        self.acquire_timeout = acquire_timeout
+        self.pool_name = pool_name
+
+    async def acquire(self):
+        started = time.monotonic()
+        try:
+            conn = await asyncio.wait_for(self.pool.acquire(),
+                                          self.acquire_timeout)
+        except asyncio.TimeoutError:
+            metrics.inc(f'{self.pool_name}.acquire_timeouts')
+            raise
+        finally:
+            metrics.observe(f'{self.pool_name}.acquire_wait',
+                            time.monotonic() - started)
+        metrics.set(f'{self.pool_name}.size', self.pool.size)
+        metrics.set(f'{self.pool_name}.free', self.pool.freesize)
+        return conn
+
+
+class PooledPostgresqlDatabase(peewee_async.PooledPostgresqlDatabase):
+    """
+    Postgres database with async connections pool.
+    :param pool_recycle: seconds after which idle connection is reopened
+    :param acquire_timeout: seconds to wait for a free connection
+    :param pool_name: prefix for pool metrics
+    """
+
+    def init(self, database, **kwargs):
+        self.pool_recycle = kwargs.pop('pool_recycle', -1)
+        self.acquire_timeout = kwargs.pop('acquire_timeout', None)
+        self.pool_name = kwargs.pop('pool_name', 'db')
+        super().init(database, **kwargs)
+        self.init_async(conn_cls=MonitoredPoolConnection)
+
+    @property
+    def connect_params_async(self):
+        kwargs = super().connect_params_async
+        kwargs.update({
+            'pool_recycle': self.pool_recycle,
+            'acquire_timeout': self.acquire_timeout,
+            'pool_name': self.pool_name,
+        })
+        return kwargs
+
+    def pool_stats(self) -> typing.Dict[str, typing.Any]:
+        pool = getattr(self._async_conn, 'pool', None)
+        return {
+            'min': self.min_connections,
+            'max': self.max_connections,
+            'size': pool.size if pool else 0,
+            'free': pool.freesize if pool else 0,
+        }
+
+
+def connection_params() -> typing.Dict[str, typing.Any]:
+    """Postgres connection options from PG* environment."""
+    return dict(
+        database=os.getenv('PGDATABASE', 'wallets'),
+        host=os.getenv('PGHOST', 'localhost'),
+        user=os.getenv('PGUSER', 'postgres'),
+        password=os.getenv('PGPASSWORD'),
+    )
+
+
+def create_database(
+        pool_name: str = 'db',
+        max_size: int = None,
+) -> peewee.PostgresqlDatabase:
+    """
+    Build service database from PG* environment and DB_POOL* config.
+    Without DB_POOL_ENABLED single connection database is returned.
+    """
+    params = connection_params()
+    database_name = params.pop('database')
+
+    if not pool_setting('POOL_ENABLED', cast=to_bool):
+        return peewee_async.PostgresqlDatabase(database_name, **params)
+
+    return PooledPostgresqlDatabase(
+        database_name,
+        min_connections=pool_setting('POOL_MIN_SIZE') or 1,
+        max_connections=max_size or pool_setting('POOL_MAX_SIZE') or 10,
+        pool_recycle=pool_setting('POOL_RECYCLE', cast=float) or -1,
+        acquire_timeout=pool_setting('POOL_ACQUIRE_TIMEOUT', cast=float),
+        pool_name=pool_name,
+        **params
+    )
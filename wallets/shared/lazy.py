@@ -0,0 +1,43 @@
+import typing
+import threading
+
+
+class LazyObject:
+    """
+    Proxy which creates the wrapped object by `factory` on first attribute
+    access. Attribute assignment and deletion go to the wrapped object too,
+    so module level instances can still be patched in tests.
+    """
+
+    def __init__(self, factory: typing.Callable[[], typing.Any]):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_wrapped', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _setup(self):
+        wrapped = self._wrapped
+        if wrapped is None:
+            with self._lock:
+                wrapped = self._wrapped
+                if wrapped is None:
+                    wrapped = self._factory()
+                    object.__setattr__(self, '_wrapped', wrapped)
+        return wrapped
+
+    @property
+    def is_ready(self) -> bool:
+        return self._wrapped is not None
+
+    def __getattr__(self, name):
+        return getattr(self._setup(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._setup(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._setup(), name)
+
+    def __repr__(self):
+        if self._wrapped is None:
+            return f'<LazyObject: {self._factory.__name__}>'
+        return repr(self._wrapped)
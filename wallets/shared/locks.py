@@ -0,0 +1,181 @@
+"""
+Locks which keep replicas from processing the same rows (wallets) at
+once. LOCK_BACKEND chooses the implementation:
+
+- redis: Redlock on REDIS_HOST (aioredlock), works across replicas;
+- postgres: pg_try_advisory_xact_lock on the database of the manager,
+  held till the end of the db transaction it is taken in, so monitors
+  don't need Redis at all;
+- local: in-process locks, for deployments with one replica.
+
+Locks are never waited for: `acquire` yields None if the key is held
+elsewhere and the caller skips the row till the next run.
+
+Redis locks are leases of LOCK_LEASE seconds, renewed while the holder
+works. A lease can still be lost (renewal failed, the loop was stuck),
+so writes under it go in a `fenced` transaction: it's rolled back if the
+lease was lost or a holder with a newer fencing token already committed.
+The transaction commits before the lease is released.
+"""
+import os
+import abc
+import typing
+import asyncio
+import contextlib
+
+import peewee
+
+from wallets import MyManager
+from wallets.settings.config import conf
+from wallets.common.models import LockFence
+from wallets.shared.logging import get_logger
+from wallets.shared.metrics import metrics
+
+logger = get_logger('locks')
+
+LOCK_BACKEND = os.environ.get('LOCK_BACKEND',
+                              conf.get('LOCK_BACKEND', 'redis'))
+REDIS_HOST = os.environ.get('REDIS_HOST', conf.get('REDIS_HOST'))
+REDIS_PASSWORD = os.environ.get('REDIS_PASSWORD', '')
+
+
+class StaleLease(Exception):
+    """Lease was lost or a newer holder of the key committed."""
+
+
+class Lease:
+    """
+    Held lock. `token` grows with every acquisition of the key, it's None
+    for backends whose locks can't expire under the holder.
+    """
+
+    __slots__ = ('key', 'token', 'lost')
+
+    def __init__(self, key: str, token: typing.Optional[int] = None):
+        self.key = key
+        self.token = token
+        self.lost = False
+
+
+class LockBackend(abc.ABC):
+
+    @abc.abstractmethod
+    def acquire(
+            self, key: str, manager: MyManager
+    ) -> typing.AsyncContextManager[typing.Optional[Lease]]:
+        """Hold the lock of `key` in the block, if it's free."""
+        raise NotImplementedError
+
+
+class RedisLockBackend(LockBackend):
+
+    def __init__(self, host: str = REDIS_HOST,
+                 password: str = REDIS_PASSWORD,
+                 lease_time: float = conf.get('LOCK_LEASE', 30)):
+        from aioredlock import Aioredlock
+        self.lease_time = lease_time
+        self.redlock = Aioredlock(
+            [dict(host=host, password=password)], lock_timeout=lease_time)
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, key: str, manager: MyManager):
+        from aioredlock import LockError
+        lock = None
+        if not await self.redlock.is_locked(key):
+            try:
+                lock = await self.redlock.lock(key)
+            except LockError as exc:  # taken meanwhile or redis is down
+                logger.warning('lock %s is not acquired: %s', key, exc)
+        if lock is None:
+            yield None
+            return
+        renewal = None
+        try:
+            lease = Lease(key, await manager.scalar(
+                LockFence.next_token().bind(manager.database)))
+            renewal = asyncio.ensure_future(self._renew(lock, lease))
+            yield lease
+        finally:
+            if renewal is not None:
+                renewal.cancel()
+                await asyncio.gather(renewal, return_exceptions=True)
+            try:
+                await self.redlock.unlock(lock)
+            except LockError as exc:  # expired already
+                logger.warning('lock %s is not released: %s', key, exc)
+
+    async def _renew(self, lock, lease: Lease):
+        from aioredlock import LockError
+        while True:
+            await asyncio.sleep(self.lease_time / 3)
+            try:
+                await self.redlock.extend(lock)
+            except LockError as exc:
+                lease.lost = True
+                metrics.inc('locks.lost')
+                logger.warning('lease of %s is lost: %s', lease.key, exc)
+                return
+
+
+class PostgresLockBackend(LockBackend):
+    """Holds the lock in a db transaction of the manager."""
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, key: str, manager: MyManager):
+        query = peewee.RawQuery(
+            'SELECT pg_try_advisory_xact_lock(hashtext(%s))', (key,)
+        ).bind(manager.database)
+        # released on commit, together with writes made under it
+        async with manager.atomic():
+            yield Lease(key) if await manager.scalar(query) else None
+
+
+class LocalLockBackend(LockBackend):
+
+    def __init__(self):
+        self.held: typing.Set[str] = set()
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, key: str, manager: MyManager = None):
+        if key in self.held:
+            yield None
+            return
+        self.held.add(key)
+        try:
+            yield Lease(key)
+        finally:
+            self.held.discard(key)
+
+
+@contextlib.asynccontextmanager
+async def fenced(lease: Lease, manager: MyManager):
+    """
+    Transaction for writes under the lease, rolled back with StaleLease if
+    the lease is lost or a holder with a newer token committed. The token
+    is stored right before the commit, its row stays locked only till then.
+    Has to be entered outside of other transactions of the manager (but
+    the one of PostgresLockBackend), or it's just a savepoint.
+    """
+    async with manager.atomic():
+        yield
+        if lease.lost:
+            raise StaleLease(f'lease of {lease.key} is lost')
+        if lease.token is not None and not await manager.returning(
+                LockFence.advance(lease.key, lease.token)):
+            raise StaleLease(f'{lease.key} has a newer holder')
+
+
+BACKENDS: typing.Dict[str, typing.Type[LockBackend]] = {
+    'redis': RedisLockBackend,
+    'postgres': PostgresLockBackend,
+    'local': LocalLockBackend,
+}
+
+
+def create_lock_backend(name: str = LOCK_BACKEND) -> LockBackend:
+    try:
+        backend_cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'Unknown LOCK_BACKEND {name!r}, '
+                         f'expected one of {", ".join(BACKENDS)}') from None
+    return backend_cls()
@@ -1,25 +1,115 @@
 import os
 import sys
+import copy
+import json
+import queue
+import atexit
 import typing
+import itertools
 from wallets.settings.config import conf
 import logging
 import logging.config
+import logging.handlers
 
 
 logger: typing.Optional[logging.Logger] = None
+listener: typing.Optional[logging.handlers.QueueListener] = None
+
+LOGGER_NAME = f'wallets[{conf.get("ENV")}]'
+# handlers are attached to this logger and called from listener thread only
+SINK_LOGGER_NAME = f'{LOGGER_NAME}.sink'
+LOG_FORMAT = os.environ.get('LOG_FORMAT', conf.get('LOG_FORMAT', 'text'))
+LOGGING_LEVEL = os.environ.get(
+    'LOGGING_LEVEL', conf.get('LOGGING_LEVEL', 'DEBUG'))
+
+
+class JsonFormatter(logging.Formatter):
+    """One json object per record. Dict passed as log argument is put to
+    `context`, as it is not a part of the message."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'level': record.levelname,
+            'time': self.formatTime(record),
+            'logger': record.name,
+            'module': record.module,
+            'process': record.process,
+            'thread': record.thread,
+            'message': record.getMessage(),
+        }
+        context = getattr(record, 'context', None)
+        if context is None and isinstance(record.args, dict):
+            context = record.args
+        if context is not None:
+            data['context'] = context
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exc_info'] = record.exc_text
+        return json.dumps(data, default=str)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    Handlers i/o happens in the listener thread, not in the event loop.
+    The message is merged here, while its arguments (requests, dicts) are
+    unchanged, traceback is rendered to text so frames are not kept alive.
+    Dict argument is kept as `context` for JsonFormatter.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.context = record.args if isinstance(record.args, dict) \
+            else None
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Pass only every n-th record below WARNING of the configured loggers.
+    :param rates: logger name (relative to service logger) -> n
+    """
+
+    def __init__(self, rates: typing.Dict[str, int]):
+        super().__init__()
+        self.counters = {
+            f'{LOGGER_NAME}.{name}' if name else LOGGER_NAME:
+                (int(every), itertools.count())
+            for name, every in rates.items() if int(every) > 1
+        }
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        sampling = self.counters.get(record.name)
+        if sampling is None or record.levelno >= logging.WARNING:
+            return True
+        every, counter = sampling
+        return next(counter) % every == 0
+
+
+text_formatters = {
+    'verbose': {
+        'format': '[%(levelname)s] [%(asctime)s] [%(module)s] [%(process)d] [%(thread)d] [%(message)s]'
+    },
+    'simple': {
+        'format': '[%(levelname)s] [%(asctime)s] [%(message)s]'
+    },
+}
+json_formatters = {
+    'verbose': {'()': JsonFormatter},
+    'simple': {'()': JsonFormatter},
+}
 
 LOGFILE = os.path.join(f'{os.environ.get("LOGFILE", "")}', f'wallets[{conf.get("ENV")}].log')
 dictLogConfig = {
     'version': 1,
     'disable_existing_loggers': True,
-    'formatters': {
-        'verbose': {
-            'format': '[%(levelname)s] [%(asctime)s] [%(module)s] [%(process)d] [%(thread)d] [%(message)s]'
-        },
-        'simple': {
-            'format': '[%(levelname)s] [%(asctime)s] [%(message)s]'
-        }
-    },
+    'formatters': json_formatters if LOG_FORMAT == 'json' else text_formatters,
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
@@ -33,28 +123,70 @@ dictLogConfig = {
             'formatter': 'verbose',
             'maxBytes': 1024 * 1024 * 5,
             'backupCount': 5,
+            'delay': True,
         }
     },
     'loggers': {
-        f'wallets[{conf.get("ENV")}]': {
+        LOGGER_NAME: {
+            'level': LOGGING_LEVEL,
+            'propagate': False,
+        },
+        SINK_LOGGER_NAME: {
             'handlers': ['console', 'file_handler'],
             'level': 'DEBUG',
+            'propagate': False,
         },
     }
 }
 
 
+def start_listener() -> logging.handlers.QueueListener:
+    """
+    Start thread which passes queued records to the handlers. Listener
+    thread doesn't survive fork, so forked server workers start their own.
+    """
+    global listener
+    log_queue = queue.SimpleQueue()
+    for handler in logger.handlers:
+        if isinstance(handler, LazyQueueHandler):
+            handler.queue = log_queue
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        *logging.getLogger(SINK_LOGGER_NAME).handlers,
+        respect_handler_level=True,
+    )
+    listener.start()
+    return listener
+
+
+def stop_listener():
+    """Flush queued records."""
+    if listener is not None and listener._thread is not None:
+        listener.stop()
+
+
 def init_logger():
     """
         init_logger connects to cloud logging if it's avaliable
     """
     global logger
     logging.config.dictConfig(dictLogConfig)
-    logger = logging.getLogger(f'wallets[{conf.get("ENV")}]')
+    logger = logging.getLogger(LOGGER_NAME)
+    queue_handler = LazyQueueHandler(None)
+    queue_handler.addFilter(SamplingFilter(conf.get('LOG_SAMPLING') or {}))
+    logger.addHandler(queue_handler)
+    start_listener()
     return logger
 
 
+def get_logger(name: str) -> logging.Logger:
+    """Child of service logger, e.g. to configure LOG_SAMPLING for it."""
+    return logger.getChild(name)
+
+
 init_logger()
+atexit.register(stop_listener)
+os.register_at_fork(after_in_child=start_listener)
 
 
 def handle_exception(exc_type, exc_value, exc_traceback):
@@ -0,0 +1,60 @@
+import typing
+import threading
+import collections
+
+
+class Metrics:
+    """
+    Process wide registry of counters, gauges and timings.
+    Values are kept in memory and can be read with `snapshot`
+    (for logs, health checks or an exporter).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: typing.Dict[str, float] = collections.defaultdict(int)
+        self._gauges: typing.Dict[str, float] = {}
+        # name -> [count, total seconds, max seconds]
+        self._timings: typing.Dict[str, list] = collections.defaultdict(
+            lambda: [0, 0.0, 0.0]
+        )
+
+    def inc(self, name: str, value: float = 1) -> typing.NoReturn:
+        with self._lock:
+            self._counters[name] += value
+
+    def set(self, name: str, value: float) -> typing.NoReturn:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> typing.NoReturn:
+        with self._lock:
+            timing = self._timings[name]
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def snapshot(self) -> typing.Dict[str, typing.Any]:
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'timings': {
+                    name: {
+                        'count': count,
+                        'total': total,
+                        'max': max_,
+                        'avg': total / count if count else 0.0,
+                    }
+                    for name, (count, total, max_) in self._timings.items()
+                },
+            }
+
+    def reset(self) -> typing.NoReturn:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,166 @@
+"""
+Postgres LISTEN/NOTIFY wake-ups for monitoring tasks.
+
+Code which creates work for a delivery task sends NOTIFY in its
+transaction, postgres delivers it to all listening replicas on commit.
+Tasks still rescan their tables every period, so a lost notification
+only delays the work.
+"""
+import typing
+import asyncio
+import weakref
+
+import peewee
+
+from wallets.settings.config import conf
+from wallets.shared.database import connection_params
+from wallets.shared.database import to_bool
+from wallets.shared.logging import get_logger
+from wallets.shared.metrics import metrics
+
+logger = get_logger('notify')
+
+# hashed NEW transactions, for SendToTransactionService
+NEW_TRANSACTIONS = 'wallets_new_transactions'
+# CONFIRMED transactions, for SendToExchangerService
+CONFIRMED_TRANSACTIONS = 'wallets_confirmed_transactions'
+# new rows in transaction_event, for WatchTransactions change feed
+TRANSACTION_EVENTS = 'wallets_transaction_events'
+# changed wallet ids (comma separated, empty - all), for wallet registry
+WALLET_CHANGES = 'wallets_wallet_changes'
+
+NOTIFY_ENABLED = to_bool(conf.get('NOTIFY_ENABLED', True))
+
+
+async def notify(manager, channel: str, payload: str = ''):
+    """Send NOTIFY, it's delivered only if the current transaction commits."""
+    if not NOTIFY_ENABLED:
+        return
+    query = peewee.RawQuery(
+        'SELECT pg_notify(%s, %s)', (channel, payload)
+    ).bind(manager.database)
+    await manager.execute(query)
+
+
+class NotificationListener:
+    """
+    Dedicated connection which LISTENs to channels and sets an event per
+    channel. After reconnect all events are set, as notifications could
+    be lost meanwhile. One listener per event loop is shared by monitors,
+    feeds and registries (see `get_listener`), each channel has one waiter.
+    Handlers get payloads of their channel, None after reconnect.
+    """
+
+    def __init__(self, channels: typing.Iterable[str] = (),
+                 reconnect_delay: float = 5):
+        self.events = {channel: asyncio.Event() for channel in channels}
+        self.handlers: typing.Dict[
+            str, typing.List[typing.Callable[[typing.Optional[str]], None]]
+        ] = {}
+        self.reconnect_delay = reconnect_delay
+        self.conn = None  # set while listening
+        self.task: typing.Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.ensure_future(self.run())
+
+    def add_channel(self, channel: str):
+        """Listen to one more channel, also if already listening."""
+        if channel in self.events:
+            return
+        self.events[channel] = asyncio.Event()
+        if self.conn is not None:
+            asyncio.ensure_future(self._listen_late(self.conn, channel))
+
+    async def _listen_late(self, conn, channel: str):
+        try:
+            await self._listen_to(conn, [channel])
+        except Exception as exc:  # listened to after reconnect
+            logger.error('LISTEN %s failed: %s', channel, exc)
+
+    @staticmethod
+    async def _listen_to(conn, channels: typing.Iterable[str]):
+        async with conn.cursor() as cursor:
+            for channel in channels:
+                await cursor.execute(f'LISTEN "{channel}"')
+
+    def add_handler(
+            self,
+            channel: str,
+            handler: typing.Callable[[typing.Optional[str]], None],
+    ):
+        """Call `handler` with payloads of the channel."""
+        self.handlers.setdefault(channel, []).append(handler)
+        self.add_channel(channel)
+
+    async def connect(self):
+        import aiopg
+        return await aiopg.connect(**connection_params())
+
+    async def run(self) -> typing.NoReturn:
+        while True:
+            try:
+                conn = await self.connect()
+                try:
+                    await self.listen(conn)
+                finally:
+                    self.conn = None
+                    conn.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error('notifications listener failed: %s', exc)
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def listen(self, conn) -> typing.NoReturn:
+        listened = set()
+        while len(listened) < len(self.events):  # added while listening
+            channels = [c for c in self.events if c not in listened]
+            await self._listen_to(conn, channels)
+            listened.update(channels)
+        self.conn = conn
+        self.wake_all()  # pick up what was committed while disconnected
+        while True:
+            message = await conn.notifies.get()
+            metrics.inc(f'notify.{message.channel}')
+            event = self.events.get(message.channel)
+            if event is not None:
+                event.set()
+            for handler in self.handlers.get(message.channel, ()):
+                handler(message.payload)
+
+    def wake_all(self):
+        for event in self.events.values():
+            event.set()
+        for handlers in self.handlers.values():
+            for handler in handlers:
+                handler(None)
+
+    async def wait(self, channel: str, timeout: float) -> bool:
+        """
+        Wait for notification or for timeout (the periodic scan).
+        :return: True if woken by notification
+        """
+        event = self.events[channel]
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        event.clear()
+        return True
+
+
+_listeners = weakref.WeakKeyDictionary()
+
+
+def get_listener() -> typing.Optional[NotificationListener]:
+    """Listener of the current event loop, None if NOTIFY is disabled."""
+    if not NOTIFY_ENABLED:
+        return None
+    loop = asyncio.get_event_loop()
+    listener = _listeners.get(loop)
+    if listener is None:
+        listener = NotificationListener()
+        _listeners[loop] = listener
+    return listener
@@ -0,0 +1,47 @@
+"""
+Jinja environment for emails. Templates from wallets/templates are
+compiled once per process, compiled code is kept in the bytecode cache
+(TEMPLATES_CACHE_DIR, system temp dir by default) for the next start.
+"""
+import os
+import typing
+
+from wallets.settings.config import conf
+from wallets.shared.lazy import LazyObject
+
+TEMPLATES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+TEMPLATES_CACHE_DIR = os.getenv(
+    'TEMPLATES_CACHE_DIR', conf.get('TEMPLATES_CACHE_DIR'))
+
+
+def _create_environment():
+    from jinja2 import Environment
+    from jinja2 import FileSystemLoader
+    from jinja2 import FileSystemBytecodeCache
+    from jinja2 import select_autoescape
+
+    if TEMPLATES_CACHE_DIR:
+        os.makedirs(TEMPLATES_CACHE_DIR, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        bytecode_cache=FileSystemBytecodeCache(TEMPLATES_CACHE_DIR or None),
+        autoescape=select_autoescape(['html']),
+        auto_reload=False,  # templates are deployed with the code
+        enable_async=True,
+    )
+
+
+environment = LazyObject(_create_environment)
+
+
+def load_templates(
+        names: typing.Iterable[str] = (conf.get('ALARM_TEMPLATE'),
+                                       conf.get('MONITORING_TEMPLATE')),
+) -> list:
+    """Compile templates in advance, e.g. before forking workers."""
+    return [environment.get_template(name) for name in names if name]
+
+
+async def render_template(name: str, **context) -> str:
+    return await environment.get_template(name).render_async(**context)
@@ -3,25 +3,28 @@ import traceback
 import asyncio
 from wallets import logger
 from wallets.monitoring.common import BaseMonitorClass
+from wallets.shared.notify import NotificationListener
 
 
 async def run_monitoring(
-        task_class: typing.Type['BaseMonitorClass']
+        task_class: typing.Type['BaseMonitorClass'],
+        listener: typing.Optional[NotificationListener] = None,
 ) -> typing.NoReturn:
     """
     Generating coroutines for tasks that will be running concurrently in
     async event loop
+    :param listener: wakes the task up on its NOTIFY channel
     """
 
     if issubclass(task_class, BaseMonitorClass):
         while True:
-            await asyncio.sleep(task_class.timeout)
+            await task_class.wait(listener)
             try:
-                logger.info(f"{task_class.__name__} task started.")
+                logger.info("%s task started.", task_class.__name__)
                 await task_class.process()
-                logger.info(f'{task_class.__name__} finished')
+                logger.info('%s finished', task_class.__name__)
             except asyncio.CancelledError:
-                logger.info(f"{task_class.__name__} task Cancelled.")
+                logger.info("%s task Cancelled.", task_class.__name__)
                 return
             except Exception as e:
                 logger.error(
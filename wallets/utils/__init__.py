@@ -1,11 +1,13 @@
 import pytz
+import typing
+import contextlib
+import contextvars
 from functools import wraps
 from decimal import Decimal
 from datetime import datetime
 from marshmallow import fields
-from aiohttp import ClientSession
 from google.protobuf import timestamp_pb2
-from wallets import objects
+import wallets
 from wallets.settings.config import conf
 
 
@@ -48,8 +50,11 @@ class StringLowerField(fields.String):
         return super()._deserialize(value, attr, data, **kwargs).lower()
 
 
-async def send_message(html, subject):
-
+async def send_message(html, subject, session=None):
+    """
+    Send email through mailgun.
+    :param session: aiohttp session to reuse, a new one is created otherwise
+    """
     url = f'https://api.mailgun.net/v3/{conf["MAIL_DOMAIN"]}/messages'
     auth = ('api', f'{conf["MAIL_PASSWORD"]}')
     data = {
@@ -58,23 +63,76 @@ async def send_message(html, subject):
         'subject': subject,
         'html': html,
     }
-    async with ClientSession() as session:
-        async with session.post(url, auth=auth, data=data) as resp:
-            response = await resp.json()
-            response.raise_for_status()
+    if session is None:
+        from aiohttp import ClientSession  # heavy, needed only for alarms
+        async with ClientSession() as session:
+            return await send_message(html, subject, session)
+
+    async with session.post(url, auth=auth, data=data) as resp:
+        resp.raise_for_status()
+        return await resp.json()
 
 
 async def get_exchanger_wallet(address: str, slug: str):
-    from wallets.common import models
-    wallet = await objects.get(models.Wallet,
-                               address=address,
-                               currency_slug=slug)
-    return wallet
+    from wallets.common.registry import get_wallet_registry
+    return await get_wallet_registry(wallets.objects).get_by_address(
+        address, slug)
 
 
 def nested_commit_on_success(func):
+    """
+    Run coroutine in transaction of the manager of the class it is called on
+    (monitors and server methods may use different databases).
+    """
     @wraps(func)
     async def _nested_commit_on_success(*args, **kwargs):
-        async with objects.atomic():
+        manager = getattr(args[0], 'manager', None) if args else None
+        if manager is None:
+            manager = wallets.objects
+        async with manager.atomic():
             return await func(*args, **kwargs)
     return _nested_commit_on_success
+
+
+_on_commit: contextvars.ContextVar = contextvars.ContextVar(
+    'on_commit', default=None)
+
+
+def on_commit(callback: typing.Callable[[], typing.Any]):
+    """
+    Call `callback` after the transaction of `atomic` commits, it's dropped
+    on rollback. Called right away outside of `atomic`.
+    """
+    callbacks = _on_commit.get()
+    if callbacks is None:
+        callback()
+    else:
+        callbacks.append(callback)
+
+
+@contextlib.asynccontextmanager
+async def atomic(manager) -> typing.AsyncIterator[None]:
+    """
+    `manager.atomic()` which runs `on_commit` callbacks after commit,
+    callbacks of nested blocks wait for the outer one (and are dropped
+    if the nested block rolls back).
+    """
+    callbacks = _on_commit.get()
+    if callbacks is not None:
+        mark = len(callbacks)
+        try:
+            async with manager.atomic():
+                yield
+        except BaseException:
+            del callbacks[mark:]
+            raise
+        return
+    token = _on_commit.set([])
+    try:
+        async with manager.atomic():
+            yield
+        callbacks = _on_commit.get()
+    finally:
+        _on_commit.reset(token)
+    for callback in callbacks:
+        callback()
@@ -0,0 +1,150 @@
+"""
+Fast protobuf message to dict conversion.
+
+`message_to_dict` gives the same result as
+`MessageToDict(message, preserving_proto_field_name=True)` but does not walk
+message descriptors on every call: a converter is compiled once per message
+type. For proto3 messages fields are read as plain attributes, which is
+several times cheaper than `ListFields` in the python protobuf runtime.
+"""
+import base64
+import typing
+from google.protobuf import json_format
+from google.protobuf.descriptor import Descriptor
+from google.protobuf.descriptor import FieldDescriptor
+
+_CONVERTERS: typing.Dict[str, typing.Callable] = {}
+
+_INT64_TYPES = (
+    FieldDescriptor.CPPTYPE_INT64,
+    FieldDescriptor.CPPTYPE_UINT64,
+)
+
+
+def message_to_dict(message) -> typing.Dict[str, typing.Any]:
+    """Convert protobuf message to dict with original field names."""
+    return get_converter(message.DESCRIPTOR)(message)
+
+
+def get_converter(descriptor: Descriptor) -> typing.Callable:
+    converter = _CONVERTERS.get(descriptor.full_name)
+    if converter is None:
+        converter = _compile_message(descriptor)
+    return converter
+
+
+def _well_known(message) -> typing.Any:
+    # Timestamp, Duration, wrappers... have special json representation
+    return json_format.MessageToDict(message,
+                                     preserving_proto_field_name=True)
+
+
+def _compile_message(descriptor: Descriptor) -> typing.Callable:
+    if descriptor.full_name.startswith('google.protobuf.'):
+        _CONVERTERS[descriptor.full_name] = _well_known
+        return _well_known
+    if descriptor.file.syntax != 'proto3':
+        return _compile_listed(descriptor)
+
+    # proto3 fields have no presence (except messages and oneofs), so
+    # plain attribute reads with truthiness check are enough and much
+    # cheaper than ListFields
+    plain: typing.List[typing.Tuple[str, typing.Callable]] = []
+    present: typing.List[typing.Tuple[str, typing.Callable]] = []
+
+    def convert(message):
+        result = {}
+        for name, field_converter in plain:
+            value = getattr(message, name)
+            if value:
+                result[name] = field_converter(value)
+        for name, field_converter in present:
+            if message.HasField(name):
+                result[name] = field_converter(getattr(message, name))
+        return result
+
+    # register before compiling fields to support recursive messages
+    _CONVERTERS[descriptor.full_name] = convert
+    for field in descriptor.fields:
+        has_presence = field.label != FieldDescriptor.LABEL_REPEATED and (
+            field.cpp_type == FieldDescriptor.CPPTYPE_MESSAGE or
+            field.containing_oneof is not None)
+        target = present if has_presence else plain
+        target.append((field.name, _compile_field(field)))
+    return convert
+
+
+def _compile_listed(descriptor: Descriptor) -> typing.Callable:
+    """Converter for proto2 messages where presence is tracked per field."""
+    fields: typing.Dict[int, typing.Tuple[str, typing.Callable]] = {}
+
+    def convert(message):
+        result = {}
+        for field, value in message.ListFields():
+            name, field_converter = fields[field.number]
+            result[name] = field_converter(value)
+        return result
+
+    _CONVERTERS[descriptor.full_name] = convert
+    for field in descriptor.fields:
+        fields[field.number] = (field.name, _compile_field(field))
+    return convert
+
+
+def _compile_field(field: FieldDescriptor) -> typing.Callable:
+    if field.message_type is not None and \
+            field.message_type.GetOptions().map_entry:
+        return _compile_map(field.message_type)
+
+    convert_value = _compile_value(field)
+    if field.label == FieldDescriptor.LABEL_REPEATED:
+        if convert_value is None:
+            return list
+        return lambda values: [convert_value(v) for v in values]
+    return convert_value or _identity
+
+
+def _compile_map(entry: Descriptor) -> typing.Callable:
+    key_field = entry.fields_by_name['key']
+    convert_value = _compile_value(entry.fields_by_name['value']) or _identity
+    if key_field.cpp_type == FieldDescriptor.CPPTYPE_BOOL:
+        def convert_key(key):
+            return 'true' if key else 'false'
+    else:
+        convert_key = str
+
+    def convert(values):
+        return {convert_key(k): convert_value(v) for k, v in values.items()}
+    return convert
+
+
+def _compile_value(field: FieldDescriptor) -> typing.Optional[typing.Callable]:
+    """Return converter for single field value or None for as is values."""
+    if field.cpp_type == FieldDescriptor.CPPTYPE_MESSAGE:
+        message_type = field.message_type
+
+        def convert_message(value):
+            return get_converter(message_type)(value)
+        return convert_message
+
+    if field.cpp_type == FieldDescriptor.CPPTYPE_ENUM:
+        values = field.enum_type.values_by_number
+
+        def convert_enum(value):
+            enum_value = values.get(value)
+            return enum_value.name if enum_value is not None else value
+        return convert_enum
+
+    if field.cpp_type in _INT64_TYPES:
+        return str
+
+    if field.type == FieldDescriptor.TYPE_BYTES:
+        def convert_bytes(value):
+            return base64.b64encode(value).decode('utf-8')
+        return convert_bytes
+
+    return None
+
+
+def _identity(value):
+    return value